@@ -24,6 +24,14 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Fallback routing, checked in order: message keywords and the simple tool that handles them
+FALLBACK_ROUTES = (
+    (('status', 'summary'), '_simple_generate_report'),
+    (('email', 'send'), '_simple_send_emails'),
+    (('kanban', 'board'), '_simple_board_status'),
+    (('github', 'publish', 'sync'), '_simple_publish_github'),
+)
+
 class AgentState:
     """Enhanced state management for the assistant agent."""
     
@@ -100,7 +108,7 @@ class AssistantAgent:
     """
     
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = LLMService.get()
         self.email_tools = EmailTools()
         self.kanban_tools = KanbanTools()
         self.analysis_tools = AnalysisTools()
@@ -360,20 +368,18 @@ class AssistantAgent:
             if not responses:
                 return "No new email responses found in the last 24 hours."
             
-            # Process responses
-            processed_count = 0
-            for response in responses:
-                try:
-                    parsed_data = await self.email_tools.parse_email_content.ainvoke({
-                        "email_content": response["content"]
-                    })
-                    
-                    if parsed_data and parsed_data.get('task_title'):
-                        processed_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing response: {e}")
-                    continue
+            # The monitor tool parses responses in one batch; only parse any it could not
+            unparsed = [response for response in responses if "parsed_data" not in response]
+            if unparsed:
+                parsed_responses = await self.llm_service.parse_email_content_simple_batch(
+                    [response["content"] for response in unparsed]
+                )
+                for response, parsed_data in zip(unparsed, parsed_responses):
+                    response["parsed_data"] = parsed_data
+            processed_count = sum(
+                1 for response in responses
+                if response["parsed_data"] and response["parsed_data"].get('task_title')
+            )
             
             return f"Found {len(responses)} new responses, processed {processed_count} successfully."
             
@@ -549,17 +555,12 @@ Response:"""
             # Simple keyword-based processing
             message_lower = message.lower()
             
-            if any(word in message_lower for word in ['status', 'summary']):
-                return await self._simple_generate_report(self.state)
-            elif any(word in message_lower for word in ['email', 'send']):
-                return await self._simple_send_emails(self.state)
-            elif any(word in message_lower for word in ['kanban', 'board']):
-                return await self._simple_board_status(self.state)
-            elif any(word in message_lower for word in ['github', 'publish', 'sync']):
-                return await self._simple_publish_github(self.state)
-            else:
-                return "I'm operating in fallback mode. I can help with status reports, sending emails, kanban board updates, and GitHub publishing."
-                
+            for keywords, handler_name in FALLBACK_ROUTES:
+                if any(word in message_lower for word in keywords):
+                    return await getattr(self, handler_name)(self.state)
+            
+            return "I'm operating in fallback mode. I can help with status reports, sending emails, kanban board updates, and GitHub publishing."
+            
         except Exception as e:
             return f"Error in fallback processing: {str(e)}"
     
@@ -629,6 +630,7 @@ Response:"""
             # Cleanup tools
             if hasattr(self.email_tools, 'cleanup'):
                 await self.email_tools.cleanup()
+            await self.git_tools.cleanup()
             
             self.is_active = False
             logger.info("Assistant Agent cleanup completed")
@@ -3,6 +3,7 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional, Dict, Any
 import logging
+import json
 from datetime import datetime, timedelta
 
 from app.models.schemas import (
@@ -13,7 +14,8 @@ from app.models.database import (
     TeamMember as TeamMemberModel, 
     EmailThread as EmailThreadModel,
     EmailTemplate as EmailTemplateModel,
-    WorkflowSettings
+    WorkflowSettings,
+    get_setting
 )
 from app.core.dependencies import get_assistant_agent
 
@@ -80,8 +82,10 @@ async def send_update_requests(template_id: Optional[int] = None):
             raise HTTPException(status_code=503, detail="Agent not available")
         
         # Get active team members
-        active_members = list(TeamMemberModel.select().where(TeamMemberModel.active == True))
-        member_emails = [member.email for member in active_members]
+        member_emails = [
+            member.email
+            for member in TeamMemberModel.select(TeamMemberModel.email).where(TeamMemberModel.active == True).iterator()
+        ]
         
         if not member_emails:
             return APIResponse(
@@ -310,22 +314,8 @@ async def get_team_members(
         if active_only:
             query = query.where(TeamMemberModel.active == True)
         
-        members = list(query.order_by(TeamMemberModel.name))
-        
-        return [
-            TeamMember(
-                id=member.id,
-                email=member.email,
-                name=member.name,
-                role=member.role,
-                active=member.active,
-                response_rate=member.response_rate,
-                last_response_at=member.last_response_at,
-                created_at=member.created_at,
-                updated_at=member.updated_at
-            )
-            for member in members
-        ]
+        # Read-only listing: plain row dicts are validated by the response model
+        return list(query.order_by(TeamMemberModel.name).dicts())
         
     except Exception as e:
         logger.error(f"Error getting team members: {e}")
@@ -434,7 +424,7 @@ async def get_email_statistics():
         
         # Get template usage
         template_usage = {}
-        for template in EmailTemplateModel.select().where(EmailTemplateModel.active == True):
+        for template in EmailTemplateModel.select().where(EmailTemplateModel.active == True).iterator():
             template_usage[template.name] = template.usage_count
         
         return APIResponse(
@@ -474,23 +464,15 @@ async def get_email_templates(
         if active_only:
             query = query.where(EmailTemplateModel.active == True)
         
-        templates = list(query.order_by(EmailTemplateModel.name))
-        
-        return [
-            EmailTemplate(
-                id=template.id,
-                name=template.name,
-                subject=template.subject,
-                content=template.content,
-                template_type=template.template_type,
-                variables=template.variables_list,
-                active=template.active,
-                usage_count=template.usage_count,
-                created_at=template.created_at,
-                updated_at=template.updated_at
-            )
-            for template in templates
-        ]
+        # Read-only listing: plain row dicts are validated by the response model
+        templates = list(query.order_by(EmailTemplateModel.name).dicts())
+        for template in templates:
+            try:
+                template['variables'] = json.loads(template['variables'])
+            except:
+                template['variables'] = []
+        
+        return templates
         
     except Exception as e:
         logger.error(f"Error getting email templates: {e}")
@@ -646,17 +628,9 @@ async def get_email_settings():
         ]
         
         for setting_key in email_settings:
-            setting = WorkflowSettings.get_or_none(WorkflowSettings.setting_key == setting_key)
-            if setting:
-                try:
-                    if setting.setting_type == 'number':
-                        settings[setting_key] = int(setting.setting_value)
-                    elif setting.setting_type == 'boolean':
-                        settings[setting_key] = setting.setting_value.lower() == 'true'
-                    else:
-                        settings[setting_key] = json.loads(setting.setting_value)
-                except:
-                    settings[setting_key] = setting.setting_value
+            value = get_setting(setting_key)
+            if value is not None:
+                settings[setting_key] = value
         
         return APIResponse(
             success=True,
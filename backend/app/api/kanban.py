@@ -7,8 +7,11 @@ import json
 from datetime import datetime
 
 from app.models.schemas import KanbanBoard, Task, TaskCreate, TaskUpdate, APIResponse
-from app.models.database import Task as TaskModel, TeamMember as TeamMemberModel, KanbanChange
+from app.models.database import (
+    Task as TaskModel, TeamMember as TeamMemberModel, KanbanChange, fetch_kanban_board_rows
+)
 from app.core.dependencies import get_assistant_agent
+from app.tools.kanban_tools import invalidate_read_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -17,8 +20,8 @@ router = APIRouter()
 async def get_kanban_board():
     """Get the current kanban board state."""
     try:
-        # Get all tasks with their assignees
-        tasks = list(TaskModel.select().join(TeamMemberModel))
+        # Get all tasks with their assignees, already sorted by order
+        rows = fetch_kanban_board_rows()
         
         # Group tasks by status
         columns = {
@@ -29,42 +32,48 @@ async def get_kanban_board():
             "blocked": {"id": "blocked", "title": "Blocked", "tasks": [], "color": "error"}
         }
         
-        for task in tasks:
-            task_data = {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "assignee_id": task.assignee.id,
-                "due_date": task.due_date,
-                "priority": task.priority,
-                "order": task.order,
-                "tags": task.tags_list,
-                "created_at": task.created_at,
-                "updated_at": task.updated_at,
+        last_updated = None
+        for (task_id, title, description, status, due_date, priority, order, tags,
+             created_at, updated_at, member_id, name, email, role, active,
+             response_rate, last_response_at, member_created_at, member_updated_at) in rows:
+            if status not in columns:
+                continue
+            
+            try:
+                tags_list = json.loads(tags)
+            except:
+                tags_list = []
+            
+            columns[status]["tasks"].append({
+                "id": task_id,
+                "title": title,
+                "description": description,
+                "status": status,
+                "assignee_id": member_id,
+                "due_date": due_date,
+                "priority": priority,
+                "order": order,
+                "tags": tags_list,
+                "created_at": created_at,
+                "updated_at": updated_at,
                 "assignee": {
-                    "id": task.assignee.id,
-                    "name": task.assignee.name,
-                    "email": task.assignee.email,
-                    "role": task.assignee.role,
-                    "active": task.assignee.active,
-                    "response_rate": task.assignee.response_rate,
-                    "last_response_at": task.assignee.last_response_at,
-                    "created_at": task.assignee.created_at,
-                    "updated_at": task.assignee.updated_at
+                    "id": member_id,
+                    "name": name,
+                    "email": email,
+                    "role": role,
+                    "active": active,
+                    "response_rate": response_rate,
+                    "last_response_at": last_response_at,
+                    "created_at": member_created_at,
+                    "updated_at": member_updated_at
                 }
-            }
-            
-            if task.status in columns:
-                columns[task.status]["tasks"].append(task_data)
-        
-        # Sort tasks by order within each column
-        for column in columns.values():
-            column["tasks"].sort(key=lambda x: x["order"])
+            })
+            if last_updated is None or updated_at > last_updated:
+                last_updated = updated_at
         
         return KanbanBoard(
             columns=list(columns.values()),
-            last_updated=max([task.updated_at for task in tasks]) if tasks else datetime.now()
+            last_updated=last_updated or datetime.now()
         )
         
     except Exception as e:
@@ -99,14 +108,15 @@ async def create_task(task: TaskCreate):
         KanbanChange.create(
             change_type='create',
             task_id=new_task.id,
-            task_data=json.dumps({
+            task_data={
                 'title': task.title,
                 'assignee': assignee.email,
                 'status': task.status,
                 'priority': task.priority
-            }),
+            },
             approved=False
         )
+        invalidate_read_cache()
         
         return Task(
             id=new_task.id,
@@ -199,13 +209,14 @@ async def update_task(task_id: int, task_update: TaskUpdate):
             KanbanChange.create(
                 change_type='update',
                 task_id=task.id,
-                task_data=json.dumps({
+                task_data={
                     'changes': changes,
                     'title': task.title
-                }),
+                },
                 approved=False
             )
             logger.info("Change record created for approval")
+        invalidate_read_cache()
         
         # Return updated task
         result_task = Task(
@@ -258,12 +269,13 @@ async def delete_task(task_id: int):
         KanbanChange.create(
             change_type='delete',
             task_id=task.id,
-            task_data=json.dumps({
+            task_data={
                 'title': task.title,
                 'assignee': task.assignee.email
-            }),
+            },
             approved=False
         )
+        invalidate_read_cache()
         
         # Soft delete - mark as deleted but don't actually remove
         # The actual deletion will happen after approval
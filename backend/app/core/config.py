@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     # LLM Configuration
     ollama_host: str = "http://localhost:11434"
     default_model: str = "llama3.2"
+    ollama_max_requests_per_period: float = 8  # generate calls allowed per rate period
+    ollama_rate_period_seconds: float = 1.0
+    ollama_max_connections: int = 32  # keep-alive connection pool size for the Ollama host
     
     # Email Configuration
     outlook_enabled: bool = True
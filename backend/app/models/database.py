@@ -1,16 +1,93 @@
 """Enhanced database models with better indexing and validation."""
 
 from peewee import *
-from datetime import datetime
+from playhouse.pool import PooledDatabase
+from playhouse.sqlite_ext import FTS5Model, JSONField, SearchField
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 import json
+import re
 import asyncio
 import logging
 from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
-# Database instance
-db = SqliteDatabase('assistant_manager.db')
+try:
+    # APSW wraps SQLite with less per-statement driver overhead and its own statement cache;
+    # its field variants adapt values that apsw, unlike sqlite3, does not convert itself
+    from playhouse.apsw_ext import APSWDatabase as DriverDatabase, BooleanField, DateTimeField
+    DRIVER_CONNECT_PARAMS = {}
+except ImportError:
+    DriverDatabase = SqliteDatabase
+    # Pooled connections are handed from one thread to the next
+    DRIVER_CONNECT_PARAMS = {'check_same_thread': False}
+
+class DatabaseClass(PooledDatabase, DriverDatabase):
+    """SQLite database whose closed connections go back to a pool for the next thread to reuse."""
+    
+    def init(self, database, **kwargs):
+        # Idle pooled connections point at the previous database file
+        if getattr(self, '_connections', None):
+            self.close_idle()
+        super().init(database, **kwargs)
+    
+    def _is_closed(self, conn):
+        # Works for both drivers: a closed sqlite3 or apsw connection refuses new cursors
+        try:
+            conn.cursor().close()
+        except Exception:
+            return True
+        return False
+    
+    def _can_reuse(self, conn):
+        # Roll back anything the last borrower left open; apsw connections have no rollback()
+        try:
+            if conn.in_transaction:
+                conn.cursor().execute('ROLLBACK')
+        except Exception:
+            return False
+        return True
+
+# Database instance; WAL with synchronous=NORMAL fsyncs at checkpoints rather than on every commit
+db = DatabaseClass(
+    'assistant_manager.db',
+    max_connections=32,
+    stale_timeout=300,  # seconds before an idle pooled connection is recycled
+    pragmas={'journal_mode': 'wal', 'synchronous': 'normal'},
+    **DRIVER_CONNECT_PARAMS
+)
+
+class EnumField(SmallIntegerField):
+    """Stores one of a fixed set of string values as its small-integer position."""
+    
+    def __init__(self, choices, *args, **kwargs):
+        self.enum_values = tuple(getattr(choice, 'value', choice) for choice in choices)
+        self._positions = {value: position for position, value in enumerate(self.enum_values)}
+        super().__init__(*args, **kwargs)
+    
+    def bind(self, model, name, set_attribute=True):
+        allowed = ', '.join(str(position) for position in range(len(self.enum_values)))
+        self.constraints = [Check(f'{name} IN ({allowed})')]
+        return super().bind(model, name, set_attribute)
+    
+    def db_value(self, value):
+        if value is None:
+            return None
+        value = getattr(value, 'value', value)
+        if value not in self._positions:
+            raise ValueError(f"Invalid {self.name} value: {value!r}")
+        return self._positions[value]
+    
+    def python_value(self, value):
+        # Rows not yet migrated off the old CharField column still hold strings
+        if isinstance(value, int):
+            return self.enum_values[value]
+        return value
 
 class BaseModel(Model):
     """Base model with common fields and enhanced functionality."""
@@ -39,6 +116,23 @@ class TeamMember(BaseModel):
         indexes = (
             (('email', 'active'), False),  # Composite index for active member lookups
         )
+    
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        _get_active_members_cached.cache_clear()
+        _get_member_by_email_cached.cache_clear()
+        return result
+    
+    def delete_instance(self, *args, **kwargs):
+        result = super().delete_instance(*args, **kwargs)
+        _get_active_members_cached.cache_clear()
+        _get_member_by_email_cached.cache_clear()
+        return result
+    
+    @property
+    def utc_offset_minutes(self) -> int:
+        """Current UTC offset of the member's timezone, from the per-process cache."""
+        return get_utc_offset_minutes(self.timezone)
 
 class Task(BaseModel):
     """Enhanced task model with time tracking and better indexing."""
@@ -57,6 +151,8 @@ class Task(BaseModel):
         table_name = 'tasks'
         indexes = (
             (('status', 'assignee'), False),  # Composite index for task queries
+            (('assignee', 'status'), False),  # For a member's tasks, optionally by status
+            (('status', 'order'), False),  # For the next order value within a column
             (('due_date', 'status'), False),  # For overdue task queries
         )
     
@@ -79,6 +175,99 @@ class Task(BaseModel):
         return (self.due_date and 
                 datetime.now() > self.due_date and 
                 self.status != 'done')
+    
+    @classmethod
+    def overdue(cls, now=None):
+        """Query overdue tasks; predicates match the idx_tasks_overdue_open partial index."""
+        return cls.select().where(
+            cls.due_date.is_null(False),
+            cls.status != 'done',
+            cls.due_date < (now or datetime.now())
+        )
+
+class TaskStatusCount(Model):
+    """Number of tasks per status, kept current by triggers on the tasks table."""
+    status = CharField(primary_key=True)
+    count = IntegerField(default=0)
+    
+    class Meta:
+        database = db
+        table_name = 'task_status_counts'
+
+TASK_STATUS_COUNT_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS trg_task_status_count_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT(status) DO UPDATE SET count = count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_task_status_count_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_status_counts SET count = count - 1 WHERE status = OLD.status;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_task_status_count_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE task_status_counts SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO task_status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT(status) DO UPDATE SET count = count + 1;
+    END""",
+)
+
+def install_task_status_counts():
+    """Install the task status count triggers and recount from the tasks table."""
+    with db.atomic():
+        for trigger_sql in TASK_STATUS_COUNT_TRIGGERS:
+            db.execute_sql(trigger_sql)
+        # Recount so rows written before the triggers existed (or by older versions) are included
+        TaskStatusCount.delete().execute()
+        TaskStatusCount.insert_from(
+            Task.select(Task.status, fn.COUNT(Task.id)).group_by(Task.status),
+            [TaskStatusCount.status, TaskStatusCount.count]
+        ).execute()
+
+class TaskSearch(FTS5Model):
+    """Full-text index over task titles and descriptions, kept in sync by triggers on tasks."""
+    title = SearchField()
+    description = SearchField()
+    
+    class Meta:
+        database = db
+        table_name = 'tasks_fts'
+        options = {'content': 'tasks', 'content_rowid': 'id', 'tokenize': 'porter unicode61'}
+    
+    @classmethod
+    def matching_ids(cls, search_term: str):
+        """Subquery of task ids with words starting with each word of search_term (None if it has none)."""
+        words = re.findall(r'\w+', search_term)
+        if not words:
+            return None
+        return cls.select(cls.rowid).where(cls.match(' '.join(f'"{word}"*' for word in words)))
+
+TASK_SEARCH_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+    END""",
+)
+
+def install_task_search():
+    """Create the task full-text index and its triggers, then rebuild it from the tasks table."""
+    with db.atomic():
+        TaskSearch.create_table(safe=True)
+        for trigger_sql in TASK_SEARCH_TRIGGERS:
+            db.execute_sql(trigger_sql)
+        TaskSearch.rebuild()
+
+EMAIL_THREAD_STATUSES = ('sent', 'opened', 'replied', 'overdue')
 
 class EmailThread(BaseModel):
     """Enhanced email thread tracking with better parsing support."""
@@ -88,7 +277,7 @@ class EmailThread(BaseModel):
     sent_at = DateTimeField(index=True)
     response_received = BooleanField(default=False, index=True)
     response_at = DateTimeField(null=True, index=True)
-    status = CharField(index=True)  # sent, opened, replied, overdue
+    status = EnumField(EMAIL_THREAD_STATUSES, index=True)
     content = TextField()
     parsed_content = TextField(null=True)  # Enhanced JSON storage for parsed data
     follow_up_count = IntegerField(default=0)
@@ -118,7 +307,7 @@ class KanbanChange(BaseModel):
     """Enhanced kanban board change tracking."""
     change_type = CharField(index=True)  # create, update, delete, move
     task_id = IntegerField(null=True, index=True)
-    task_data = TextField()  # JSON
+    task_data = JSONField(json_loads=orjson.loads)  # JSON text, (de)serialized by the field
     approved = BooleanField(default=False, index=True)
     approved_at = DateTimeField(null=True)
     approved_by = CharField(null=True)
@@ -140,6 +329,22 @@ class AgentState(BaseModel):
     class Meta:
         table_name = 'agent_states'
 
+class EmailParseCache(BaseModel):
+    """LLM task extraction results keyed by a hash of the parsed email text."""
+    content_hash = CharField(unique=True, index=True)
+    parsed_data = TextField()  # JSON
+    
+    class Meta:
+        table_name = 'email_parse_cache'
+
+class ExchangeAddressCache(BaseModel):
+    """SMTP addresses resolved for Exchange (X.500) sender addresses."""
+    sender_dn = CharField(unique=True, index=True)
+    smtp_address = CharField()
+    
+    class Meta:
+        table_name = 'exchange_address_cache'
+
 class AgentActivity(BaseModel):
     """Enhanced agent activity logging with better categorization."""
     activity_type = CharField(index=True)  # email_sent, task_updated, response_received, etc.
@@ -185,6 +390,10 @@ class EmailTemplate(BaseModel):
     def variables_list(self, value):
         """Set variables from a list."""
         self.variables = json.dumps(value)
+    
+    def render(self, context: Dict[str, Any]) -> Tuple[str, str]:
+        """Render subject and content with the given variable context."""
+        return render_template(self.subject, context), render_template(self.content, context)
 
 class WorkflowSettings(BaseModel):
     """Enhanced workflow configuration."""
@@ -195,19 +404,128 @@ class WorkflowSettings(BaseModel):
     
     class Meta:
         table_name = 'workflow_settings'
+    
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        _get_setting_cached.cache_clear()
+        return result
+    
+    def delete_instance(self, *args, **kwargs):
+        result = super().delete_instance(*args, **kwargs)
+        _get_setting_cached.cache_clear()
+        return result
+    
+    @property
+    def parsed_value(self):
+        """Get setting value decoded according to its setting_type."""
+        try:
+            if self.setting_type == 'number':
+                return int(self.setting_value)
+            elif self.setting_type == 'boolean':
+                return self.setting_value.lower() == 'true'
+            return json.loads(self.setting_value)
+        except:
+            return self.setting_value
+
+@lru_cache(maxsize=128)
+def _get_setting_cached(setting_key: str):
+    """Load and decode a setting once; cleared whenever a setting is written."""
+    setting = WorkflowSettings.get_or_none(WorkflowSettings.setting_key == setting_key)
+    return setting.parsed_value if setting else None
+
+def get_setting(setting_key: str, default=None):
+    """Get a decoded workflow setting value from the in-process cache."""
+    value = _get_setting_cached(setting_key)
+    return default if value is None else value
+
+def get_cached_email_parse(content_hash: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+    """Get a stored email parse result if it is newer than max_age_seconds."""
+    entry = EmailParseCache.get_or_none(
+        (EmailParseCache.content_hash == content_hash) &
+        (EmailParseCache.created_at > datetime.now() - timedelta(seconds=max_age_seconds))
+    )
+    return json.loads(entry.parsed_data) if entry else None
+
+def store_email_parse(content_hash: str, parsed_data: Dict[str, Any]):
+    """Store an email parse result, replacing any older one for the same hash."""
+    EmailParseCache.insert(
+        content_hash=content_hash,
+        parsed_data=json.dumps(parsed_data),
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    ).on_conflict_replace().execute()
+
+def get_cached_smtp_address(sender_dn: str, max_age_seconds: float) -> Optional[str]:
+    """Get the stored SMTP address of an Exchange sender if resolved within max_age_seconds."""
+    entry = ExchangeAddressCache.get_or_none(
+        (ExchangeAddressCache.sender_dn == sender_dn) &
+        (ExchangeAddressCache.created_at > datetime.now() - timedelta(seconds=max_age_seconds))
+    )
+    return entry.smtp_address if entry else None
+
+def store_smtp_address(sender_dn: str, smtp_address: str):
+    """Store the resolved SMTP address of an Exchange sender."""
+    ExchangeAddressCache.insert(
+        sender_dn=sender_dn,
+        smtp_address=smtp_address,
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    ).on_conflict_replace().execute()
+
+@lru_cache(maxsize=1)
+def _get_active_members_cached() -> Tuple[TeamMember, ...]:
+    """Load the active team members once; cleared whenever a team member is written."""
+    return tuple(TeamMember.select().where(TeamMember.active == True).iterator())
+
+def get_active_members() -> Tuple[TeamMember, ...]:
+    """Get the active team members from the in-process cache."""
+    return _get_active_members_cached()
+
+@lru_cache(maxsize=256)
+def _get_member_by_email_cached(email: str) -> Optional[Tuple[int, str]]:
+    """Look up a team member's (id, name) by email; cleared whenever a team member is written."""
+    return TeamMember.select(TeamMember.id, TeamMember.name).where(TeamMember.email == email).tuples().first()
+
+def get_member_by_email(email: str) -> Optional[Tuple[int, str]]:
+    """Get a team member's (id, name) by email from the in-process cache, or None if unknown."""
+    return _get_member_by_email_cached(email)
+
+def clear_row_caches():
+    """Drop the in-process caches of settings and team members, e.g. after rolling back writes to them."""
+    _get_setting_cached.cache_clear()
+    _get_active_members_cached.cache_clear()
+    _get_member_by_email_cached.cache_clear()
 
 # All models
 MODELS = [
     TeamMember,
     Task,
+    TaskStatusCount,
     EmailThread,
     KanbanChange,
     AgentState,
+    EmailParseCache,
+    ExchangeAddressCache,
     AgentActivity,
     EmailTemplate,
     WorkflowSettings
 ]
 
+def get_utc_offset_minutes(timezone_name: str) -> int:
+    """Get a timezone's current UTC offset in minutes (0 if unknown)."""
+    # Keyed by the UTC hour too, so a DST transition is picked up within the hour it happens
+    utc_hour = datetime.now(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return _utc_offset_minutes_at(timezone_name, utc_hour)
+
+@lru_cache(maxsize=256)
+def _utc_offset_minutes_at(timezone_name: str, utc_hour: datetime) -> int:
+    """Get a timezone's UTC offset in minutes at utc_hour (0 if unknown)."""
+    try:
+        offset = utc_hour.astimezone(ZoneInfo(timezone_name or 'UTC')).utcoffset()
+        return int(offset.total_seconds() // 60)
+    except Exception:
+        return 0
+
 async def initialize_database():
     """Initialize database with enhanced error handling and indexing."""
     try:
@@ -219,6 +537,15 @@ async def initialize_database():
         # Create tables with safe mode
         db.create_tables(MODELS, safe=True)
         
+        # Convert columns stored in older formats
+        await migrate_email_thread_status()
+        
+        # Keep per-status task counts maintained in SQL for the board summary
+        install_task_status_counts()
+        
+        # Full-text index for task keyword search
+        install_task_search()
+        
         # Create additional indexes for performance
         await create_performance_indexes()
         
@@ -226,19 +553,60 @@ async def initialize_database():
         await create_default_data()
         
         logger.info("Database initialized successfully")
-        
+    
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
 
+async def migrate_email_thread_status():
+    """Rebuild email_threads with an integer status column if it still stores strings."""
+    columns = {column.name: column.data_type for column in db.get_columns('email_threads')}
+    if not columns.get('status', '').upper().startswith('VARCHAR'):
+        return
+    
+    # Refuse to migrate rather than silently map statuses the enum doesn't know to 'sent'
+    placeholders = ', '.join('?' for _ in EMAIL_THREAD_STATUSES)
+    unknown = db.execute_sql(
+        f'SELECT status, COUNT(*) FROM email_threads WHERE status IS NULL OR status NOT IN ({placeholders}) '
+        f'GROUP BY status',
+        EMAIL_THREAD_STATUSES
+    ).fetchall()
+    if unknown:
+        summary = ', '.join(f"{status!r} x{count}" for status, count in unknown)
+        logger.error(f"Cannot migrate email_threads.status, unknown values: {summary}")
+        raise ValueError(f"Unknown email thread status values: {summary}")
+    
+    mapping = ' '.join(
+        f"WHEN '{value}' THEN {position}" for position, value in enumerate(EMAIL_THREAD_STATUSES)
+    )
+    column_names = [f'"{field.column_name}"' for field in EmailThread._meta.sorted_fields]
+    select_list = ', '.join(
+        f'CASE status {mapping} ELSE 0 END' if name == '"status"' else name
+        for name in column_names
+    )
+    with db.atomic():
+        # SQLite cannot add a CHECK constraint in place, so copy into a freshly created table
+        db.execute_sql('ALTER TABLE email_threads RENAME TO email_threads_old')
+        EmailThread._schema.create_table(safe=False)
+        db.execute_sql(
+            f'INSERT INTO email_threads ({", ".join(column_names)}) '
+            f'SELECT {select_list} FROM email_threads_old'
+        )
+        db.execute_sql('DROP TABLE email_threads_old')
+        EmailThread._schema.create_indexes(safe=True)
+    logger.info("Migrated email_threads.status to integer codes")
+
 async def create_performance_indexes():
     """Create additional performance indexes."""
     try:
         # Additional indexes for common queries
         indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_tasks_overdue ON tasks(due_date, status) WHERE due_date IS NOT NULL",
+            "DROP INDEX IF EXISTS idx_tasks_overdue",  # Superseded by idx_tasks_overdue_open
+            "CREATE INDEX IF NOT EXISTS idx_tasks_overdue_open ON tasks(due_date) WHERE due_date IS NOT NULL AND status != 'done'",
             "CREATE INDEX IF NOT EXISTS idx_email_pending ON email_threads(team_member_id, response_received) WHERE response_received = 0",
             "CREATE INDEX IF NOT EXISTS idx_activities_recent ON agent_activities(created_at DESC, status)",
+            # Board reads ORDER BY "order", id; rows come off this index in order, with no sort step
+            'CREATE INDEX IF NOT EXISTS idx_tasks_board_order ON tasks("order")',
         ]
         
         for index_sql in indexes:
@@ -248,19 +616,16 @@ async def create_performance_indexes():
                 logger.warning(f"Failed to create index: {e}")
         
         logger.info("Performance indexes created")
-        
+    
     except Exception as e:
         logger.error(f"Error creating performance indexes: {e}")
 
-async def create_default_data():
-    """Create enhanced default data for the application."""
-    
-    # Enhanced default email templates
-    default_templates = [
-        {
-            'name': 'Weekly Update Request',
-            'subject': 'Weekly Update Request - {{date}}',
-            'content': '''Hi {{name}},
+# Enhanced default email templates, defined once per process
+DEFAULT_TEMPLATES = (
+    {
+        'name': 'Weekly Update Request',
+        'subject': 'Weekly Update Request - {{date}}',
+        'content': '''Hi {{name}},
 
 I hope you're having a great week! Could you please share a brief update on:
 
@@ -273,15 +638,15 @@ Thanks for keeping the team informed!
 
 Best regards,
 Assistant Manager''',
-            'template_type': 'update_request',
-            'variables': '["name", "date"]',
-            'active': True,
-            'usage_count': 0
-        },
-        {
-            'name': 'Task Deadline Reminder',
-            'subject': 'Reminder: {{task_name}} due {{due_date}}',
-            'content': '''Hi {{name}},
+        'template_type': 'update_request',
+        'variables': ('name', 'date'),
+        'active': True,
+        'usage_count': 0
+    },
+    {
+        'name': 'Task Deadline Reminder',
+        'subject': 'Reminder: {{task_name}} due {{due_date}}',
+        'content': '''Hi {{name}},
 
 This is a friendly reminder that your task "{{task_name}}" is due on {{due_date}}.
 
@@ -292,15 +657,15 @@ If you need any assistance or if there are any blockers, please let me know.
 
 Best regards,
 Assistant Manager''',
-            'template_type': 'reminder',
-            'variables': '["name", "task_name", "due_date", "status", "priority"]',
-            'active': True,
-            'usage_count': 0
-        },
-        {
-            'name': 'Follow-up Request',
-            'subject': 'Follow-up: {{subject}}',
-            'content': '''Hi {{name}},
+        'template_type': 'reminder',
+        'variables': ('name', 'task_name', 'due_date', 'status', 'priority'),
+        'active': True,
+        'usage_count': 0
+    },
+    {
+        'name': 'Follow-up Request',
+        'subject': 'Follow-up: {{subject}}',
+        'content': '''Hi {{name}},
 
 I haven't received a response to my previous email about {{subject}}.
 
@@ -310,15 +675,15 @@ Thanks!
 
 Best regards,
 Assistant Manager''',
-            'template_type': 'follow_up',
-            'variables': '["name", "subject"]',
-            'active': True,
-            'usage_count': 0
-        },
-        {
-            'name': 'Project Status Update',
-            'subject': 'Project Status Update - {{project_name}}',
-            'content': '''Hi {{name}},
+        'template_type': 'follow_up',
+        'variables': ('name', 'subject'),
+        'active': True,
+        'usage_count': 0
+    },
+    {
+        'name': 'Project Status Update',
+        'subject': 'Project Status Update - {{project_name}}',
+        'content': '''Hi {{name}},
 
 Could you please provide a status update for the {{project_name}} project?
 
@@ -332,15 +697,15 @@ Thanks for your time!
 
 Best regards,
 Assistant Manager''',
-            'template_type': 'update_request',
-            'variables': '["name", "project_name"]',
-            'active': True,
-            'usage_count': 0
-        },
-        {
-            'name': 'Overdue Task Alert',
-            'subject': 'URGENT: Overdue Task - {{task_name}}',
-            'content': '''Hi {{name}},
+        'template_type': 'update_request',
+        'variables': ('name', 'project_name'),
+        'active': True,
+        'usage_count': 0
+    },
+    {
+        'name': 'Overdue Task Alert',
+        'subject': 'URGENT: Overdue Task - {{task_name}}',
+        'content': '''Hi {{name}},
 
 Your task "{{task_name}}" was due on {{due_date}} and is now overdue.
 
@@ -353,82 +718,113 @@ This is important for project timeline management.
 
 Best regards,
 Assistant Manager''',
-            'template_type': 'reminder',
-            'variables': '["name", "task_name", "due_date"]',
-            'active': True,
-            'usage_count': 0
-        }
-    ]
-    
-    for template_data in default_templates:
-        EmailTemplate.get_or_create(
-            name=template_data['name'],
-            defaults=template_data
-        )
+        'template_type': 'reminder',
+        'variables': ('name', 'task_name', 'due_date'),
+        'active': True,
+        'usage_count': 0
+    }
+)
+
+# Enhanced default workflow settings
+DEFAULT_SETTINGS = (
+    {
+        'setting_key': 'update_frequency',
+        'setting_value': '"weekly"',
+        'description': 'How often to send update requests',
+        'setting_type': 'string'
+    },
+    {
+        'setting_key': 'reminder_days',
+        'setting_value': '2',
+        'description': 'Days before deadline to send reminders',
+        'setting_type': 'number'
+    },
+    {
+        'setting_key': 'max_follow_ups',
+        'setting_value': '3',
+        'description': 'Maximum number of follow-up emails',
+        'setting_type': 'number'
+    },
+    {
+        'setting_key': 'auto_approve_changes',
+        'setting_value': 'false',
+        'description': 'Automatically approve Kanban changes',
+        'setting_type': 'boolean'
+    },
+    {
+        'setting_key': 'email_check_interval',
+        'setting_value': '300',
+        'description': 'Email check interval in seconds',
+        'setting_type': 'number'
+    },
+    {
+        'setting_key': 'llm_timeout',
+        'setting_value': '30',
+        'description': 'LLM request timeout in seconds',
+        'setting_type': 'number'
+    },
+    {
+        'setting_key': 'email_signature',
+        'setting_value': '"Best regards,\\nAssistant Manager\\nAutomated Team Workflow System"',
+        'description': 'Default email signature',
+        'setting_type': 'string'
+    },
+    {
+        'setting_key': 'business_hours_start',
+        'setting_value': '9',
+        'description': 'Business hours start (24h format)',
+        'setting_type': 'number'
+    },
+    {
+        'setting_key': 'business_hours_end',
+        'setting_value': '17',
+        'description': 'Business hours end (24h format)',
+        'setting_type': 'number'
+    }
+)
+
+TEMPLATE_VARIABLE_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> Tuple[str, ...]:
+    """Split template text into literal parts with variable names at odd indexes."""
+    return tuple(TEMPLATE_VARIABLE_PATTERN.split(text))
+
+def render_template(text: str, context: Dict[str, Any]) -> str:
+    """Render {{variable}} placeholders; unknown variables are left untouched."""
+    parts = list(compile_template(text))
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = str(context[name]) if name in context else f'{{{{{name}}}}}'
+    return ''.join(parts)
+
+# Precompile default template bodies at import time
+for _template in DEFAULT_TEMPLATES:
+    compile_template(_template['subject'])
+    compile_template(_template['content'])
+
+async def create_default_data():
+    """Create enhanced default data for the application."""
     
-    # Enhanced default workflow settings
-    default_settings = [
-        {
-            'setting_key': 'update_frequency',
-            'setting_value': '"weekly"',
-            'description': 'How often to send update requests',
-            'setting_type': 'string'
-        },
-        {
-            'setting_key': 'reminder_days',
-            'setting_value': '2',
-            'description': 'Days before deadline to send reminders',
-            'setting_type': 'number'
-        },
-        {
-            'setting_key': 'max_follow_ups',
-            'setting_value': '3',
-            'description': 'Maximum number of follow-up emails',
-            'setting_type': 'number'
-        },
-        {
-            'setting_key': 'auto_approve_changes',
-            'setting_value': 'false',
-            'description': 'Automatically approve Kanban changes',
-            'setting_type': 'boolean'
-        },
-        {
-            'setting_key': 'email_check_interval',
-            'setting_value': '300',
-            'description': 'Email check interval in seconds',
-            'setting_type': 'number'
-        },
-        {
-            'setting_key': 'llm_timeout',
-            'setting_value': '30',
-            'description': 'LLM request timeout in seconds',
-            'setting_type': 'number'
-        },
-        {
-            'setting_key': 'email_signature',
-            'setting_value': '"Best regards,\\nAssistant Manager\\nAutomated Team Workflow System"',
-            'description': 'Default email signature',
-            'setting_type': 'string'
-        },
-        {
-            'setting_key': 'business_hours_start',
-            'setting_value': '9',
-            'description': 'Business hours start (24h format)',
-            'setting_type': 'number'
-        },
-        {
-            'setting_key': 'business_hours_end',
-            'setting_value': '17',
-            'description': 'Business hours end (24h format)',
-            'setting_type': 'number'
-        }
+    # Insert missing default templates in one batch
+    existing_templates = {name for (name,) in EmailTemplate.select(EmailTemplate.name).tuples()}
+    missing_templates = [
+        dict(template_data, variables=json.dumps(list(template_data['variables'])))
+        for template_data in DEFAULT_TEMPLATES
+        if template_data['name'] not in existing_templates
     ]
+    if missing_templates:
+        EmailTemplate.insert_many(missing_templates).execute()
     
-    for setting_data in default_settings:
-        WorkflowSettings.get_or_create(
-            setting_key=setting_data['setting_key'],
-            defaults=setting_data
-        )
+    # Insert missing default settings in one batch
+    existing_settings = {key for (key,) in WorkflowSettings.select(WorkflowSettings.setting_key).tuples()}
+    missing_settings = [
+        setting_data for setting_data in DEFAULT_SETTINGS
+        if setting_data['setting_key'] not in existing_settings
+    ]
+    if missing_settings:
+        WorkflowSettings.insert_many(missing_settings).execute()
+        _get_setting_cached.cache_clear()
     
     logger.info("Enhanced default data created successfully")
 
@@ -454,26 +850,101 @@ async def cleanup_old_data(days_to_keep: int = 90):
         ).execute()
         
         logger.info(f"Cleaned up {deleted_activities} old activities and {deleted_threads} old email threads")
-        
+    
     except Exception as e:
         logger.error(f"Error during data cleanup: {e}")
 
+# Per-table counters folded into CASE-sum aggregates, one row per source table
+DATABASE_STATS_SQL = """
+SELECT 'team_members', COUNT(*), COALESCE(SUM(CASE WHEN active = 1 THEN 1 ELSE 0 END), 0) FROM team_members
+UNION ALL
+SELECT 'tasks', COUNT(*), COALESCE(SUM(CASE WHEN status != 'done' THEN 1 ELSE 0 END), 0) FROM tasks
+UNION ALL
+SELECT 'email_threads', COUNT(*), COALESCE(SUM(CASE WHEN response_received = 0 THEN 1 ELSE 0 END), 0) FROM email_threads
+UNION ALL
+SELECT 'kanban_changes', COUNT(*), COALESCE(SUM(CASE WHEN approved = 0 THEN 1 ELSE 0 END), 0) FROM kanban_changes
+UNION ALL
+SELECT 'email_templates', COUNT(*), COALESCE(SUM(CASE WHEN active = 1 THEN 1 ELSE 0 END), 0) FROM email_templates
+"""
+
+# Tasks joined with their assignee for board rendering, in column order
+KANBAN_BOARD_SQL = """
+SELECT t.id, t.title, t.description, t.status, t.due_date, t.priority, t."order", t.tags,
+       t.created_at, t.updated_at,
+       m.id, m.name, m.email, m.role, m.active, m.response_rate, m.last_response_at,
+       m.created_at, m.updated_at
+FROM tasks AS t
+JOIN team_members AS m ON m.id = t.assignee_id
+ORDER BY t."order", t.id
+"""
+
+def fetch_kanban_board_rows() -> list:
+    """Fetch board rows as raw tuples, bypassing model instantiation on this hot read path."""
+    return db.execute_sql(KANBAN_BOARD_SQL).fetchall()
+
+# Board summary reads and the status update have fixed shapes, so their SQL is written once here
+# rather than rebuilt by the query builder on every tool call
+TASK_STATUS_COUNTS_SQL = "SELECT status, count FROM task_status_counts"
+
+# Earliest overdue tasks, each row carrying the total overdue count; predicates match idx_tasks_overdue_open
+OVERDUE_TASKS_SQL = """
+SELECT title, due_date, COUNT(*) OVER ()
+FROM tasks
+WHERE due_date IS NOT NULL AND status != 'done' AND due_date < ?
+ORDER BY due_date
+LIMIT ?
+"""
+
+TASK_TITLE_STATUS_SQL = "SELECT title, status FROM tasks WHERE id = ?"
+
+# Compare-and-set: only applies while the task still has the status the caller read
+UPDATE_TASK_STATUS_SQL = "UPDATE tasks SET status = ?, updated_at = ? WHERE id = ? AND status = ?"
+
+def fetch_board_summary(now: datetime, overdue_limit: int = 3) -> Tuple[Dict[str, int], int, list]:
+    """Fetch per-status task counts, the overdue count and the first overdue (title, due_date) pairs."""
+    with db.atomic():
+        counts = dict(db.execute_sql(TASK_STATUS_COUNTS_SQL).fetchall())
+        overdue_rows = db.execute_sql(
+            OVERDUE_TASKS_SQL, (Task.due_date.db_value(now), overdue_limit)
+        ).fetchall()
+    
+    overdue_count = overdue_rows[0][2] if overdue_rows else 0
+    overdue_tasks = [(title, Task.due_date.python_value(due_date)) for title, due_date, _ in overdue_rows]
+    return counts, overdue_count, overdue_tasks
+
+def fetch_task_title_status(task_id: int) -> Optional[Tuple[str, str]]:
+    """Fetch a task's (title, status), or None if there is no such task."""
+    return db.execute_sql(TASK_TITLE_STATUS_SQL, (task_id,)).fetchone()
+
+def set_task_status(task_id: int, status: str, expected_status: str) -> bool:
+    """Set a task's status (and updated_at) if it is still expected_status; False if it had changed."""
+    cursor = db.execute_sql(
+        UPDATE_TASK_STATUS_SQL,
+        (status, Task.updated_at.db_value(datetime.now()), task_id, expected_status)
+    )
+    return db.rows_affected(cursor) == 1
+
 async def get_database_stats():
     """Get database statistics for monitoring."""
     try:
+        counts = {
+            source: (total, matching)
+            for source, total, matching in db.execute_sql(DATABASE_STATS_SQL).fetchall()
+        }
+        
         stats = {
-            'team_members': TeamMember.select().count(),
-            'active_members': TeamMember.select().where(TeamMember.active == True).count(),
-            'total_tasks': Task.select().count(),
-            'pending_tasks': Task.select().where(Task.status != 'done').count(),
-            'email_threads': EmailThread.select().count(),
-            'pending_responses': EmailThread.select().where(EmailThread.response_received == False).count(),
-            'pending_approvals': KanbanChange.select().where(KanbanChange.approved == False).count(),
-            'email_templates': EmailTemplate.select().where(EmailTemplate.active == True).count(),
+            'team_members': counts['team_members'][0],
+            'active_members': counts['team_members'][1],
+            'total_tasks': counts['tasks'][0],
+            'pending_tasks': counts['tasks'][1],
+            'email_threads': counts['email_threads'][0],
+            'pending_responses': counts['email_threads'][1],
+            'pending_approvals': counts['kanban_changes'][1],
+            'email_templates': counts['email_templates'][1],
         }
         
         return stats
-        
+    
     except Exception as e:
         logger.error(f"Error getting database stats: {e}")
-        return {}
\ No newline at end of file
+        return {}
@@ -1,151 +1,499 @@
 """Enhanced LLM service optimized for local LLMs with robust error handling."""
 
 import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Union
-import json
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Union
 import aiohttp
+import fastjsonschema
+import orjson
+from aiolimiter import AsyncLimiter
 from datetime import datetime
 import re
 
 from app.core.config import settings
+from app.models.database import db, get_cached_email_parse, store_email_parse
+
+try:
+    # One automaton pass finds every status/priority keyword at once
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+SUBJECT_PREFIX_PATTERN = re.compile(r'^(Re:|Fwd:|Subject:)', re.IGNORECASE)
+
+# Start of the quoted history or signature in a reply: "On ... wrote:", Outlook's
+# "-----Original Message-----" or underscore separator, or the "-- " signature delimiter
+QUOTED_REPLY_START_PATTERN = re.compile(
+    r'^(?:On .+ wrote:|-{2,} ?Original Message ?-{2,}|_{10,}|-- ?)\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+def strip_quoted_reply(email_content: str) -> str:
+    """Strip quoted history and signature from an email, keeping only its new text."""
+    match = QUOTED_REPLY_START_PATTERN.search(email_content)
+    new_text = email_content[:match.start()] if match else email_content
+    lines = [line for line in new_text.splitlines() if not line.lstrip().startswith('>')]
+    return '\n'.join(lines).strip() or email_content.strip()
+
+# Fixed instructions come first and the per-call content last, so repeated prompts
+# share a byte-identical prefix that Ollama can reuse from its KV cache
+EMAIL_PARSE_PREFIX = """Extract task information from this email. Respond with ONLY a JSON object in this format:
+{
+  "task_title": "brief task name",
+  "status": "todo|in_progress|review|done|blocked",
+  "priority": "low|medium|high|urgent",
+  "description": "brief description"
+}
+
+Email: """
+EMAIL_PARSE_SUFFIX = """
+
+JSON:"""
+EMAIL_CONTENT_LIMIT = 700
+
+# Required fields must be present and non-empty
+_NON_EMPTY = {"not": {"enum": ["", None, 0, False, [], {}]}}
+PARSED_EMAIL_SCHEMA = {
+    "type": "object",
+    "required": ["task_title", "status", "priority"],
+    "properties": {
+        "task_title": _NON_EMPTY,
+        "status": _NON_EMPTY,
+        "priority": _NON_EMPTY,
+    },
+}
+# Unknown status/priority values are replaced with these defaults rather than rejected
+PARSED_EMAIL_VALUES_SCHEMA = {
+    "properties": {
+        "status": {"enum": ["todo", "in_progress", "review", "done", "blocked"]},
+        "priority": {"enum": ["low", "medium", "high", "urgent"]},
+    },
+}
+PARSED_EMAIL_DEFAULTS = {"status": "in_progress", "priority": "medium"}
+validate_parsed_email = fastjsonschema.compile(PARSED_EMAIL_SCHEMA)
+validate_parsed_email_values = fastjsonschema.compile(PARSED_EMAIL_VALUES_SCHEMA)
+
+DESCRIPTION_PREVIEW_LENGTH = 200
+DESCRIPTION_ELLIPSIS = "..."
+
+SUMMARY_PROMPT_PREFIXES = {
+    "kanban": "Summarize this kanban board data in 2-3 sentences:\n\nData: ",
+    "team": "Summarize this team status in 2-3 sentences:\n\nData: ",
+    "status": "Summarize this information in 2-3 sentences:\n\nData: ",
+}
+SUMMARY_PROMPT_SUFFIX = "\n\nSummary:"
+
+def keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    """Compile keywords into one alternation matching any of them as a substring."""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+# Checked in order; the first category with a matching keyword wins
+STATUS_KEYWORDS = (
+    ('done', ('done', 'completed', 'finished', 'complete', 'delivered')),
+    ('blocked', ('blocked', 'stuck', 'issue', 'problem', 'blocker', 'waiting')),
+    ('review', ('review', 'feedback', 'check', 'testing', 'qa')),
+    ('todo', ('starting', 'begin', 'todo', 'plan', 'will start')),
+    ('in_progress', ('working', 'progress', 'developing', 'coding', 'implementing')),
+)
+
+PRIORITY_KEYWORDS = (
+    ('urgent', ('urgent', 'asap', 'critical', 'emergency', 'immediately')),
+    ('high', ('high', 'important', 'priority', 'soon', 'quickly')),
+    ('low', ('low', 'minor', 'later', 'when possible', 'no rush')),
+)
+
+STATUS_KEYWORD_PATTERNS = tuple((status, keyword_pattern(keywords)) for status, keywords in STATUS_KEYWORDS)
+PRIORITY_KEYWORD_PATTERNS = tuple((priority, keyword_pattern(keywords)) for priority, keywords in PRIORITY_KEYWORDS)
+
+def build_keyword_automaton(status_keywords, priority_keywords):
+    """Build an automaton mapping each keyword to its ('status'|'priority', label)."""
+    automaton = ahocorasick.Automaton()
+    for kind, categories in (('status', status_keywords), ('priority', priority_keywords)):
+        for label, keywords in categories:
+            for keyword in keywords:
+                automaton.add_word(keyword, (kind, label))
+    automaton.make_automaton()
+    return automaton
+
+def match_keyword_labels(
+    automaton,
+    content_lower: str,
+    status_keywords,
+    priority_keywords
+) -> Tuple[Optional[str], Optional[str]]:
+    """Find the first status and priority label, in keyword order, with a keyword in the content."""
+    matched = {value for _, value in automaton.iter(content_lower)}
+    status = next((label for label, _ in status_keywords if ('status', label) in matched), None)
+    priority = next((label for label, _ in priority_keywords if ('priority', label) in matched), None)
+    return status, priority
+
+KEYWORD_AUTOMATON = build_keyword_automaton(STATUS_KEYWORDS, PRIORITY_KEYWORDS) if ahocorasick else None
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Token-bucket rate limiters for /api/generate, one per Ollama host
+_host_limiters: Dict[str, AsyncLimiter] = {}
+
+def get_host_limiter(host: str) -> AsyncLimiter:
+    """Get the shared generate-rate limiter for an Ollama host."""
+    if host not in _host_limiters:
+        _host_limiters[host] = AsyncLimiter(
+            settings.ollama_max_requests_per_period,
+            settings.ollama_rate_period_seconds
+        )
+    return _host_limiters[host]
+
 class LLMService:
     """Enhanced service for interacting with local Ollama LLM with robust error handling."""
     
+    # Generation options shared by every request
+    _BASE_OPTIONS = {
+        "top_p": 0.9,
+        "stop": ["\n\n", "###", "---"]  # Stop tokens to prevent rambling
+    }
+    
+    # Retry backoff bounds in seconds (full jitter)
+    _BACKOFF_BASE = 0.25
+    _BACKOFF_CAP = 4.0
+    
+    # Process-wide instance shared by the agent and its tools
+    _instance: Optional["LLMService"] = None
+    
     def __init__(self):
         self.base_url = settings.ollama_host
         self.model = settings.default_model
+        self._limiter = get_host_limiter(self.base_url)
         self.session: Optional[aiohttp.ClientSession] = None
         self.is_available = False
         self.max_retries = 3
         self.timeout = 30  # seconds
+        self.temperature = 0.3  # Lower temperature for more consistent results
+        # LRU cache of generated responses: key -> (stored_at, response_text)
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._cache_ttl = 3600  # seconds
+        self._cache_max_entries = 1024
+        # LRU cache of parsed emails: content hash -> (stored_at, parsed_data), also kept in SQLite
+        self._parse_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._parse_cache_ttl = 86400  # seconds
+        self._parse_cache_max_entries = 10000
+        # Last /api/tags result: (fetched_at, model_names)
+        self._tags_cache: Optional[Tuple[float, List[str]]] = None
+        # Generations currently running, keyed like the cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    @classmethod
+    def get(cls) -> "LLMService":
+        """Get the shared LLM service, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
     
     async def initialize(self):
         """Initialize the LLM service with connection testing."""
+        if self.is_available:
+            return  # Already initialized by another user of the shared instance
+        
         try:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
+            self._get_session()
             
             # Test connection and model availability
             await self._test_connection()
             await self._ensure_model_available()
             
             self.is_available = True
-            logger.info(f"LLM service initialized successfully with model: {self.model}")
-            
+            logger.info("LLM service initialized successfully with model: %s", self.model)
+        
         except Exception as e:
-            logger.error(f"Failed to initialize LLM service: {e}")
+            logger.error("Failed to initialize LLM service: %s", e)
             self.is_available = False
             # Don't raise - allow system to work without LLM
     
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, recreating it only if it was closed."""
+        if self.session is None or self.session.closed:
+            # One pooled connector so repeated Ollama calls reuse keep-alive connections
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=settings.ollama_max_connections,
+                    limit_per_host=settings.ollama_max_connections,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                )
+            )
+        return self.session
+    
+    async def _get_tags(self, max_age: float = 30.0) -> List[str]:
+        """Get the names of models available in Ollama, reusing a recent /api/tags result."""
+        if self._tags_cache is not None:
+            fetched_at, model_names = self._tags_cache
+            if time.time() - fetched_at <= max_age:
+                return model_names
+        
+        async with self._get_session().get(f"{self.base_url}/api/tags") as response:
+            if response.status != 200:
+                raise Exception(f"Ollama returned status: {response.status}")
+            models = orjson.loads(await response.read())
+        
+        model_names = [m['name'] for m in models.get('models', [])]
+        self._tags_cache = (time.time(), model_names)
+        return model_names
+    
     async def _test_connection(self):
         """Test connection to Ollama with retries."""
         for attempt in range(self.max_retries):
             try:
-                async with self.session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        models = await response.json()
-                        available_models = [m['name'] for m in models.get('models', [])]
-                        logger.info(f"Connected to Ollama. Available models: {available_models}")
-                        return
-                    else:
-                        raise Exception(f"Ollama returned status: {response.status}")
+                available_models = await self._get_tags(max_age=0)
+                logger.info("Connected to Ollama. Available models: %s", available_models)
+                return
             except Exception as e:
                 if attempt == self.max_retries - 1:
                     raise Exception(f"Failed to connect to Ollama after {self.max_retries} attempts: {e}")
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(self._backoff_delay(attempt))
     
     async def _ensure_model_available(self):
         """Ensure the specified model is available, pull if necessary."""
         try:
             # Check if model exists
-            async with self.session.get(f"{self.base_url}/api/tags") as response:
-                if response.status == 200:
-                    models = await response.json()
-                    available_models = [m['name'] for m in models.get('models', [])]
-                    
-                    if self.model not in available_models:
-                        logger.warning(f"Model {self.model} not found. Attempting to pull...")
-                        await self._pull_model()
-                else:
-                    raise Exception(f"Failed to check available models: {response.status}")
+            available_models = await self._get_tags()
+            
+            if self.model not in available_models:
+                logger.warning("Model %s not found. Attempting to pull...", self.model)
+                await self._pull_model()
         except Exception as e:
-            logger.error(f"Error ensuring model availability: {e}")
+            logger.error("Error ensuring model availability: %s", e)
             raise
     
     async def _pull_model(self):
         """Pull the specified model if not available."""
         try:
             payload = {"name": self.model}
-            async with self.session.post(
+            async with self._get_session().post(
                 f"{self.base_url}/api/pull",
                 json=payload
             ) as response:
                 if response.status == 200:
-                    logger.info(f"Successfully pulled model: {self.model}")
+                    self._tags_cache = None
+                    logger.info("Successfully pulled model: %s", self.model)
                 else:
                     error_text = await response.text()
                     raise Exception(f"Failed to pull model: {error_text}")
         except Exception as e:
-            logger.error(f"Error pulling model {self.model}: {e}")
+            logger.error("Error pulling model %s: %s", self.model, e)
             raise
     
-    async def generate_simple_response(self, prompt: str, max_tokens: int = 500) -> str:
-        """Generate a simple response with minimal context - optimized for local LLMs."""
+    async def generate_simple_response(
+        self,
+        prompt: str,
+        max_tokens: int = 500,
+        stream: bool = True,
+        stop_at_json: bool = False
+    ) -> str:
+        """Generate a simple response with minimal context - optimized for local LLMs.
+        
+        With stop_at_json, a streamed response is cut off as soon as it holds a complete JSON object.
+        """
         if not self.is_available:
             return "LLM service is not available. Please check Ollama connection."
         
         # Keep prompts short and focused for local LLMs
         simplified_prompt = self._simplify_prompt(prompt, max_tokens)
         
+        cache_key = self._cache_key(simplified_prompt, max_tokens, stop_at_json)
+        cached_response = self._get_cached_response(cache_key)
+        if cached_response is not None:
+            logger.debug("LLM response served from cache")
+            return cached_response
+        
+        # Share the result of an identical generation that is already running
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logger.debug("LLM response joined in-flight request")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # The caller that started the generation was cancelled, not this one; generate it here instead
+            return await self.generate_simple_response(prompt, max_tokens, stream, stop_at_json)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            response_text = await self._generate_response(
+                simplified_prompt, max_tokens, stream, stop_at_json, cache_key
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Joined callers re-raise it themselves; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(response_text)
+            return response_text
+        finally:
+            del self._inflight[cache_key]
+    
+    async def _generate_response(
+        self,
+        simplified_prompt: str,
+        max_tokens: int,
+        stream: bool,
+        stop_at_json: bool,
+        cache_key: str
+    ) -> str:
+        """Call Ollama with retries and cache successful responses."""
+        # The request body is identical across retries, so encode it once
+        body = orjson.dumps({
+            "model": self.model,
+            "prompt": simplified_prompt,
+            "stream": stream,
+            "options": {
+                **self._BASE_OPTIONS,
+                "num_predict": max_tokens,
+                "temperature": self.temperature
+            }
+        })
+        
         for attempt in range(self.max_retries):
             try:
-                payload = {
-                    "model": self.model,
-                    "prompt": simplified_prompt,
-                    "stream": False,
-                    "options": {
-                        "num_predict": max_tokens,
-                        "temperature": 0.3,  # Lower temperature for more consistent results
-                        "top_p": 0.9,
-                        "stop": ["\n\n", "###", "---"]  # Stop tokens to prevent rambling
-                    }
-                }
-                
-                async with self.session.post(
+                # Every service instance talking to this host draws from the same rate budget
+                await self._limiter.acquire()
+                async with self._get_session().post(
                     f"{self.base_url}/api/generate",
-                    json=payload
+                    data=body,
+                    headers=JSON_HEADERS
                 ) as response:
                     if response.status == 200:
-                        result = await response.json()
-                        response_text = result.get("response", "").strip()
+                        if stream:
+                            response_text = await self._read_streamed_response(response, stop_at_json)
+                        else:
+                            result = await response.json()
+                            response_text = result.get("response", "").strip()
                         
                         if response_text:
-                            logger.debug(f"LLM response generated successfully (attempt {attempt + 1})")
+                            logger.debug("LLM response generated successfully (attempt %d)", attempt + 1)
+                            self._store_cached_response(cache_key, response_text)
                             return response_text
                         else:
                             raise Exception("Empty response from LLM")
                     else:
                         error_text = await response.text()
+                        if response.status < 500:
+                            # Client errors (bad model name, malformed request) won't succeed on retry
+                            logger.error("LLM generation rejected with status %s: %s", response.status, error_text)
+                            return f"Error generating response: LLM generation failed: {error_text}"
                         raise Exception(f"LLM generation failed: {error_text}")
-                        
+            
             except Exception as e:
-                logger.warning(f"LLM generation attempt {attempt + 1} failed: {e}")
+                logger.warning("LLM generation attempt %d failed: %s", attempt + 1, e)
                 if attempt == self.max_retries - 1:
-                    logger.error(f"All LLM generation attempts failed: {e}")
+                    logger.error("All LLM generation attempts failed: %s", e)
                     return f"Error generating response: {str(e)}"
-                await asyncio.sleep(1)  # Brief pause before retry
+                await asyncio.sleep(self._backoff_delay(attempt))
         
         return "Failed to generate response after multiple attempts."
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """Capped exponential backoff with full jitter so concurrent retries spread out."""
+        return random.uniform(0, min(self._BACKOFF_CAP, self._BACKOFF_BASE * (2 ** attempt)))
+    
+    async def _read_streamed_response(self, response: aiohttp.ClientResponse, stop_at_json: bool) -> str:
+        """Accumulate a streamed /api/generate response, one JSON line per chunk."""
+        parts = []
+        async for line in response.content:
+            if not line.strip():
+                continue
+            
+            chunk = orjson.loads(line)
+            if chunk.get("error"):
+                raise Exception(f"LLM generation failed: {chunk['error']}")
+            
+            token = chunk.get("response", "")
+            parts.append(token)
+            if chunk.get("done"):
+                break
+            
+            # Stop reading (and generating) once the JSON answer is complete
+            if stop_at_json and '}' in token and self._extract_json_object(''.join(parts)):
+                break
+        
+        return ''.join(parts).strip()
+    
+    async def generate_simple_response_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 500,
+        concurrency: int = 8,
+        stop_at_json: bool = False
+    ) -> List[Union[str, BaseException]]:
+        """Generate responses for several prompts concurrently, in input order."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def generate_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate_simple_response(
+                    prompt, max_tokens, stop_at_json=stop_at_json
+                )
+        
+        return await asyncio.gather(
+            *(generate_one(prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+    
+    def _cache_key(self, simplified_prompt: str, max_tokens: int, stop_at_json: bool = False) -> str:
+        """Build the response cache key for a prompt and its generation options."""
+        key_data = {
+            "m": self.model,
+            "p": simplified_prompt,
+            "n": max_tokens,
+            "t": self.temperature,
+            "j": stop_at_json
+        }
+        return hashlib.sha256(orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Get a cached response if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, response_text = entry
+        if time.time() - stored_at > self._cache_ttl:
+            del self._cache[key]
+            return None
+        
+        self._cache.move_to_end(key)
+        return response_text
+    
+    def _store_cached_response(self, key: str, response_text: str):
+        """Cache a successful response, evicting the least recently used entries."""
+        self._cache[key] = (time.time(), response_text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+    
     def _simplify_prompt(self, prompt: str, max_tokens: int) -> str:
         """Simplify prompts for better local LLM performance."""
-        # Remove excessive whitespace and newlines
-        simplified = re.sub(r'\s+', ' ', prompt.strip())
+        # Remove excessive whitespace and newlines (str.split also drops leading/trailing runs)
+        simplified = ' '.join(prompt.split())
         
         # Truncate if too long (leave room for response)
         max_prompt_length = 1000  # Conservative limit for local LLMs
@@ -153,72 +501,184 @@ class LLMService:
             simplified = simplified[:max_prompt_length] + "..."
         
         # Add clear instruction format
-        if not simplified.endswith('.') and not simplified.endswith('?'):
+        if not simplified.endswith(('.', '?')):
             simplified += "."
         
         return simplified
     
     async def parse_email_content_simple(self, email_content: str) -> Dict[str, Any]:
         """Parse email content with simple, structured approach for local LLMs."""
+        # Replies repeat earlier messages; only the new text is parsed and used as the cache key
+        new_text = strip_quoted_reply(email_content)
         if not self.is_available:
-            return self._fallback_email_parsing(email_content)
+            return self._fallback_email_parsing(new_text)
         
-        # Truncate email content to manageable size
-        content = email_content[:800] if len(email_content) > 800 else email_content
-        
-        prompt = f"""Extract task information from this email. Respond with ONLY a JSON object:
-
-Email: {content}
-
-Required JSON format:
-{{
-  "task_title": "brief task name",
-  "status": "todo|in_progress|review|done|blocked",
-  "priority": "low|medium|high|urgent",
-  "description": "brief description"
-}}
-
-JSON:"""
+        key = self._parse_cache_key(new_text)
+        parsed_data = self._get_cached_parse(key)
+        if parsed_data is not None:
+            return parsed_data
         
         try:
-            response = await self.generate_simple_response(prompt, max_tokens=200)
+            response = await self.generate_simple_response(
+                self._email_parsing_prompt(new_text), max_tokens=200, stop_at_json=True
+            )
+            parsed_data = self._parse_email_response(response)
+        except Exception as e:
+            logger.error("Error parsing email with LLM: %s", e)
+            return self._fallback_email_parsing(new_text)
+        
+        if parsed_data is None:
+            return self._fallback_email_parsing(new_text)
+        self._store_cached_parse(key, parsed_data)
+        return parsed_data
+    
+    async def parse_email_content_simple_batch(
+        self,
+        email_contents: List[str],
+        concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Parse several emails concurrently; failed items use fallback parsing."""
+        new_texts = [strip_quoted_reply(content) for content in email_contents]
+        if not self.is_available:
+            return [self._fallback_email_parsing(new_text) for new_text in new_texts]
+        
+        keys = [self._parse_cache_key(new_text) for new_text in new_texts]
+        results = [self._get_cached_parse(key) for key in keys]
+        missing = [index for index, parsed_data in enumerate(results) if parsed_data is None]
+        
+        prompts = [self._email_parsing_prompt(new_texts[index]) for index in missing]
+        responses = await self.generate_simple_response_batch(
+            prompts, max_tokens=200, concurrency=concurrency, stop_at_json=True
+        )
+        
+        for index, response in zip(missing, responses):
+            if isinstance(response, BaseException):
+                logger.error("Error parsing email with LLM: %s", response)
+                parsed_data = None
+            else:
+                parsed_data = self._parse_email_response(response)
             
+            if parsed_data is None:
+                results[index] = self._fallback_email_parsing(new_texts[index])
+            else:
+                self._store_cached_parse(keys[index], parsed_data)
+                results[index] = parsed_data
+        return results
+    
+    def _parse_cache_key(self, new_text: str) -> str:
+        """Build the parse cache key for an email's new text."""
+        normalized = ' '.join(new_text.split())
+        return hashlib.blake2b(f"{self.model}\0{normalized}".encode(), digest_size=16).hexdigest()
+    
+    def _get_cached_parse(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached parse result from memory, then from the database."""
+        entry = self._parse_cache.get(key)
+        if entry is not None:
+            stored_at, parsed_data = entry
+            if time.time() - stored_at <= self._parse_cache_ttl:
+                self._parse_cache.move_to_end(key)
+                return dict(parsed_data)
+            del self._parse_cache[key]
+        
+        # Only use the database when the app has connected it
+        if db.is_closed():
+            return None
+        try:
+            parsed_data = get_cached_email_parse(key, self._parse_cache_ttl)
+        except Exception as e:
+            logger.debug("Could not read email parse cache: %s", e)
+            return None
+        if parsed_data is not None:
+            self._remember_parse(key, parsed_data)
+        return parsed_data
+    
+    def _store_cached_parse(self, key: str, parsed_data: Dict[str, Any]):
+        """Cache a successful parse in memory and in the database."""
+        self._remember_parse(key, parsed_data)
+        if db.is_closed():
+            return
+        try:
+            store_email_parse(key, parsed_data)
+        except Exception as e:
+            logger.debug("Could not write email parse cache: %s", e)
+    
+    def _remember_parse(self, key: str, parsed_data: Dict[str, Any]):
+        """Keep a parse result in memory, evicting the least recently used entries."""
+        self._parse_cache[key] = (time.time(), dict(parsed_data))
+        self._parse_cache.move_to_end(key)
+        while len(self._parse_cache) > self._parse_cache_max_entries:
+            self._parse_cache.popitem(last=False)
+    
+    def _email_parsing_prompt(self, email_content: str) -> str:
+        """Build the task extraction prompt for an email."""
+        # Truncate email content so prefix, content and suffix fit the simplified prompt limit
+        content = email_content[:EMAIL_CONTENT_LIMIT]
+        return f"{EMAIL_PARSE_PREFIX}{content}{EMAIL_PARSE_SUFFIX}"
+    
+    def _parse_email_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """Extract parsed task data from an LLM response, or None if it is unusable."""
+        try:
             # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                parsed_data = json.loads(json_str)
+            json_str = self._extract_json_object(response)
+            if json_str:
+                parsed_data = orjson.loads(json_str)
                 
                 # Validate required fields
                 if self._validate_parsed_email(parsed_data):
                     logger.info("Successfully parsed email with LLM")
                     return parsed_data
-            
-            # If JSON parsing fails, fall back
-            logger.warning("LLM response was not valid JSON, using fallback")
-            return self._fallback_email_parsing(email_content)
-            
         except Exception as e:
-            logger.error(f"Error parsing email with LLM: {e}")
-            return self._fallback_email_parsing(email_content)
+            logger.error("Error parsing email with LLM: %s", e)
+            return None
+        
+        # If JSON parsing fails, the caller falls back
+        logger.warning("LLM response was not valid JSON, using fallback")
+        return None
     
-    def _validate_parsed_email(self, data: Dict[str, Any]) -> bool:
-        """Validate parsed email data structure."""
-        required_fields = ['task_title', 'status', 'priority']
-        valid_statuses = ['todo', 'in_progress', 'review', 'done', 'blocked']
-        valid_priorities = ['low', 'medium', 'high', 'urgent']
+    def _extract_json_object(self, text: str) -> Optional[str]:
+        """Return the first balanced {...} object in text, ignoring braces inside strings."""
+        start = text.find('{')
+        if start == -1:
+            return None
         
-        # Check required fields
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return False
+        depth = 0
+        in_string = False
+        escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
         
-        # Validate status and priority values
-        if data['status'] not in valid_statuses:
-            data['status'] = 'in_progress'  # Default fallback
+        return None
+    
+    def _validate_parsed_email(self, data: Dict[str, Any]) -> bool:
+        """Validate parsed email data structure."""
+        try:
+            validate_parsed_email(data)
+        except fastjsonschema.JsonSchemaException:
+            return False
         
-        if data['priority'] not in valid_priorities:
-            data['priority'] = 'medium'  # Default fallback
+        # Default each offending status/priority value, then re-check the rest
+        for _ in PARSED_EMAIL_DEFAULTS:
+            try:
+                validate_parsed_email_values(data)
+                break
+            except fastjsonschema.JsonSchemaException as e:
+                field = e.name.rpartition('.')[2]
+                data[field] = PARSED_EMAIL_DEFAULTS[field]
         
         return True
     
@@ -226,58 +686,58 @@ JSON:"""
         """Fallback parsing when LLM is not available or fails."""
         content_lower = email_content.lower()
         
+        # Short emails are used as-is; only longer ones are sliced
+        description = email_content
+        if len(email_content) > DESCRIPTION_PREVIEW_LENGTH:
+            description = email_content[:DESCRIPTION_PREVIEW_LENGTH] + DESCRIPTION_ELLIPSIS
+        
         # Extract basic information using keywords
         result = {
             'task_title': self._extract_task_title(email_content),
-            'description': email_content[:200] + "..." if len(email_content) > 200 else email_content,
-            'status': self._detect_status(content_lower),
-            'priority': self._detect_priority(content_lower)
+            'description': description
         }
+        result['status'], result['priority'] = self._detect_status_and_priority(content_lower)
         
         logger.info("Used fallback email parsing")
         return result
     
     def _extract_task_title(self, content: str) -> str:
         """Extract a reasonable task title from email content."""
-        lines = content.strip().split('\n')
+        lines = content.strip().splitlines()
         
         # Look for lines that might be task titles
         for line in lines[:5]:  # Check first 5 lines
             line = line.strip()
             if line and len(line) < 100 and not line.startswith(('Hi', 'Hello', 'Dear', 'Thanks')):
                 # Clean up the line
-                title = re.sub(r'^(Re:|Fwd:|Subject:)', '', line, flags=re.IGNORECASE).strip()
+                title = SUBJECT_PREFIX_PATTERN.sub('', line).strip()
                 if title:
                     return title[:50]  # Limit length
         
         return "Email Update"
     
+    def _detect_status_and_priority(self, content_lower: str) -> Tuple[str, str]:
+        """Detect status and priority together, in a single scan when ahocorasick is available."""
+        if KEYWORD_AUTOMATON is None:
+            return self._detect_status(content_lower), self._detect_priority(content_lower)
+        
+        status, priority = match_keyword_labels(
+            KEYWORD_AUTOMATON, content_lower, STATUS_KEYWORDS, PRIORITY_KEYWORDS
+        )
+        return status or 'in_progress', priority or 'medium'
+    
     def _detect_status(self, content_lower: str) -> str:
         """Detect task status from email content."""
-        status_keywords = {
-            'done': ['done', 'completed', 'finished', 'complete', 'delivered'],
-            'blocked': ['blocked', 'stuck', 'issue', 'problem', 'blocker', 'waiting'],
-            'review': ['review', 'feedback', 'check', 'testing', 'qa'],
-            'todo': ['starting', 'begin', 'todo', 'plan', 'will start'],
-            'in_progress': ['working', 'progress', 'developing', 'coding', 'implementing']
-        }
-        
-        for status, keywords in status_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for status, pattern in STATUS_KEYWORD_PATTERNS:
+            if pattern.search(content_lower):
                 return status
         
         return 'in_progress'  # Default
     
     def _detect_priority(self, content_lower: str) -> str:
         """Detect priority from email content."""
-        priority_keywords = {
-            'urgent': ['urgent', 'asap', 'critical', 'emergency', 'immediately'],
-            'high': ['high', 'important', 'priority', 'soon', 'quickly'],
-            'low': ['low', 'minor', 'later', 'when possible', 'no rush']
-        }
-        
-        for priority, keywords in priority_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for priority, pattern in PRIORITY_KEYWORD_PATTERNS:
+            if pattern.search(content_lower):
                 return priority
         
         return 'medium'  # Default
@@ -287,32 +747,51 @@ JSON:"""
         if not self.is_available:
             return self._fallback_summary(data, summary_type)
         
-        if summary_type == "kanban":
-            prompt = f"""Summarize this kanban board data in 2-3 sentences:
-
-Data: {json.dumps(data, default=str)}
-
-Summary:"""
-        elif summary_type == "team":
-            prompt = f"""Summarize this team status in 2-3 sentences:
-
-Data: {json.dumps(data, default=str)}
-
-Summary:"""
-        else:
-            prompt = f"""Summarize this information in 2-3 sentences:
-
-Data: {json.dumps(data, default=str)}
-
-Summary:"""
-        
         try:
-            response = await self.generate_simple_response(prompt, max_tokens=150)
+            response = await self.generate_simple_response(
+                self._summary_prompt(data, summary_type), max_tokens=150
+            )
             return response if response else self._fallback_summary(data, summary_type)
         except Exception as e:
-            logger.error(f"Error generating summary: {e}")
+            logger.error("Error generating summary: %s", e)
             return self._fallback_summary(data, summary_type)
     
+    async def generate_simple_summary_batch(
+        self,
+        items: List[Dict[str, Any]],
+        summary_type: str = "status",
+        concurrency: int = 8
+    ) -> List[str]:
+        """Generate several summaries of the same type concurrently."""
+        if not self.is_available:
+            return [self._fallback_summary(data, summary_type) for data in items]
+        
+        prompts = [self._summary_prompt(data, summary_type) for data in items]
+        responses = await self.generate_simple_response_batch(
+            prompts, max_tokens=150, concurrency=concurrency
+        )
+        
+        results = []
+        for data, response in zip(items, responses):
+            if isinstance(response, BaseException):
+                logger.error("Error generating summary: %s", response)
+                results.append(self._fallback_summary(data, summary_type))
+            else:
+                results.append(response if response else self._fallback_summary(data, summary_type))
+        return results
+    
+    def _summary_prompt(self, data: Dict[str, Any], summary_type: str) -> str:
+        """Build the summary prompt for a summary type."""
+        # Serialize once with orjson; non-JSON values fall back to str() as before
+        payload = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_DATACLASS
+        ).decode()
+        
+        prefix = SUMMARY_PROMPT_PREFIXES.get(summary_type, SUMMARY_PROMPT_PREFIXES["status"])
+        return f"{prefix}{payload}{SUMMARY_PROMPT_SUFFIX}"
+    
     def _fallback_summary(self, data: Dict[str, Any], summary_type: str) -> str:
         """Generate fallback summaries without LLM."""
         if summary_type == "kanban":
@@ -328,18 +807,12 @@ Summary:"""
             if not self.session:
                 return {"status": "unhealthy", "error": "No session"}
             
-            async with self.session.get(f"{self.base_url}/api/tags") as response:
-                if response.status == 200:
-                    return {
-                        "status": "healthy",
-                        "model": self.model,
-                        "available": self.is_available
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "error": f"Ollama returned status {response.status}"
-                    }
+            await self._get_tags()
+            return {
+                "status": "healthy",
+                "model": self.model,
+                "available": self.is_available
+            }
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -352,7 +825,9 @@ Summary:"""
             if self.session:
                 await self.session.close()
                 self.session = None
+            self._cache.clear()
+            self._parse_cache.clear()
             self.is_available = False
             logger.info("LLM service cleanup completed")
         except Exception as e:
-            logger.error(f"Error during LLM service cleanup: {e}")
\ No newline at end of file
+            logger.error("Error during LLM service cleanup: %s", e)
\ No newline at end of file
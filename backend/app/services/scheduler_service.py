@@ -3,40 +3,54 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
-import schedule
+from typing import Awaitable, Callable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+def next_time_of_day(now: datetime, hour: int, minute: int, weekday: Optional[int] = None) -> datetime:
+    """Get the next datetime after now at hour:minute, optionally on a given weekday (Monday=0)."""
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    if weekday is not None:
+        run_at += timedelta(days=(weekday - run_at.weekday()) % 7)
+    return run_at
+
 class SchedulerService:
     """Service for scheduling automated workflows."""
     
     def __init__(self, agent):
         self.agent = agent
         self.is_running = False
-        self.scheduler_task: Optional[asyncio.Task] = None
+        self.job_tasks: List[asyncio.Task] = []
+        # Job runs in progress; kept referenced until done so they can't be garbage collected
+        self._pending_tasks: Set[asyncio.Task] = set()
+        self.shutdown_timeout = 30  # seconds to let running jobs finish on stop
     
     async def start(self):
         """Start the scheduler service."""
         try:
             self.is_running = True
             
-            # Schedule weekly update requests (Mondays at 9 AM)
-            schedule.every().monday.at("09:00").do(self._trigger_weekly_updates)
-            
-            # Schedule daily deadline checks (every day at 8 AM)
-            schedule.every().day.at("08:00").do(self._trigger_deadline_check)
-            
-            # Schedule kanban maintenance (every 4 hours)
-            schedule.every(4).hours.do(self._trigger_kanban_maintenance)
+            jobs = [
+                # Weekly update requests (Mondays at 9 AM)
+                ("weekly_updates", lambda now: next_time_of_day(now, 9, 0, weekday=0), self._trigger_weekly_updates),
+                # Daily deadline checks (every day at 8 AM)
+                ("deadline_check", lambda now: next_time_of_day(now, 8, 0), self._trigger_deadline_check),
+                # Kanban maintenance (every 4 hours)
+                ("kanban_maintenance", lambda now: now + timedelta(hours=4), self._trigger_kanban_maintenance),
+            ]
             
-            # Start scheduler loop
-            self.scheduler_task = asyncio.create_task(self._scheduler_loop())
+            # Each job sleeps until its own next run instead of polling
+            self.job_tasks = [
+                asyncio.create_task(self._run_job(name, next_run, job))
+                for name, next_run, job in jobs
+            ]
             
             logger.info("Scheduler service started")
-            
+        
         except Exception as e:
-            logger.error(f"Failed to start scheduler service: {e}")
+            logger.error("Failed to start scheduler service: %s", e)
             raise
     
     async def stop(self):
@@ -44,49 +58,68 @@ class SchedulerService:
         try:
             self.is_running = False
             
-            if self.scheduler_task:
-                self.scheduler_task.cancel()
-                try:
-                    await self.scheduler_task
-                except asyncio.CancelledError:
-                    pass
+            for task in self.job_tasks:
+                task.cancel()
+            await asyncio.gather(*self.job_tasks, return_exceptions=True)
+            self.job_tasks = []
             
-            schedule.clear()
-            logger.info("Scheduler service stopped")
+            # Give in-progress job runs a chance to finish before cancelling them
+            if self._pending_tasks:
+                _, still_running = await asyncio.wait(self._pending_tasks, timeout=self.shutdown_timeout)
+                for task in still_running:
+                    task.cancel()
+                await asyncio.gather(*still_running, return_exceptions=True)
             
+            logger.info("Scheduler service stopped")
+        
         except Exception as e:
-            logger.error(f"Error stopping scheduler service: {e}")
+            logger.error("Error stopping scheduler service: %s", e)
     
-    async def _scheduler_loop(self):
-        """Main scheduler loop."""
+    async def _run_job(
+        self,
+        name: str,
+        next_run: Callable[[datetime], datetime],
+        job: Callable[[], Awaitable[None]]
+    ):
+        """Run a job each time its schedule comes due."""
+        run_at = next_run(datetime.now())
         while self.is_running:
-            try:
-                schedule.run_pending()
-                await asyncio.sleep(60)  # Check every minute
-            except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-                await asyncio.sleep(60)
+            delay = (run_at - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue  # Re-check in case the wall clock moved while sleeping
+            
+            # Wait for the run before scheduling the next, so a job never overlaps itself;
+            # asyncio.wait leaves the run going if this loop is cancelled
+            run = asyncio.create_task(job(), name=f"scheduler:{name}")
+            self._pending_tasks.add(run)
+            run.add_done_callback(self._task_done)
+            await asyncio.wait({run})
+            
+            run_at = next_run(max(datetime.now(), run_at))
+    
+    def _task_done(self, task: asyncio.Task):
+        """Forget a finished job run and log it if it failed."""
+        self._pending_tasks.discard(task)
+        if task.cancelled():
+            logger.warning("Scheduled job %s was cancelled", task.get_name())
+        elif task.exception():
+            logger.error("Error in scheduled job %s: %s", task.get_name(), task.exception(), exc_info=task.exception())
     
-    def _trigger_weekly_updates(self):
+    async def _trigger_weekly_updates(self):
         """Trigger weekly update workflow."""
         if self.agent and self.agent.is_active:
-            asyncio.create_task(
-                self.agent.process_message("Please send weekly update requests to all team members")
-            )
             logger.info("Triggered weekly update workflow")
+            await self.agent.process_message("Please send weekly update requests to all team members")
     
-    def _trigger_deadline_check(self):
+    async def _trigger_deadline_check(self):
         """Trigger deadline check workflow."""
         if self.agent and self.agent.is_active:
-            asyncio.create_task(
-                self.agent.process_message("Check for overdue tasks and send reminders")
-            )
             logger.info("Triggered deadline check workflow")
+            await self.agent.process_message("Check for overdue tasks and send reminders")
     
-    def _trigger_kanban_maintenance(self):
+    async def _trigger_kanban_maintenance(self):
         """Trigger kanban maintenance workflow."""
         if self.agent and self.agent.is_active:
-            asyncio.create_task(
-                self.agent.process_message("Update and synchronize the kanban board")
-            )
-            logger.info("Triggered kanban maintenance workflow")
\ No newline at end of file
+            logger.info("Triggered kanban maintenance workflow")
+            await self.agent.process_message("Update and synchronize the kanban board")
\ No newline at end of file
@@ -6,11 +6,55 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+class AnalyzeTeamMemberTool(BaseTool):
+    name: str = "analyze_team_member_status"
+    description: str = "Analyze specific team member's tasks, communications, and engagement"
+    
+    def _run(self, person: str) -> Dict[str, Any]:
+        # TODO: Implement team member analysis
+        logger.info("Analyzing status for %s", person)
+        return {
+            "name": person,
+            "active_tasks": 3,
+            "response_rate": 0.9,
+            "last_update": "2024-01-20"
+        }
+    
+    async def _arun(self, person: str) -> Dict[str, Any]:
+        return self._run(person)
+
+class GenerateStatusReportTool(BaseTool):
+    name: str = "generate_status_report"
+    description: str = "Generate detailed status reports based on manager queries"
+    
+    def _run(self, query: str, context: Dict = None) -> str:
+        # TODO: Implement LLM-based report generation
+        logger.info("Generating status report for query: %s", query)
+        return f"Status report for '{query}': All systems operational, team performing well."
+    
+    async def _arun(self, query: str, context: Dict = None) -> str:
+        return self._run(query, context)
+
+class DetectAtRiskTasksTool(BaseTool):
+    name: str = "detect_at_risk_tasks"
+    description: str = "Identify tasks that may be at risk of missing deadlines"
+    
+    def _run(self) -> List[Dict]:
+        # TODO: Implement risk detection algorithm
+        logger.info("Detecting at-risk tasks")
+        return []
+    
+    async def _arun(self) -> List[Dict]:
+        return self._run()
+
 class AnalysisTools:
     """Collection of analysis and reporting tools for the agent."""
     
     def __init__(self):
-        pass
+        # Tools are stateless, so one instance of each is shared across accesses
+        self._analyze_team_member_tool = AnalyzeTeamMemberTool()
+        self._generate_status_report_tool = GenerateStatusReportTool()
+        self._detect_at_risk_tasks_tool = DetectAtRiskTasksTool()
     
     async def initialize(self):
         """Initialize analysis tools."""
@@ -19,58 +63,14 @@ class AnalysisTools:
     @property
     def analyze_team_member_status(self):
         """Tool for analyzing team member status."""
-        
-        class AnalyzeTeamMemberTool(BaseTool):
-            name = "analyze_team_member_status"
-            description = "Analyze specific team member's tasks, communications, and engagement"
-            
-            def _run(self, person: str) -> Dict[str, Any]:
-                # TODO: Implement team member analysis
-                logger.info(f"Analyzing status for {person}")
-                return {
-                    "name": person,
-                    "active_tasks": 3,
-                    "response_rate": 0.9,
-                    "last_update": "2024-01-20"
-                }
-            
-            async def _arun(self, person: str) -> Dict[str, Any]:
-                return self._run(person)
-        
-        return AnalyzeTeamMemberTool()
+        return self._analyze_team_member_tool
     
     @property
     def generate_status_report(self):
         """Tool for generating status reports."""
-        
-        class GenerateStatusReportTool(BaseTool):
-            name = "generate_status_report"
-            description = "Generate detailed status reports based on manager queries"
-            
-            def _run(self, query: str, context: Dict = None) -> str:
-                # TODO: Implement LLM-based report generation
-                logger.info(f"Generating status report for query: {query}")
-                return f"Status report for '{query}': All systems operational, team performing well."
-            
-            async def _arun(self, query: str, context: Dict = None) -> str:
-                return self._run(query, context)
-        
-        return GenerateStatusReportTool()
+        return self._generate_status_report_tool
     
     @property
     def detect_at_risk_tasks(self):
         """Tool for detecting at-risk tasks."""
-        
-        class DetectAtRiskTasksTool(BaseTool):
-            name = "detect_at_risk_tasks"
-            description = "Identify tasks that may be at risk of missing deadlines"
-            
-            def _run(self) -> List[Dict]:
-                # TODO: Implement risk detection algorithm
-                logger.info("Detecting at-risk tasks")
-                return []
-            
-            async def _arun(self) -> List[Dict]:
-                return self._run()
-        
-        return DetectAtRiskTasksTool()
\ No newline at end of file
+        return self._detect_at_risk_tasks_tool
@@ -1,20 +1,99 @@
 """Email automation tools using pywin32 Outlook COM interface."""
 
+import asyncio
 import win32com.client
 import pythoncom
 from langchain.tools import BaseTool
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 import json
 import re
+import time
 from email.utils import parseaddr
 
-from app.models.database import TeamMember, EmailThread, EmailTemplate
-from app.services.llm_service import LLMService
+from app.models.database import (
+    db, TeamMember, EmailThread, EmailTemplate, get_active_members, get_cached_smtp_address, store_smtp_address
+)
+from app.services.llm_service import LLMService, build_keyword_automaton, keyword_pattern, match_keyword_labels
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+OL_USER_ITEMS = 0  # OlTableContents.olUserItems
+CONTACT_SEARCH_LIMIT = 20  # most contacts returned by OutlookService.search_contacts
+
+# Columns read through Outlook Tables instead of per-property COM calls on each item
+CONTACT_TABLE_COLUMNS = ("FullName", "Email1Address", "CompanyName", "Department", "JobTitle")
+MAIL_TABLE_COLUMNS = (
+    "EntryID", "Subject", "SenderName", "SenderEmailAddress", "ReceivedTime",
+    "ConversationID", "Size", "Importance", "UnRead"
+)
+
+# Subjects that mark an inbox email as a reply to an update request
+RESPONSE_SUBJECT_PATTERN = re.compile(r'update|status|progress|re:', re.IGNORECASE)
+
+# ParseEmailTool fallback keywords, checked in order; the first category with a match wins
+FALLBACK_STATUS_KEYWORDS = (
+    ('done', ('done', 'completed', 'finished', 'complete')),
+    ('blocked', ('blocked', 'stuck', 'issue', 'problem')),
+    ('review', ('review', 'feedback', 'check')),
+    ('todo', ('starting', 'begin', 'todo', 'plan')),
+)
+FALLBACK_PRIORITY_KEYWORDS = (
+    ('urgent', ('urgent', 'asap', 'critical', 'emergency')),
+    ('high', ('high', 'important', 'priority')),
+    ('low', ('low', 'minor', 'later')),
+)
+FALLBACK_STATUS_PATTERNS = tuple((status, keyword_pattern(keywords)) for status, keywords in FALLBACK_STATUS_KEYWORDS)
+FALLBACK_PRIORITY_PATTERNS = tuple(
+    (priority, keyword_pattern(keywords)) for priority, keywords in FALLBACK_PRIORITY_KEYWORDS
+)
+# One pass over the email finds every fallback keyword when pyahocorasick is installed
+FALLBACK_KEYWORD_AUTOMATON = (
+    build_keyword_automaton(FALLBACK_STATUS_KEYWORDS, FALLBACK_PRIORITY_KEYWORDS) if ahocorasick else None
+)
+
+# DASL name of the received time property, used to restrict inbox reads
+MAIL_RECEIVED_PROPERTY = "urn:schemas:httpmail:datereceived"
+
+class ContactsIndex(NamedTuple):
+    """Local contacts as parallel columns; contact dicts are only built for search results."""
+    names: List[str]  # lowercased display names
+    emails: List[str]  # lowercased email addresses
+    rows: List[Tuple[str, str, str, str, str]]  # (name, email, company, department, job_title)
+    
+    def contact(self, position: int, source: str) -> Dict[str, Any]:
+        """Build the search result dict for the contact at position."""
+        name, email, company, department, job_title = self.rows[position]
+        return {
+            'name': name,
+            'email': email,
+            'company': company,
+            'department': department,
+            'job_title': job_title,
+            'source': source
+        }
+
+class ContactItemsEvents:
+    """Outlook Items event sink that invalidates the contacts index of its OutlookService."""
+    
+    service = None
+    
+    def OnItemAdd(self, item):
+        self.service.invalidate_contacts_index()
+    
+    def OnItemChange(self, item):
+        self.service.invalidate_contacts_index()
+    
+    def OnItemRemove(self):
+        self.service.invalidate_contacts_index()
+
 class OutlookService:
     """Service for Outlook COM automation."""
     
@@ -23,7 +102,18 @@ class OutlookService:
         self.namespace = None
         self.inbox = None
         self.sent_items = None
-        self.llm_service = None
+        self.send_workers = 4  # threads used by send_emails, each with its own COM apartment
+        # Local contacts, built on first search; rebuilt once stale or when the contact count changes,
+        # in case Outlook's change events don't get through
+        self._contacts_index: Optional[ContactsIndex] = None
+        self._contacts_index_built_at = 0.0
+        self._contacts_index_count = 0
+        self._contacts_index_ttl = 300  # seconds
+        self._contact_items = None
+        self._contact_items_events = None
+        # Exchange sender DN -> (resolved_at, SMTP address), also kept in SQLite
+        self._smtp_cache: Dict[str, Tuple[float, str]] = {}
+        self._smtp_cache_ttl = 7 * 86400  # seconds
     
     def initialize(self):
         """Initialize Outlook COM connection."""
@@ -39,12 +129,9 @@ class OutlookService:
             self.inbox = self.namespace.GetDefaultFolder(6)  # olFolderInbox
             self.sent_items = self.namespace.GetDefaultFolder(5)  # olFolderSentMail
             
-            # Initialize LLM service for email parsing
-            self.llm_service = LLMService()
-            
             logger.info("Outlook COM connection established successfully")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to initialize Outlook COM: {e}")
             return False
@@ -53,48 +140,32 @@ class OutlookService:
         """Search Outlook contacts and address book."""
         try:
             contacts = []
+            seen = set()
+            term = search_term.lower()
+            
+            def add_contact(contact: Dict[str, Any]):
+                """Add a contact unless one with the same email (or name, if it has none) was added."""
+                key = contact['email'].lower() if contact['email'] else f"no_email_{contact['name'].lower()}"
+                if key not in seen:
+                    seen.add(key)
+                    contacts.append(contact)
             
             # Search in Local Contacts folder first (this works!)
             try:
-                contacts_folder = self.namespace.GetDefaultFolder(10)  # olFolderContacts
-                contact_items = contacts_folder.Items
-                
-                logger.info(f"Searching through {contact_items.Count} local contacts for '{search_term}'")
-                
-                for contact in contact_items:
-                    try:
-                        if hasattr(contact, 'Email1Address') and contact.Email1Address:
-                            name = getattr(contact, 'FullName', '') or getattr(contact, 'CompanyName', '')
-                            email = contact.Email1Address
-                            
-                            if (search_term.lower() in name.lower() or 
-                                search_term.lower() in email.lower()):
-                                contacts.append({
-                                    'name': name,
-                                    'email': email,
-                                    'company': getattr(contact, 'CompanyName', ''),
-                                    'department': getattr(contact, 'Department', ''),
-                                    'job_title': getattr(contact, 'JobTitle', ''),
-                                    'source': 'local_contacts'
-                                })
-                        elif not hasattr(contact, 'Email1Address') or not contact.Email1Address:
-                            # Handle contacts without email
-                            name = getattr(contact, 'FullName', '') or getattr(contact, 'CompanyName', '')
-                            if name and search_term.lower() in name.lower():
-                                contacts.append({
-                                    'name': name,
-                                    'email': '',  # No email available
-                                    'company': getattr(contact, 'CompanyName', ''),
-                                    'department': getattr(contact, 'Department', ''),
-                                    'job_title': getattr(contact, 'JobTitle', ''),
-                                    'source': 'local_contacts_no_email'
-                                })
-                    except Exception as e:
-                        logger.debug(f"Error processing local contact: {e}")
-                        continue
+                # Match against the cached contacts index; only the first search after a change touches COM
+                index = self._get_contacts_index()
+                for position, (name_lower, email_lower) in enumerate(zip(index.names, index.emails)):
+                    if len(contacts) >= CONTACT_SEARCH_LIMIT:
+                        break
+                    if email_lower:
+                        if term in name_lower or term in email_lower:
+                            add_contact(index.contact(position, 'local_contacts'))
+                    elif name_lower and term in name_lower:
+                        # Handle contacts without email
+                        add_contact(index.contact(position, 'local_contacts_no_email'))
                 
                 logger.info(f"Found {len(contacts)} matches in local contacts")
-                
+            
             except Exception as e:
                 logger.error(f"Error searching local contacts: {e}")
             
@@ -106,15 +177,20 @@ class OutlookService:
                     address_lists = self.namespace.AddressLists
                     
                     for addr_list in address_lists:
+                        if len(contacts) >= CONTACT_SEARCH_LIMIT:
+                            break
                         if "Global Address List" in addr_list.Name or "GAL" in addr_list.Name:
                             try:
                                 entries = addr_list.AddressEntries
                                 logger.info(f"Searching {entries.Count} GAL entries")
                                 
                                 for entry in entries:
+                                    # Stop walking the GAL as soon as the result list is full
+                                    if len(contacts) >= CONTACT_SEARCH_LIMIT:
+                                        break
                                     try:
                                         name = entry.Name
-                                        if search_term.lower() in name.lower():
+                                        if term in name.lower():
                                             # Try to get email address
                                             email = ""
                                             try:
@@ -126,7 +202,7 @@ class OutlookService:
                                                 pass
                                             
                                             if email:  # Only add if we have an email
-                                                contacts.append({
+                                                add_contact({
                                                     'name': name,
                                                     'email': email,
                                                     'company': getattr(exchange_user, 'CompanyName', '') if 'exchange_user' in locals() else '',
@@ -137,36 +213,123 @@ class OutlookService:
                                     except Exception as e:
                                         logger.debug(f"Error processing GAL entry: {e}")
                                         continue
-                                        
+                            
                             except Exception as e:
                                 logger.warning(f"GAL access failed (this is normal in many environments): {e}")
                                 break
-                            
+                
                 except Exception as e:
                     logger.warning(f"Error accessing GAL (this is normal in many environments): {e}")
             
-            # Remove duplicates based on email
-            unique_contacts = {}
-            for contact in contacts:
-                email_key = contact['email'].lower() if contact['email'] else f"no_email_{contact['name'].lower()}"
-                if email_key not in unique_contacts:
-                    unique_contacts[email_key] = contact
-            
-            final_contacts = list(unique_contacts.values())[:20]  # Limit to 20 results
-            
-            logger.info(f"Returning {len(final_contacts)} unique contacts")
-            return final_contacts
-            
+            logger.info(f"Returning {len(contacts)} unique contacts")
+            return contacts
+        
         except Exception as e:
             logger.error(f"Error searching contacts: {e}")
             return []
     
+    def _read_table(self, folder, filter_str: str, columns, sort_by: str = None, descending: bool = False):
+        """Yield matching folder items as dicts of the given columns using an Outlook Table."""
+        table = folder.GetTable(filter_str, OL_USER_ITEMS) if filter_str else folder.GetTable()
+        table.Columns.RemoveAll()
+        for column in columns:
+            table.Columns.Add(column)
+        if sort_by:
+            table.Sort(sort_by, descending)
+        
+        while not table.EndOfTable:
+            row = table.GetNextRow()
+            yield dict(zip(columns, row.GetValues()))
+    
+    def _get_contacts_index(self) -> ContactsIndex:
+        """Get the cached contacts index, building it from the Contacts folder when missing or stale."""
+        # Nothing else runs a message loop on this thread, so deliver any queued contact events now
+        pythoncom.PumpWaitingMessages()
+        if self._contacts_index is not None and not self._contacts_index_is_stale():
+            return self._contacts_index
+        
+        contacts_folder = self.namespace.GetDefaultFolder(10)  # olFolderContacts
+        self._watch_contacts(contacts_folder)
+        self._contacts_index_count = contacts_folder.Items.Count
+        self._contacts_index = self._build_contacts_index(contacts_folder)
+        self._contacts_index_built_at = time.monotonic()
+        logger.info(f"Indexed {len(self._contacts_index.rows)} local contacts")
+        return self._contacts_index
+    
+    def _contacts_index_is_stale(self) -> bool:
+        """Whether the contacts index has outlived its TTL or the Contacts folder's item count changed."""
+        if time.monotonic() - self._contacts_index_built_at >= self._contacts_index_ttl:
+            return True
+        if self._contact_items is None:
+            return False
+        try:
+            return self._contact_items.Count != self._contacts_index_count
+        except Exception:
+            return True
+    
+    def _build_contacts_index(self, contacts_folder) -> ContactsIndex:
+        """Read every contact once through an Outlook Table into a ContactsIndex."""
+        index = ContactsIndex(names=[], emails=[], rows=[])
+        for row in self._read_table(contacts_folder, "", CONTACT_TABLE_COLUMNS):
+            name = row['FullName'] or row['CompanyName'] or ''
+            email = row['Email1Address'] or ''
+            index.names.append(name.lower())
+            index.emails.append(email.lower())
+            index.rows.append(
+                (name, email, row['CompanyName'] or '', row['Department'] or '', row['JobTitle'] or '')
+            )
+        return index
+    
+    def _watch_contacts(self, contacts_folder):
+        """Drop the contacts index whenever a contact is added, changed or removed."""
+        if self._contact_items_events is not None:
+            return
+        try:
+            # Keep the Items collection referenced, or Outlook stops raising its events
+            self._contact_items = contacts_folder.Items
+            self._contact_items_events = win32com.client.WithEvents(self._contact_items, ContactItemsEvents)
+            self._contact_items_events.service = self
+        except Exception as e:
+            logger.warning(f"Could not watch contacts for changes, index will only refresh on its TTL: {e}")
+    
+    def invalidate_contacts_index(self):
+        """Forget the contacts index so the next search rebuilds it."""
+        self._contacts_index = None
+    
     def send_email(self, to_addresses: List[str], subject: str, body: str, 
                    cc_addresses: List[str] = None, bcc_addresses: List[str] = None) -> Dict[str, Any]:
         """Send email using Outlook."""
+        return self._send_mail(self.outlook, to_addresses, subject, body, cc_addresses, bcc_addresses)
+    
+    def send_emails(self, messages: List[Tuple[List[str], str, str]]) -> List[Dict[str, Any]]:
+        """Send several (to_addresses, subject, body) emails concurrently; results keep message order."""
+        with ThreadPoolExecutor(max_workers=self.send_workers) as executor:
+            return list(executor.map(lambda message: self._send_email_in_thread(*message), messages))
+    
+    def _send_email_in_thread(self, to_addresses: List[str], subject: str, body: str) -> Dict[str, Any]:
+        """Send an email from a worker thread through its own Outlook COM connection."""
+        # COM objects are bound to the apartment that created them, so each thread dispatches its own
+        pythoncom.CoInitialize()
+        try:
+            outlook = win32com.client.Dispatch("Outlook.Application")
+            return self._send_mail(outlook, to_addresses, subject, body)
+        except Exception as e:
+            logger.error(f"Error sending email: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'recipients': to_addresses,
+                'subject': subject
+            }
+        finally:
+            pythoncom.CoUninitialize()
+    
+    def _send_mail(self, outlook, to_addresses: List[str], subject: str, body: str,
+                   cc_addresses: List[str] = None, bcc_addresses: List[str] = None) -> Dict[str, Any]:
+        """Create and send a mail item through the given Outlook application."""
         try:
             # Create mail item
-            mail = self.outlook.CreateItem(0)  # olMailItem
+            mail = outlook.CreateItem(0)  # olMailItem
             
             # Set recipients
             mail.To = "; ".join(to_addresses)
@@ -191,7 +354,7 @@ class OutlookService:
                 'subject': subject,
                 'sent_at': datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             logger.error(f"Error sending email: {e}")
             return {
@@ -201,61 +364,75 @@ class OutlookService:
                 'subject': subject
             }
     
-    def get_recent_emails(self, since_date: datetime, from_addresses: List[str] = None) -> List[Dict[str, Any]]:
-        """Get recent emails from inbox."""
+    def get_recent_emails(self, since_date: datetime, from_addresses: List[str] = None,
+                          subject_pattern: Optional[re.Pattern] = None) -> List[Dict[str, Any]]:
+        """Get recent emails from inbox, optionally only those whose subject matches subject_pattern."""
         try:
-            emails = []
-            
-            # Build filter string
-            filter_date = since_date.strftime("%m/%d/%Y %H:%M %p")
-            filter_str = f"[ReceivedTime] >= '{filter_date}'"
-            
-            # Get emails from inbox
-            items = self.inbox.Items
-            items.Sort("[ReceivedTime]", True)  # Sort by received time, descending
-            
-            # Apply filter
-            filtered_items = items.Restrict(filter_str)
-            
-            for mail in filtered_items:
-                try:
-                    sender_email = self._extract_email_address(mail.SenderEmailAddress, mail.SenderName)
-                    
-                    # Filter by sender if specified
-                    if from_addresses and sender_email.lower() not in [addr.lower() for addr in from_addresses]:
-                        continue
-                    
-                    email_data = {
-                        'subject': mail.Subject,
-                        'sender_name': mail.SenderName,
-                        'sender_email': sender_email,
-                        'received_time': mail.ReceivedTime,
-                        'body': mail.Body,
-                        'conversation_id': getattr(mail, 'ConversationID', ''),
-                        'entry_id': mail.EntryID,
-                        'size': mail.Size,
-                        'importance': mail.Importance,
-                        'read': mail.UnRead == False
-                    }
-                    
-                    emails.append(email_data)
-                    
-                except Exception as e:
-                    logger.debug(f"Error processing email: {e}")
-                    continue
-            
+            emails = list(self.iter_recent_emails(since_date, from_addresses, subject_pattern))
             logger.info(f"Retrieved {len(emails)} recent emails")
             return emails
-            
+        
         except Exception as e:
             logger.error(f"Error retrieving emails: {e}")
             return []
     
+    def iter_recent_emails(self, since_date: datetime, from_addresses: List[str] = None,
+                           subject_pattern: Optional[re.Pattern] = None) -> Iterator[Dict[str, Any]]:
+        """Yield recent inbox emails newest first, loading each body only as it is yielded."""
+        # Build a typed DASL filter; DASL compares dates in UTC, so naive times are taken as local
+        filter_date = since_date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        filter_str = f"@SQL=\"{MAIL_RECEIVED_PROPERTY}\" >= '{filter_date}'"
+        
+        # Read the needed columns for matching emails, newest first, one COM call per row
+        mail_rows = self._read_table(
+            self.inbox, filter_str, MAIL_TABLE_COLUMNS, sort_by="[ReceivedTime]", descending=True
+        )
+        # Lowercase the allowed senders once per call, not once per email
+        sender_filter = frozenset(addr.lower() for addr in from_addresses) if from_addresses else None
+        
+        for row in mail_rows:
+            try:
+                # Check the subject before resolving the sender, which may need an Exchange lookup
+                if subject_pattern and not subject_pattern.search(row['Subject'] or ''):
+                    continue
+                
+                sender_email = self._extract_email_address(row['SenderEmailAddress'], row['SenderName'])
+                
+                # Filter by sender if specified
+                if sender_filter and sender_email.lower() not in sender_filter:
+                    continue
+                
+                # The body is not available as a table column, so load it only for kept emails
+                mail = self.namespace.GetItemFromID(row['EntryID'])
+                
+                email_data = {
+                    'subject': row['Subject'],
+                    'sender_name': row['SenderName'],
+                    'sender_email': sender_email,
+                    'received_time': row['ReceivedTime'],
+                    'body': mail.Body,
+                    'conversation_id': row['ConversationID'] or '',
+                    'entry_id': row['EntryID'],
+                    'size': row['Size'],
+                    'importance': row['Importance'],
+                    'read': row['UnRead'] == False
+                }
+            
+            except Exception as e:
+                logger.debug(f"Error processing email: {e}")
+                continue
+            
+            yield email_data
+    
     def _extract_email_address(self, sender_email: str, sender_name: str) -> str:
         """Extract email address from Outlook sender information."""
         try:
             # If it's an Exchange address, try to resolve it
             if sender_email.startswith('/O=') or sender_email.startswith('/o='):
+                smtp_address = self._get_cached_smtp_address(sender_email)
+                if smtp_address:
+                    return smtp_address
+                
                 try:
                     # Try to get SMTP address from Exchange
                     recipient = self.namespace.CreateRecipient(sender_name)
@@ -263,7 +440,9 @@ class OutlookService:
                     if recipient.Resolved:
                         exchange_user = recipient.AddressEntry.GetExchangeUser()
                         if exchange_user and hasattr(exchange_user, 'PrimarySmtpAddress'):
-                            return exchange_user.PrimarySmtpAddress
+                            smtp_address = exchange_user.PrimarySmtpAddress
+                            self._store_smtp_address(sender_email, smtp_address)
+                            return smtp_address
                 except:
                     pass
                 
@@ -276,19 +455,48 @@ class OutlookService:
             
             # Regular email address
             return sender_email
-            
+        
         except Exception as e:
             logger.debug(f"Error extracting email address: {e}")
             return sender_email
     
-    def mark_email_as_read(self, entry_id: str):
-        """Mark email as read."""
+    def _get_cached_smtp_address(self, sender_dn: str) -> Optional[str]:
+        """Get a previously resolved SMTP address from memory, then from the database."""
+        entry = self._smtp_cache.get(sender_dn)
+        if entry is not None and time.time() - entry[0] <= self._smtp_cache_ttl:
+            return entry[1]
+        
+        try:
+            smtp_address = get_cached_smtp_address(sender_dn, self._smtp_cache_ttl)
+        except Exception as e:
+            logger.debug(f"Could not read Exchange address cache: {e}")
+            return None
+        if smtp_address:
+            self._smtp_cache[sender_dn] = (time.time(), smtp_address)
+        return smtp_address
+    
+    def _store_smtp_address(self, sender_dn: str, smtp_address: str):
+        """Remember a resolved SMTP address in memory and in the database."""
+        self._smtp_cache[sender_dn] = (time.time(), smtp_address)
         try:
-            mail = self.namespace.GetItemFromID(entry_id)
-            mail.UnRead = False
-            mail.Save()
+            store_smtp_address(sender_dn, smtp_address)
         except Exception as e:
-            logger.error(f"Error marking email as read: {e}")
+            logger.debug(f"Could not write Exchange address cache: {e}")
+    
+    def mark_email_as_read(self, entry_id: str):
+        """Mark email as read."""
+        self.mark_emails_as_read([entry_id])
+    
+    def mark_emails_as_read(self, entry_ids: List[str]):
+        """Mark emails as read, saving only the items that were still unread."""
+        for entry_id in entry_ids:
+            try:
+                mail = self.namespace.GetItemFromID(entry_id)
+                if mail.UnRead:
+                    mail.UnRead = False
+                    mail.Save()
+            except Exception as e:
+                logger.error(f"Error marking email as read: {e}")
     
     def cleanup(self):
         """Cleanup COM resources."""
@@ -305,23 +513,42 @@ class EmailTools:
     def __init__(self):
         self.outlook_service = OutlookService()
         self.llm_service = None
+        # Loop the LLM service's session belongs to; sync tool calls run their coroutines on it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def initialize(self):
         """Initialize email tools."""
         try:
+            self._loop = asyncio.get_running_loop()
             success = self.outlook_service.initialize()
             if not success:
                 raise Exception("Failed to initialize Outlook service")
             
-            self.llm_service = LLMService()
+            self.llm_service = LLMService.get()
             await self.llm_service.initialize()
             
             logger.info("Email tools initialized successfully")
-            
+        
         except Exception as e:
             logger.error(f"Failed to initialize email tools: {e}")
             raise
     
+    def run_async(self, coro):
+        """Run a coroutine for a sync tool call and wait for its result."""
+        if self._loop is None or self._loop.is_closed():
+            return asyncio.run(coro)
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            coro.close()
+            raise RuntimeError("Sync email tools cannot block the event loop; use the async tool interface")
+        
+        # Reuse the initialized loop (and its HTTP session) instead of creating one per call
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
     @property
     def send_team_update_request(self):
         """Tool for sending update requests to team members."""
@@ -346,11 +573,21 @@ class EmailTools:
                     
                     sent_count = 0
                     errors = []
+                    thread_rows = []
                     
+                    # Look up all recipients in one query
+                    members_by_email = {
+                        member.email: member
+                        for member in TeamMember.select().where(TeamMember.email.in_(team_members))
+                    }
+                    
+                    # Render every email first, then send them concurrently
+                    recipients = []
+                    messages = []
                     for member_email in team_members:
                         try:
                             # Get team member info
-                            member = TeamMember.get_or_none(TeamMember.email == member_email)
+                            member = members_by_email.get(member_email)
                             if not member:
                                 errors.append(f"Team member not found: {member_email}")
                                 continue
@@ -362,46 +599,45 @@ class EmailTools:
                                 'role': member.role
                             }
                             
-                            # Replace template variables
-                            email_subject = template_obj.subject
-                            email_body = template_obj.content
-                            
-                            for var, value in context.items():
-                                email_subject = email_subject.replace(f'{{{{{var}}}}}', str(value))
-                                email_body = email_body.replace(f'{{{{{var}}}}}', str(value))
-                            
-                            # Send email
-                            result = self.email_tools.outlook_service.send_email(
-                                to_addresses=[member_email],
-                                subject=email_subject,
-                                body=email_body
-                            )
-                            
-                            if result['success']:
-                                # Create email thread record
-                                EmailThread.create(
-                                    thread_id=f"update_request_{member.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                                    team_member=member,
-                                    subject=email_subject,
-                                    sent_at=datetime.now(),
-                                    status='sent',
-                                    content=email_body,
-                                    follow_up_count=0
-                                )
-                                sent_count += 1
-                            else:
-                                errors.append(f"Failed to send to {member_email}: {result.get('error', 'Unknown error')}")
-                                
+                            # Render template variables in one pass over the precompiled template
+                            email_subject, email_body = template_obj.render(context)
+                            recipients.append((member_email, member))
+                            messages.append(([member_email], email_subject, email_body))
+                        
                         except Exception as e:
                             errors.append(f"Error sending to {member_email}: {str(e)}")
                     
+                    results = self.email_tools.outlook_service.send_emails(messages)
+                    
+                    for (member_email, member), message, result in zip(recipients, messages, results):
+                        _, email_subject, email_body = message
+                        if result['success']:
+                            # Record the email thread; rows are inserted together after sending
+                            sent_at = datetime.fromisoformat(result['sent_at'])
+                            thread_rows.append({
+                                'thread_id': f"update_request_{member.id}_{sent_at.strftime('%Y%m%d_%H%M%S')}",
+                                'team_member': member,
+                                'subject': email_subject,
+                                'sent_at': sent_at,
+                                'status': 'sent',
+                                'content': email_body,
+                                'follow_up_count': 0
+                            })
+                            sent_count += 1
+                        else:
+                            errors.append(f"Failed to send to {member_email}: {result.get('error', 'Unknown error')}")
+                    
+                    if thread_rows:
+                        with db.atomic():
+                            EmailThread.insert_many(thread_rows).execute()
+                    
                     result_msg = f"Successfully sent update requests to {sent_count} team members"
                     if errors:
                         result_msg += f". Errors: {'; '.join(errors)}"
                     
                     logger.info(result_msg)
                     return result_msg
-                    
+                
                 except Exception as e:
                     error_msg = f"Error in send_team_update_request: {str(e)}"
                     logger.error(error_msg)
@@ -425,68 +661,81 @@ class EmailTools:
                 self.email_tools = email_tools
             
             def _run(self, since_timestamp: datetime) -> List[Dict]:
+                return self.email_tools.run_async(self._arun(since_timestamp))
+            
+            async def _arun(self, since_timestamp: datetime) -> List[Dict]:
                 try:
-                    # Get team member emails
-                    team_members = list(TeamMember.select().where(TeamMember.active == True))
-                    team_emails = [member.email for member in team_members]
+                    # Cached active team members, keyed by email for sender lookups
+                    members_by_email = {member.email.lower(): member for member in get_active_members()}
                     
-                    # Get recent emails from team members
-                    emails = self.email_tools.outlook_service.get_recent_emails(
+                    # Get recent replies from team members; other emails never have their body loaded
+                    emails = self.email_tools.outlook_service.iter_recent_emails(
                         since_date=since_timestamp,
-                        from_addresses=team_emails
+                        from_addresses=list(members_by_email),
+                        subject_pattern=RESPONSE_SUBJECT_PATTERN
                     )
                     
                     responses = []
+                    threads = []
+                    unread_entry_ids = []
                     
                     for email in emails:
                         try:
                             # Find corresponding team member
-                            member = TeamMember.get_or_none(TeamMember.email == email['sender_email'])
+                            member = members_by_email.get(email['sender_email'].lower())
                             if not member:
                                 continue
                             
-                            # Check if this is a response to our request
-                            subject_lower = email['subject'].lower()
-                            if any(keyword in subject_lower for keyword in ['update', 'status', 'progress', 're:']):
-                                
-                                # Update or create email thread
-                                thread = EmailThread.get_or_none(
-                                    EmailThread.team_member == member,
-                                    EmailThread.response_received == False
-                                )
-                                
-                                if thread:
-                                    thread.response_received = True
-                                    thread.response_at = email['received_time']
-                                    thread.status = 'replied'
-                                    thread.save()
-                                
-                                responses.append({
-                                    'sender': email['sender_email'],
-                                    'sender_name': email['sender_name'],
-                                    'subject': email['subject'],
-                                    'content': email['body'],
-                                    'received_time': email['received_time'],
-                                    'team_member_id': member.id,
-                                    'entry_id': email['entry_id']
-                                })
-                                
-                                # Mark email as read
-                                self.email_tools.outlook_service.mark_email_as_read(email['entry_id'])
+                            # Update or create email thread
+                            thread = EmailThread.get_or_none(
+                                EmailThread.team_member == member,
+                                EmailThread.response_received == False
+                            )
+                            
+                            if thread:
+                                thread.response_received = True
+                                thread.response_at = email['received_time']
+                                thread.status = 'replied'
+                                thread.save()
+                            
+                            responses.append({
+                                'sender': email['sender_email'],
+                                'sender_name': email['sender_name'],
+                                'subject': email['subject'],
+                                'content': email['body'],
+                                'received_time': email['received_time'],
+                                'team_member_id': member.id,
+                                'entry_id': email['entry_id']
+                            })
+                            threads.append(thread)
+                            if not email['read']:
+                                unread_entry_ids.append(email['entry_id'])
                         
                         except Exception as e:
                             logger.error(f"Error processing email response: {e}")
                             continue
                     
+                    # Mark the responses as read in one pass; already read emails are not touched
+                    self.email_tools.outlook_service.mark_emails_as_read(unread_entry_ids)
+                    
+                    # Parse all responses in one batch instead of one LLM round-trip per email
+                    if responses and self.email_tools.llm_service:
+                        parsed_responses = await self.email_tools.llm_service.parse_email_content_simple_batch(
+                            [response['content'] for response in responses]
+                        )
+                        with db.atomic():
+                            for response, thread, parsed_data in zip(responses, threads, parsed_responses):
+                                response['parsed_data'] = parsed_data
+                                if thread:
+                                    thread.parsed_data = parsed_data
+                                    thread.save(only=[EmailThread.parsed_content, EmailThread.updated_at])
+                    
                     logger.info(f"Found {len(responses)} new responses from team members")
                     return responses
-                    
+                
                 except Exception as e:
                     logger.error(f"Error monitoring inbox: {e}")
                     return []
-            
-            async def _arun(self, since_timestamp: datetime) -> List[Dict]:
-                return self._run(since_timestamp)
         
         return MonitorInboxTool(self)
     
@@ -503,20 +752,21 @@ class EmailTools:
                 self.email_tools = email_tools
             
             def _run(self, email_content: str) -> Dict[str, Any]:
+                return self.email_tools.run_async(self._arun(email_content))
+            
+            async def _arun(self, email_content: str) -> Dict[str, Any]:
                 try:
                     if not self.email_tools.llm_service:
                         return self._fallback_parsing(email_content)
                     
                     # Use LLM to parse email content
-                    parsed_data = asyncio.run(
-                        self.email_tools.llm_service.parse_email_content(email_content)
-                    )
+                    parsed_data = await self.email_tools.llm_service.parse_email_content_simple(email_content)
                     
                     if not parsed_data:
                         return self._fallback_parsing(email_content)
                     
                     return parsed_data
-                    
+                
                 except Exception as e:
                     logger.error(f"Error parsing email content: {e}")
                     return self._fallback_parsing(email_content)
@@ -533,28 +783,27 @@ class EmailTools:
                     'priority': 'medium'
                 }
                 
+                if FALLBACK_KEYWORD_AUTOMATON is not None:
+                    status, priority = match_keyword_labels(
+                        FALLBACK_KEYWORD_AUTOMATON, content_lower, FALLBACK_STATUS_KEYWORDS, FALLBACK_PRIORITY_KEYWORDS
+                    )
+                    result['status'] = status or result['status']
+                    result['priority'] = priority or result['priority']
+                    return result
+                
                 # Simple status detection
-                if any(word in content_lower for word in ['done', 'completed', 'finished', 'complete']):
-                    result['status'] = 'done'
-                elif any(word in content_lower for word in ['blocked', 'stuck', 'issue', 'problem']):
-                    result['status'] = 'blocked'
-                elif any(word in content_lower for word in ['review', 'feedback', 'check']):
-                    result['status'] = 'review'
-                elif any(word in content_lower for word in ['starting', 'begin', 'todo', 'plan']):
-                    result['status'] = 'todo'
+                for status, pattern in FALLBACK_STATUS_PATTERNS:
+                    if pattern.search(content_lower):
+                        result['status'] = status
+                        break
                 
                 # Simple priority detection
-                if any(word in content_lower for word in ['urgent', 'asap', 'critical', 'emergency']):
-                    result['priority'] = 'urgent'
-                elif any(word in content_lower for word in ['high', 'important', 'priority']):
-                    result['priority'] = 'high'
-                elif any(word in content_lower for word in ['low', 'minor', 'later']):
-                    result['priority'] = 'low'
+                for priority, pattern in FALLBACK_PRIORITY_PATTERNS:
+                    if pattern.search(content_lower):
+                        result['priority'] = priority
+                        break
                 
                 return result
-            
-            async def _arun(self, email_content: str) -> Dict[str, Any]:
-                return self._run(email_content)
         
         return ParseEmailTool(self)
     
@@ -594,13 +843,8 @@ class EmailTools:
                         'priority': task_info.get('priority', 'Medium')
                     }
                     
-                    # Replace template variables
-                    email_subject = template_obj.subject
-                    email_body = template_obj.content
-                    
-                    for var, value in context.items():
-                        email_subject = email_subject.replace(f'{{{{{var}}}}}', str(value))
-                        email_body = email_body.replace(f'{{{{{var}}}}}', str(value))
+                    # Render template variables in one pass over the precompiled template
+                    email_subject, email_body = template_obj.render(context)
                     
                     # Send email
                     result = self.email_tools.outlook_service.send_email(
@@ -623,7 +867,7 @@ class EmailTools:
                         return f"Follow-up email sent to {recipient}"
                     else:
                         return f"Failed to send follow-up to {recipient}: {result.get('error', 'Unknown error')}"
-                        
+                
                 except Exception as e:
                     error_msg = f"Error sending follow-up email: {str(e)}"
                     logger.error(error_msg)
@@ -637,7 +881,7 @@ class EmailTools:
     async def get_active_team_members(self) -> List[Dict[str, Any]]:
         """Get list of active team members from database."""
         try:
-            members = list(TeamMember.select().where(TeamMember.active == True))
+            members = get_active_members()
             return [
                 {
                     'id': member.id,
@@ -664,8 +908,7 @@ class EmailTools:
     async def cleanup(self):
         """Cleanup email tools resources."""
         try:
+            # The shared LLM service is cleaned up by the agent that owns it
             self.outlook_service.cleanup()
-            if self.llm_service:
-                await self.llm_service.cleanup()
         except Exception as e:
             logger.error(f"Error during email tools cleanup: {e}")
\ No newline at end of file
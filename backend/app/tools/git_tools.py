@@ -1,96 +1,46 @@
 """Enhanced Git and GitHub integration tools for publishing Kanban board to GitHub Pages."""
 
 from langchain.tools import BaseTool
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import base64
 import logging
-import os
+import hashlib
 import json
-import subprocess
+import re
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-import tempfile
-import shutil
+from string import Template
+import time
 
-from app.models.database import Task, TeamMember, KanbanChange
+import httpx
+import orjson
+
+try:
+    import h2  # enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+from app.models.database import db, Task, TeamMember, KanbanChange
+from app.tools.kanban_tools import write_generation
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-class GitTools:
-    """Collection of Git and GitHub tools for publishing Kanban board to GitHub Pages."""
-    
-    def __init__(self):
-        self.repo_path = None
-        self.temp_dir = None
-    
-    async def initialize(self):
-        """Initialize Git tools."""
-        logger.info("Git tools initialized")
-    
-    def _setup_temp_repo(self) -> str:
-        """Setup temporary repository for GitHub operations."""
-        try:
-            # Create temporary directory
-            self.temp_dir = tempfile.mkdtemp(prefix="kanban_publish_")
-            self.repo_path = os.path.join(self.temp_dir, "kanban-board")
-            
-            # Clone or initialize repository
-            if settings.github_repo:
-                # Clone existing repository
-                clone_url = f"https://{settings.github_token}@github.com/{settings.github_repo}.git"
-                result = subprocess.run([
-                    "git", "clone", clone_url, self.repo_path
-                ], capture_output=True, text=True, cwd=self.temp_dir)
-                
-                if result.returncode != 0:
-                    logger.warning(f"Failed to clone repository: {result.stderr}")
-                    # Initialize new repository
-                    os.makedirs(self.repo_path, exist_ok=True)
-                    subprocess.run(["git", "init"], cwd=self.repo_path, check=True)
-            else:
-                # Initialize new repository
-                os.makedirs(self.repo_path, exist_ok=True)
-                subprocess.run(["git", "init"], cwd=self.repo_path, check=True)
-            
-            # Configure git user
-            subprocess.run([
-                "git", "config", "user.name", "Assistant Manager"
-            ], cwd=self.repo_path, check=True)
-            subprocess.run([
-                "git", "config", "user.email", "assistant@manager.local"
-            ], cwd=self.repo_path, check=True)
-            
-            return self.repo_path
-            
-        except Exception as e:
-            logger.error(f"Error setting up temporary repository: {e}")
-            raise
-    
-    def _cleanup_temp_repo(self):
-        """Cleanup temporary repository."""
-        try:
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-                self.temp_dir = None
-                self.repo_path = None
-        except Exception as e:
-            logger.error(f"Error cleaning up temporary repository: {e}")
-    
-    def _generate_kanban_html(self, board_data: Dict[str, Any]) -> str:
-        """Generate beautiful HTML for the Kanban board."""
-        
-        # Get current timestamp
-        last_updated = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-        
-        # Calculate statistics
-        total_tasks = sum(len(column.get('tasks', [])) for column in board_data.get('columns', []))
-        completed_tasks = len([
-            task for column in board_data.get('columns', []) 
-            if column.get('id') == 'done'
-            for task in column.get('tasks', [])
-        ])
-        
-        html_content = f"""<!DOCTYPE html>
+GITHUB_API_URL = "https://api.github.com"
+
+HTML_COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.S)
+
+def _minify_html(html: str) -> str:
+    """Drop HTML comments, indentation and blank lines; line breaks stay so inline scripts still parse."""
+    lines = (line.strip() for line in HTML_COMMENT_PATTERN.sub('', html).splitlines())
+    return ''.join(line + '\n' for line in lines if line)
+
+# Static page shell around the board columns, minified and parsed once at import;
+# only the $-placeholders are filled in per publish
+KANBAN_HTML_HEAD = Template(_minify_html("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -98,12 +48,12 @@ class GitTools:
     <title>Team Kanban Board - Project Status</title>
     <script src="https://cdn.tailwindcss.com"></script>
     <script>
-        tailwind.config = {{
+        tailwind.config = {
             darkMode: 'class',
-            theme: {{
-                extend: {{
-                    colors: {{
-                        primary: {{
+            theme: {
+                extend: {
+                    colors: {
+                        primary: {
                             50: '#fef7f0',
                             100: '#fdeee0',
                             200: '#fad9c1',
@@ -114,24 +64,24 @@ class GitTools:
                             700: '#c44a25',
                             800: '#9c3d23',
                             900: '#7e3420',
-                        }}
-                    }}
-                }}
-            }}
-        }}
+                        }
+                    }
+                }
+            }
+        }
     </script>
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        body {{ font-family: 'Inter', sans-serif; }}
-        .task-card {{ transition: all 0.2s ease; }}
-        .task-card:hover {{ transform: translateY(-2px); box-shadow: 0 10px 25px rgba(0,0,0,0.1); }}
-        .priority-dot {{ width: 8px; height: 8px; border-radius: 50%; }}
-        .priority-urgent {{ background-color: #ef4444; }}
-        .priority-high {{ background-color: #ed7c4a; }}
-        .priority-medium {{ background-color: #eab308; }}
-        .priority-low {{ background-color: #6b7280; }}
-        .fade-in {{ animation: fadeIn 0.5s ease-in; }}
-        @keyframes fadeIn {{ from {{ opacity: 0; transform: translateY(20px); }} to {{ opacity: 1; transform: translateY(0); }} }}
+        body { font-family: 'Inter', sans-serif; }
+        .task-card { transition: all 0.2s ease; }
+        .task-card:hover { transform: translateY(-2px); box-shadow: 0 10px 25px rgba(0,0,0,0.1); }
+        .priority-dot { width: 8px; height: 8px; border-radius: 50%; }
+        .priority-urgent { background-color: #ef4444; }
+        .priority-high { background-color: #ed7c4a; }
+        .priority-medium { background-color: #eab308; }
+        .priority-low { background-color: #6b7280; }
+        .fade-in { animation: fadeIn 0.5s ease-in; }
+        @keyframes fadeIn { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
     </style>
 </head>
 <body class="bg-gray-50 min-h-screen">
@@ -146,15 +96,15 @@ class GitTools:
                 <div class="text-right">
                     <div class="flex items-center space-x-6">
                         <div class="text-center">
-                            <div class="text-2xl font-bold text-primary-600">{total_tasks}</div>
+                            <div class="text-2xl font-bold text-primary-600">$total_tasks</div>
                             <div class="text-sm text-gray-500">Total Tasks</div>
                         </div>
                         <div class="text-center">
-                            <div class="text-2xl font-bold text-green-600">{completed_tasks}</div>
+                            <div class="text-2xl font-bold text-green-600">$completed_tasks</div>
                             <div class="text-sm text-gray-500">Completed</div>
                         </div>
                         <div class="text-center">
-                            <div class="text-2xl font-bold text-blue-600">{total_tasks - completed_tasks}</div>
+                            <div class="text-2xl font-bold text-blue-600">$active_tasks</div>
                             <div class="text-sm text-gray-500">In Progress</div>
                         </div>
                     </div>
@@ -167,177 +117,420 @@ class GitTools:
     <main class="max-w-7xl mx-auto px-6 py-8">
         <!-- Last Updated -->
         <div class="mb-8 text-center">
-            <p class="text-gray-500">Last updated: {last_updated}</p>
+            <p class="text-gray-500">Last updated: $last_updated</p>
         </div>
 
         <!-- Kanban Board -->
         <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-5 gap-6">
-"""
+"""))
+
+KANBAN_HTML_FOOTER = Template(_minify_html("""
+        </div>
         
-        # Generate columns
-        column_styles = {
-            'todo': {'bg': 'bg-gray-50', 'border': 'border-gray-200', 'header': 'text-gray-700', 'icon': '📋'},
-            'in_progress': {'bg': 'bg-blue-50', 'border': 'border-blue-200', 'header': 'text-blue-700', 'icon': '🔄'},
-            'review': {'bg': 'bg-yellow-50', 'border': 'border-yellow-200', 'header': 'text-yellow-700', 'icon': '👀'},
-            'done': {'bg': 'bg-green-50', 'border': 'border-green-200', 'header': 'text-green-700', 'icon': '✅'},
-            'blocked': {'bg': 'bg-red-50', 'border': 'border-red-200', 'header': 'text-red-700', 'icon': '🚫'},
-        }
+        <!-- Statistics Section -->
+        <div class="mt-12 bg-white rounded-xl border border-gray-200 p-6">
+            <h3 class="text-lg font-semibold text-gray-900 mb-4">Project Statistics</h3>
+            <div class="grid grid-cols-2 md:grid-cols-4 gap-4">
+                <div class="text-center p-4 bg-gray-50 rounded-lg">
+                    <div class="text-2xl font-bold text-gray-900">$total_tasks</div>
+                    <div class="text-sm text-gray-500">Total Tasks</div>
+                </div>
+                <div class="text-center p-4 bg-green-50 rounded-lg">
+                    <div class="text-2xl font-bold text-green-600">$completed_tasks</div>
+                    <div class="text-sm text-gray-500">Completed</div>
+                </div>
+                <div class="text-center p-4 bg-blue-50 rounded-lg">
+                    <div class="text-2xl font-bold text-blue-600">$active_tasks</div>
+                    <div class="text-sm text-gray-500">Active</div>
+                </div>
+                <div class="text-center p-4 bg-primary-50 rounded-lg">
+                    <div class="text-2xl font-bold text-primary-600">$progress_percent%</div>
+                    <div class="text-sm text-gray-500">Progress</div>
+                </div>
+            </div>
+        </div>
+    </main>
+
+    <!-- Footer -->
+    <footer class="bg-white border-t border-gray-200 mt-12">
+        <div class="max-w-7xl mx-auto px-6 py-6">
+            <div class="text-center text-gray-500">
+                <p>Generated by Assistant Manager • Last updated: $last_updated</p>
+                <p class="text-xs mt-1">Automated team workflow management system</p>
+            </div>
+        </div>
+    </footer>
+
+    <script>
+        // Add fade-in animation to elements
+        document.addEventListener('DOMContentLoaded', function() {
+            const elements = document.querySelectorAll('.fade-in');
+            elements.forEach((el, index) => {
+                setTimeout(() => {
+                    el.style.opacity = '1';
+                    el.style.transform = 'translateY(0)';
+                }, index * 100);
+            });
+        });
         
-        for column in board_data.get('columns', []):
-            column_id = column.get('id', '')
-            column_title = column.get('title', '')
-            tasks = column.get('tasks', [])
-            style = column_styles.get(column_id, column_styles['todo'])
-            
-            html_content += f"""
-            <!-- {column_title} Column -->
+        // Auto-refresh every 5 minutes
+        setTimeout(() => {
+            window.location.reload();
+        }, 300000);
+    </script>
+</body>
+</html>"""))
+
+# Card colours and icon for each board column; unknown columns use the 'todo' style
+COLUMN_STYLES = {
+    'todo': {'bg': 'bg-gray-50', 'border': 'border-gray-200', 'header': 'text-gray-700', 'icon': '📋'},
+    'in_progress': {'bg': 'bg-blue-50', 'border': 'border-blue-200', 'header': 'text-blue-700', 'icon': '🔄'},
+    'review': {'bg': 'bg-yellow-50', 'border': 'border-yellow-200', 'header': 'text-yellow-700', 'icon': '👀'},
+    'done': {'bg': 'bg-green-50', 'border': 'border-green-200', 'header': 'text-green-700', 'icon': '✅'},
+    'blocked': {'bg': 'bg-red-50', 'border': 'border-red-200', 'header': 'text-red-700', 'icon': '🚫'},
+}
+
+# Opening HTML of each column with its style baked in; only {title} and {count} are filled per publish
+COLUMN_HEADER_HTML = {
+    column_id: _minify_html(f"""
+            <!-- {{title}} Column -->
             <div class="fade-in">
                 <div class="{style['bg']} {style['border']} border rounded-xl p-4 h-full">
                     <!-- Column Header -->
                     <div class="flex items-center justify-between mb-4">
                         <div class="flex items-center space-x-2">
                             <span class="text-xl">{style['icon']}</span>
-                            <h3 class="font-semibold {style['header']}">{column_title}</h3>
+                            <h3 class="font-semibold {style['header']}">{{title}}</h3>
                         </div>
                         <span class="bg-white px-2 py-1 rounded-md text-sm font-medium text-gray-600 border">
-                            {len(tasks)}
+                            {{count}}
                         </span>
                     </div>
                     
                     <!-- Tasks -->
                     <div class="space-y-3">
-"""
-            
-            # Generate tasks for this column
-            for task in tasks:
-                assignee_name = task.get('assignee', {}).get('name', 'Unassigned')
-                assignee_initials = ''.join([name[0] for name in assignee_name.split()[:2]]).upper()
-                priority = task.get('priority', 'medium')
-                due_date = task.get('due_date')
-                tags = task.get('tags', [])
-                
-                # Format due date
-                due_date_str = ""
-                if due_date:
-                    try:
-                        due_date_obj = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                        due_date_str = due_date_obj.strftime("%b %d")
-                        
-                        # Check if overdue
-                        if due_date_obj < datetime.now() and column_id != 'done':
-                            due_date_str = f'<span class="text-red-600 font-medium">⚠️ {due_date_str}</span>'
-                        else:
-                            due_date_str = f'<span class="text-gray-500">{due_date_str}</span>'
-                    except:
-                        due_date_str = '<span class="text-gray-500">Invalid date</span>'
-                
-                # Generate tags HTML
-                tags_html = ""
-                if tags:
-                    tags_html = '<div class="flex flex-wrap gap-1 mt-2">'
-                    for tag in tags[:3]:  # Show max 3 tags
-                        tags_html += f'<span class="px-2 py-1 bg-gray-100 text-gray-600 text-xs rounded">{tag}</span>'
-                    if len(tags) > 3:
-                        tags_html += f'<span class="px-2 py-1 bg-gray-100 text-gray-600 text-xs rounded">+{len(tags) - 3}</span>'
-                    tags_html += '</div>'
-                
-                html_content += f"""
+""")
+    for column_id, style in COLUMN_STYLES.items()
+}
+
+# Task card markup; the fields are formatted per task after minifying, so task text is left as is
+TASK_CARD_HTML = _minify_html("""
                         <div class="task-card bg-white rounded-lg border border-gray-200 p-3 shadow-sm">
                             <!-- Task Header -->
                             <div class="flex items-start justify-between mb-2">
                                 <h4 class="font-medium text-gray-900 text-sm leading-tight pr-2">
-                                    {task.get('title', 'Untitled Task')}
+                                    {title}
                                 </h4>
-                                <div class="priority-dot priority-{priority}"></div>
+                                {priority_dot}
                             </div>
                             
                             <!-- Task Description -->
-                            {f'<p class="text-xs text-gray-600 mb-3 leading-relaxed">{task.get("description", "")[:100]}{"..." if len(task.get("description", "")) > 100 else ""}</p>' if task.get('description') else ''}
+                            {description_html}
                             
                             <!-- Task Footer -->
                             <div class="flex items-center justify-between">
                                 <!-- Assignee -->
                                 <div class="flex items-center space-x-2">
                                     <div class="w-6 h-6 bg-gradient-to-br from-primary-400 to-primary-600 rounded-full flex items-center justify-center">
-                                        <span class="text-white text-xs font-medium">{assignee_initials}</span>
+                                        <span class="text-white text-xs font-medium">{initials}</span>
                                     </div>
-                                    <span class="text-xs text-gray-600 font-medium">{assignee_name.split()[0] if assignee_name != 'Unassigned' else 'Unassigned'}</span>
+                                    <span class="text-xs text-gray-600 font-medium">{first_name}</span>
                                 </div>
                                 
                                 <!-- Due Date -->
-                                {f'<div class="text-xs">{due_date_str}</div>' if due_date_str else ''}
+                                {due_date_html}
                             </div>
                             
                             <!-- Tags -->
                             {tags_html}
                         </div>
-"""
-            
-            html_content += """
+""")
+
+# Closes a column's task list and card
+COLUMN_FOOTER_HTML = _minify_html("""
                     </div>
                 </div>
             </div>
-"""
-        
-        # Close main content and add footer
-        html_content += f"""
-        </div>
-        
-        <!-- Statistics Section -->
-        <div class="mt-12 bg-white rounded-xl border border-gray-200 p-6">
-            <h3 class="text-lg font-semibold text-gray-900 mb-4">Project Statistics</h3>
-            <div class="grid grid-cols-2 md:grid-cols-4 gap-4">
-                <div class="text-center p-4 bg-gray-50 rounded-lg">
-                    <div class="text-2xl font-bold text-gray-900">{total_tasks}</div>
-                    <div class="text-sm text-gray-500">Total Tasks</div>
-                </div>
-                <div class="text-center p-4 bg-green-50 rounded-lg">
-                    <div class="text-2xl font-bold text-green-600">{completed_tasks}</div>
-                    <div class="text-sm text-gray-500">Completed</div>
-                </div>
-                <div class="text-center p-4 bg-blue-50 rounded-lg">
-                    <div class="text-2xl font-bold text-blue-600">{total_tasks - completed_tasks}</div>
-                    <div class="text-sm text-gray-500">Active</div>
-                </div>
-                <div class="text-center p-4 bg-primary-50 rounded-lg">
-                    <div class="text-2xl font-bold text-primary-600">{round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0)}%</div>
-                    <div class="text-sm text-gray-500">Progress</div>
-                </div>
-            </div>
-        </div>
-    </main>
+""")
 
-    <!-- Footer -->
-    <footer class="bg-white border-t border-gray-200 mt-12">
-        <div class="max-w-7xl mx-auto px-6 py-6">
-            <div class="text-center text-gray-500">
-                <p>Generated by Assistant Manager • Last updated: {last_updated}</p>
-                <p class="text-xs mt-1">Automated team workflow management system</p>
-            </div>
-        </div>
-    </footer>
+# Priority dot for each known priority; other values are formatted per task
+PRIORITY_DOT_HTML = {
+    priority: f'<div class="priority-dot priority-{priority}"></div>'
+    for priority in ('low', 'medium', 'high', 'urgent')
+}
 
-    <script>
-        // Add fade-in animation to elements
-        document.addEventListener('DOMContentLoaded', function() {{
-            const elements = document.querySelectorAll('.fade-in');
-            elements.forEach((el, index) => {{
-                setTimeout(() => {{
-                    el.style.opacity = '1';
-                    el.style.transform = 'translateY(0)';
-                }}, index * 100);
-            }});
-        }});
+@dataclass(slots=True)
+class BoardTask:
+    """A task as drawn on the published board, with the assignee's name parts worked out up front."""
+    id: int
+    title: str
+    description: str
+    status: str
+    due_date: Optional[str]
+    priority: str
+    tags: List[str]
+    assignee_name: str
+    assignee_first_name: str
+    assignee_initials: str
+
+def _name_parts(name: str) -> Tuple[str, str]:
+    """Get the first name and initials from the first two words, without splitting the whole name."""
+    name = name.strip()
+    first_space = name.find(' ')
+    first_name = name if first_space < 0 else name[:first_space]
+    second_word = name[first_space + 1:].lstrip() if first_space >= 0 else ''
+    return first_name, (name[:1] + second_word[:1]).upper()
+
+# Shape of the ISO timestamps _parse_iso accepts, checked before parsing instead of catching errors
+ISO_DATETIME_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (Z meaning UTC) as naive local time; cached since boards repeat dates."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    # Offsets are converted so the result compares with the naive datetime.now()
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+class GitTools:
+    """Collection of Git and GitHub tools for publishing Kanban board to GitHub Pages."""
+    
+    def __init__(self):
+        # Shared GitHub API client and the event loop it was opened on
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop = None
+        # Blob sha of each file as last published, keyed by (repo, branch, path)
+        self._published_shas: Dict[tuple, str] = {}
+        # Hash of the board columns last published, to skip republishing an unchanged board
+        self._last_board_hash = None
+        # Last board read for publishing: (read_at monotonic seconds, kanban write generation, board_data);
+        # reused only while no kanban write has happened since
+        self._board_cache = None
+        self._board_cache_ttl = 30  # seconds
+        # Serializes publishes so concurrent tool calls don't race on the Pages branch
+        self._publish_lock = asyncio.Lock()
+        # Board and repository URLs, derived once from the owner/repo setting
+        owner, _, repo_name = (settings.github_repo or "").partition("/")
+        self.pages_url = f"https://{owner}.github.io/{repo_name}/" if owner and repo_name else None
+        self.repo_url = f"https://github.com/{settings.github_repo}" if settings.github_repo else None
+    
+    async def initialize(self):
+        """Initialize Git tools."""
+        logger.info("Git tools initialized")
+    
+    async def cleanup(self):
+        """Close the GitHub API client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the shared GitHub API client, reopening it if closed or bound to another loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(
+                base_url=GITHUB_API_URL,
+                http2=h2 is not None,
+                timeout=30.0,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                }
+            )
+            self._http_loop = loop
+        return self._http
+    
+    async def _github_request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send an authenticated request to the GitHub REST API."""
+        headers = {"Authorization": f"Bearer {settings.github_token}"}
+        return await self._get_http().request(method, path, headers=headers, **kwargs)
+    
+    async def _create_pages_branch(self, path: str, content: bytes, message: str) -> str:
+        """Create the Pages branch as an orphan whose one commit holds a single file; returns its blob sha."""
+        git_url = f"/repos/{settings.github_repo}/git"
         
-        // Auto-refresh every 5 minutes
-        setTimeout(() => {{
-            window.location.reload();
-        }}, 300000);
-    </script>
-</body>
-</html>"""
+        # The tree carries the file content inline, so no separate blob upload is needed
+        response = await self._github_request(
+            "POST",
+            f"{git_url}/trees",
+            json={"tree": [{"path": path, "mode": "100644", "type": "blob", "content": content.decode("utf-8")}]}
+        )
+        response.raise_for_status()
+        tree = response.json()
+        
+        response = await self._github_request(
+            "POST", f"{git_url}/commits", json={"message": message, "tree": tree["sha"], "parents": []}
+        )
+        response.raise_for_status()
+        
+        response = await self._github_request(
+            "POST",
+            f"{git_url}/refs",
+            json={"ref": f"refs/heads/{settings.github_pages_branch}", "sha": response.json()["sha"]}
+        )
+        response.raise_for_status()
+        return tree["tree"][0]["sha"]
+    
+    async def _get_file_sha(self, path: str, branch: str) -> Optional[str]:
+        """Get the blob sha of a file on a branch, or None if the file or branch doesn't exist."""
+        # List the parent directory: its entries carry each blob sha without the file content,
+        # where fetching the file itself would download the whole page base64-encoded
+        directory, _, name = path.rpartition("/")
+        response = await self._github_request(
+            "GET", f"/repos/{settings.github_repo}/contents/{directory}", params={"ref": branch}
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return next((entry["sha"] for entry in response.json() if entry["name"] == name), None)
+    
+    async def _publish_file(self, path: str, content: bytes, message: str) -> bool:
+        """Write one file to the Pages branch with the Contents API; returns False if it was unchanged."""
+        url = f"/repos/{settings.github_repo}/contents/{path}"
+        branch = settings.github_pages_branch
+        key = (settings.github_repo, branch, path)
+        # The Contents API reports git blob ids, so an identical file can be detected locally
+        blob_sha = hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+        
+        # Start from the sha our last PUT left on the branch, saving the GET on repeat publishes
+        cached = key in self._published_shas
+        sha = self._published_shas[key] if cached else await self._get_file_sha(path, branch)
+        if sha == blob_sha:
+            return False
+        
+        payload = {
+            "message": message,
+            "content": base64.b64encode(content).decode("ascii"),
+            "branch": branch,
+        }
+        if sha:
+            payload["sha"] = sha
+        
+        response = await self._github_request("PUT", url, json=payload)
+        if cached and response.status_code in (409, 422):
+            # The file changed outside this process since our last publish; look its sha up again
+            del self._published_shas[key]
+            return await self._publish_file(path, content, message)
+        if sha is None and response.status_code in (404, 422):
+            # First publish: the Pages branch itself is missing, so start it with just this file
+            self._published_shas[key] = await self._create_pages_branch(path, content, message)
+            return True
+        response.raise_for_status()
+        
+        self._published_shas[key] = response.json()["content"]["sha"]
+        return True
+    
+    def _board_hash(self, board_data: Dict[str, Any]) -> str:
+        """Hash the board's columns and today's date; the last_updated timestamp is left out."""
+        # The date is included so overdue markers are republished once a due date passes
+        # orjson returns bytes for the digest directly; non-JSON values still fall back to str()
+        canonical = orjson.dumps(
+            [datetime.now().date(), board_data.get('columns', [])], default=str, option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+    
+    def _generate_kanban_html(self, board_data: Dict[str, Any]) -> str:
+        """Generate beautiful HTML for the Kanban board."""
+        return ''.join(self._iter_kanban_html(board_data))
+    
+    def _encode_kanban_html(self, board_data: Dict[str, Any]) -> bytes:
+        """Generate the Kanban board page as UTF-8 bytes, encoding it fragment by fragment."""
+        return b''.join(fragment.encode('utf-8') for fragment in self._iter_kanban_html(board_data))
+    
+    def _iter_kanban_html(self, board_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the Kanban board page in order as head, column and task fragments, then footer."""
+        
+        # Get current timestamp, read once and reused for every overdue check
+        now = datetime.now()
+        last_updated = now.strftime("%B %d, %Y at %I:%M %p")
+        
+        # Calculate statistics in one pass over the columns
+        total_tasks = 0
+        completed_tasks = 0
+        for column in board_data.get('columns', []):
+            column_tasks = len(column.get('tasks', []))
+            total_tasks += column_tasks
+            if column.get('id') == 'done':
+                completed_tasks += column_tasks
+        
+        # Yield fragments so callers never need the whole page as one str before encoding it
+        yield KANBAN_HTML_HEAD.substitute(
+            total_tasks=total_tasks,
+            completed_tasks=completed_tasks,
+            active_tasks=total_tasks - completed_tasks,
+            last_updated=last_updated
+        )
+        
+        for column in board_data.get('columns', []):
+            column_id = column.get('id', '')
+            column_title = column.get('title', '')
+            tasks = column.get('tasks', [])
+            column_header = COLUMN_HEADER_HTML.get(column_id, COLUMN_HEADER_HTML['todo'])
+            
+            yield column_header.format(title=column_title, count=len(tasks))
+            
+            # Generate tasks for this column
+            for task in tasks:
+                priority = task.priority
+                priority_dot = PRIORITY_DOT_HTML.get(priority) or f'<div class="priority-dot priority-{priority}"></div>'
+                due_date = task.due_date
+                tags = task.tags
+                
+                # Format due date
+                due_date_str = ""
+                if due_date and ISO_DATETIME_PATTERN.match(due_date):
+                    due_date_obj = _parse_iso(due_date)
+                    due_date_str = due_date_obj.strftime("%b %d")
+                    
+                    # Check if overdue
+                    if due_date_obj < now and column_id != 'done':
+                        due_date_str = f'<span class="text-red-600 font-medium">⚠️ {due_date_str}</span>'
+                    else:
+                        due_date_str = f'<span class="text-gray-500">{due_date_str}</span>'
+                
+                # Description preview, cut at 100 characters
+                description = task.description
+                description_html = ''
+                if description:
+                    ellipsis = '...' if len(description) > 100 else ''
+                    description_html = f'<p class="text-xs text-gray-600 mb-3 leading-relaxed">{description[:100]}{ellipsis}</p>'
+                
+                # Generate tags HTML
+                tags_html = ""
+                if tags:
+                    tag_labels = list(tags[:3])  # Show max 3 tags
+                    if len(tags) > 3:
+                        tag_labels.append(f'+{len(tags) - 3}')
+                    tags_html = '<div class="flex flex-wrap gap-1 mt-2">' + ''.join(
+                        f'<span class="px-2 py-1 bg-gray-100 text-gray-600 text-xs rounded">{label}</span>'
+                        for label in tag_labels
+                    ) + '</div>'
+                
+                due_date_html = f'<div class="text-xs">{due_date_str}</div>' if due_date_str else ''
+                yield TASK_CARD_HTML.format(
+                    title=task.title,
+                    priority_dot=priority_dot,
+                    description_html=description_html,
+                    initials=task.assignee_initials,
+                    first_name=task.assignee_first_name,
+                    due_date_html=due_date_html,
+                    tags_html=tags_html
+                )
+            
+            yield COLUMN_FOOTER_HTML
         
-        return html_content
+        # Close main content and add footer
+        yield KANBAN_HTML_FOOTER.substitute(
+            total_tasks=total_tasks,
+            completed_tasks=completed_tasks,
+            active_tasks=total_tasks - completed_tasks,
+            progress_percent=round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0),
+            last_updated=last_updated
+        )
     
     @property
     def publish_kanban_to_github(self):
@@ -352,113 +545,69 @@ class GitTools:
                 self.git_tools = git_tools
             
             def _run(self) -> str:
+                return asyncio.run(self._arun())
+            
+            async def _arun(self) -> str:
+                # One publish at a time; a call that waited then finds the board already published
+                async with self.git_tools._publish_lock:
+                    return await self._publish()
+            
+            async def _publish(self) -> str:
                 try:
+                    # Database read and HTML build run in a worker thread to keep the event loop responsive
+                    loop = asyncio.get_running_loop()
+                    
                     # Get current board data
-                    board_data = self._get_board_data()
+                    board_data = await loop.run_in_executor(None, self._get_board_data)
                     
-                    # Setup temporary repository
-                    repo_path = self.git_tools._setup_temp_repo()
+                    # Skip the HTML build and all GitHub requests when nothing changed since the last publish
+                    board_hash = self.git_tools._board_hash(board_data)
+                    if board_hash == self.git_tools._last_board_hash:
+                        return "No changes detected in Kanban board. GitHub Pages is already up to date."
                     
                     # Generate HTML content
-                    html_content = self.git_tools._generate_kanban_html(board_data)
-                    
-                    # Write HTML file
-                    index_path = os.path.join(repo_path, "index.html")
-                    with open(index_path, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-                    
-                    # Create README
-                    readme_content = f"""# Team Kanban Board
-
-This is an automatically generated Kanban board showing the current status of team tasks and projects.
-
-## Statistics
-- Total Tasks: {sum(len(column.get('tasks', [])) for column in board_data.get('columns', []))}
-- Completed: {len([task for column in board_data.get('columns', []) if column.get('id') == 'done' for task in column.get('tasks', [])])}
-- Last Updated: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
-
-## View Board
-Visit the live board at: https://{settings.github_repo.split('/')[0]}.github.io/{settings.github_repo.split('/')[1]}/
-
----
-*Generated by Assistant Manager - Automated Team Workflow System*
-"""
+                    html_content = await loop.run_in_executor(None, self.git_tools._encode_kanban_html, board_data)
                     
-                    readme_path = os.path.join(repo_path, "README.md")
-                    with open(readme_path, 'w', encoding='utf-8') as f:
-                        f.write(readme_content)
+                    if not (settings.github_repo and settings.github_token):
+                        return "Kanban board HTML generated successfully, but GitHub repository not configured for publishing."
                     
-                    # Git operations
-                    subprocess.run(["git", "add", "."], cwd=repo_path, check=True)
-                    
-                    # Check if there are changes to commit
-                    result = subprocess.run([
-                        "git", "diff", "--cached", "--quiet"
-                    ], cwd=repo_path, capture_output=True)
-                    
-                    if result.returncode != 0:  # There are changes
-                        # Commit changes
-                        commit_message = f"Update Kanban board - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                        subprocess.run([
-                            "git", "commit", "-m", commit_message
-                        ], cwd=repo_path, check=True)
-                        
-                        # Push to GitHub
-                        if settings.github_repo and settings.github_token:
-                            # Set up remote if it doesn't exist
-                            remote_url = f"https://{settings.github_token}@github.com/{settings.github_repo}.git"
-                            
-                            # Check if remote exists
-                            result = subprocess.run([
-                                "git", "remote", "get-url", "origin"
-                            ], cwd=repo_path, capture_output=True, text=True)
-                            
-                            if result.returncode != 0:
-                                # Add remote
-                                subprocess.run([
-                                    "git", "remote", "add", "origin", remote_url
-                                ], cwd=repo_path, check=True)
-                            
-                            # Push to main branch
-                            subprocess.run([
-                                "git", "push", "-u", "origin", "main"
-                            ], cwd=repo_path, check=True)
-                            
-                            # Create/update gh-pages branch
-                            subprocess.run([
-                                "git", "checkout", "-B", "gh-pages"
-                            ], cwd=repo_path, check=True)
-                            
-                            subprocess.run([
-                                "git", "push", "-f", "origin", "gh-pages"
-                            ], cwd=repo_path, check=True)
-                            
-                            github_pages_url = f"https://{settings.github_repo.split('/')[0]}.github.io/{settings.github_repo.split('/')[1]}/"
-                            
-                            result_message = f"Successfully published Kanban board to GitHub Pages!\n\nView your board at: {github_pages_url}\n\nThe board includes:\n- Beautiful responsive design\n- Real-time task status\n- Team member assignments\n- Priority indicators\n- Due date tracking\n- Project statistics"
-                        else:
-                            result_message = "Kanban board HTML generated successfully, but GitHub repository not configured for publishing."
+                    # Update index.html on the Pages branch in place, without cloning the repository
+                    commit_message = f"Update Kanban board - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    if await self.git_tools._publish_file("index.html", html_content, commit_message):
+                        result_message = f"Successfully published Kanban board to GitHub Pages!\n\nView your board at: {self.git_tools.pages_url}\n\nThe board includes:\n- Beautiful responsive design\n- Real-time task status\n- Team member assignments\n- Priority indicators\n- Due date tracking\n- Project statistics"
                     else:
                         result_message = "No changes detected in Kanban board. GitHub Pages is already up to date."
                     
-                    # Cleanup
-                    self.git_tools._cleanup_temp_repo()
-                    
+                    self.git_tools._last_board_hash = board_hash
                     logger.info("Kanban board published to GitHub Pages successfully")
                     return result_message
-                    
+                
                 except Exception as e:
-                    # Cleanup on error
-                    self.git_tools._cleanup_temp_repo()
                     error_msg = f"Error publishing Kanban board to GitHub Pages: {str(e)}"
                     logger.error(error_msg)
                     return error_msg
             
             def _get_board_data(self) -> Dict[str, Any]:
-                """Get current board data from database."""
+                """Get current board data from database, reusing a recent read if the board hasn't changed since."""
+                generation = write_generation()
+                board_cache = self.git_tools._board_cache
+                if (board_cache and board_cache[1] == generation
+                        and time.monotonic() - board_cache[0] < self.git_tools._board_cache_ttl):
+                    return board_cache[2]
+                
                 try:
-                    # Get all tasks with their assignees
-                    tasks = list(Task.select().join(TeamMember))
+                    # Select only the rendered columns as tuples, sorted by order, instead of full models;
+                    # this runs on an executor thread, so hand its connection back to the pool when done
+                    with db.connection_context():
+                        rows = list(
+                            Task.select(
+                                Task.id, Task.title, Task.description, Task.status, Task.due_date,
+                                Task.priority, Task.tags, TeamMember.name
+                            )
+                            .join(TeamMember)
+                            .order_by(Task.order, Task.id)
+                            .tuples()
+                        )
                     
                     # Group tasks by status
                     columns = {
@@ -469,41 +618,39 @@ Visit the live board at: https://{settings.github_repo.split('/')[0]}.github.io/
                         "blocked": {"id": "blocked", "title": "Blocked", "tasks": []},
                     }
                     
-                    for task in tasks:
-                        task_data = {
-                            "id": task.id,
-                            "title": task.title,
-                            "description": task.description,
-                            "status": task.status,
-                            "due_date": task.due_date.isoformat() if task.due_date else None,
-                            "priority": task.priority,
-                            "tags": task.tags_list,
-                            "assignee": {
-                                "id": task.assignee.id,
-                                "name": task.assignee.name,
-                                "email": task.assignee.email,
-                                "role": task.assignee.role,
-                            }
-                        }
+                    for task_id, title, description, status, due_date, priority, tags, name in rows:
+                        if status not in columns:
+                            continue
                         
-                        if task.status in columns:
-                            columns[task.status]["tasks"].append(task_data)
-                    
-                    # Sort tasks by order within each column
-                    for column in columns.values():
-                        column["tasks"].sort(key=lambda x: x.get("order", 0))
+                        try:
+                            tags_list = json.loads(tags)
+                        except:
+                            tags_list = []
+                        
+                        first_name, initials = _name_parts(name)
+                        columns[status]["tasks"].append(BoardTask(
+                            id=task_id,
+                            title=title,
+                            description=description or '',
+                            status=status,
+                            due_date=due_date.isoformat() if due_date else None,
+                            priority=priority,
+                            tags=tags_list,
+                            assignee_name=name,
+                            assignee_first_name=first_name,
+                            assignee_initials=initials,
+                        ))
                     
-                    return {
+                    board_data = {
                         "columns": list(columns.values()),
                         "last_updated": datetime.now().isoformat()
                     }
-                    
+                    self.git_tools._board_cache = (time.monotonic(), generation, board_data)
+                    return board_data
+                
                 except Exception as e:
                     logger.error(f"Error getting board data: {e}")
                     return {"columns": [], "last_updated": datetime.now().isoformat()}
-            
-            async def _arun(self) -> str:
-                return self._run()
         
         return PublishKanbanTool(self)
     
@@ -515,6 +662,10 @@ Visit the live board at: https://{settings.github_repo.split('/')[0]}.github.io/
             name = "get_github_status"
             description = "Check the status of GitHub repository and Pages deployment"
             
+            def __init__(self, git_tools):
+                super().__init__()
+                self.git_tools = git_tools
+            
             def _run(self) -> str:
                 try:
                     if not settings.github_repo:
@@ -523,21 +674,21 @@ Visit the live board at: https://{settings.github_repo.split('/')[0]}.github.io/
                     if not settings.github_token:
                         return "GitHub token not configured. Please set GITHUB_TOKEN in settings."
                     
-                    github_pages_url = f"https://{settings.github_repo.split('/')[0]}.github.io/{settings.github_repo.split('/')[1]}/"
-                    repo_url = f"https://github.com/{settings.github_repo}"
+                    if not self.git_tools.pages_url:
+                        return "GitHub repository must be given as owner/repo. Please check GITHUB_REPO in settings."
                     
                     return f"""GitHub Integration Status:
 ✅ Repository: {settings.github_repo}
 ✅ Token: Configured
-🌐 GitHub Pages URL: {github_pages_url}
-📁 Repository URL: {repo_url}
+🌐 GitHub Pages URL: {self.git_tools.pages_url}
+📁 Repository URL: {self.git_tools.repo_url}
 
 Status: Ready for publishing"""
-                    
+
                 except Exception as e:
                     return f"Error checking GitHub status: {str(e)}"
             
             async def _arun(self) -> str:
                 return self._run()
         
-        return GetGitHubStatusTool()
\ No newline at end of file
+        return GetGitHubStatusTool(self)
\ No newline at end of file
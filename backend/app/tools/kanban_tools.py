@@ -1,16 +1,89 @@
 """Streamlined Kanban board management tools optimized for LLM usage."""
 
 from langchain.tools import BaseTool
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
-import json
+import threading
+import time
 from datetime import datetime
 
-from app.models.database import Task, TeamMember, KanbanChange
+from peewee import fn
+
+from app.models.database import (
+    db, Task, TaskSearch, TeamMember, KanbanChange,
+    fetch_board_summary, fetch_task_title_status, get_member_by_email, set_task_status
+)
 from app.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# Board columns, in display order
+TASK_STATUSES = ('todo', 'in_progress', 'review', 'done', 'blocked')
+TASK_PRIORITIES = ('low', 'medium', 'high', 'urgent')
+
+# Membership checks for tool arguments
+VALID_STATUSES = frozenset(TASK_STATUSES)
+VALID_PRIORITIES = frozenset(TASK_PRIORITIES)
+
+# Output of the read-only summary tools, reused while the LLM re-reads the board between steps:
+# tool name -> (cached_at monotonic seconds, text). Cleared whenever a kanban tool writes.
+READ_CACHE_TTL = 3.0  # seconds
+_read_cache: Dict[str, Tuple[float, str]] = {}
+_read_cache_lock = threading.Lock()
+# Bumped on every invalidation, so board reads cached elsewhere (e.g. for publishing) can tell they are stale
+_write_generation = 0
+
+def _get_cached_read(name: str) -> Optional[str]:
+    """Get a read-only tool's cached output if it is still fresh."""
+    with _read_cache_lock:
+        entry = _read_cache.get(name)
+    if entry and time.monotonic() - entry[0] < READ_CACHE_TTL:
+        return entry[1]
+    return None
+
+def _store_cached_read(name: str, text: str):
+    """Cache a read-only tool's output."""
+    with _read_cache_lock:
+        _read_cache[name] = (time.monotonic(), text)
+
+def invalidate_read_cache():
+    """Drop cached read-only tool output after the board or its pending changes are modified."""
+    global _write_generation
+    with _read_cache_lock:
+        _read_cache.clear()
+        _write_generation += 1
+
+def write_generation() -> int:
+    """Count of kanban writes seen so far; changes whenever invalidate_read_cache() runs."""
+    return _write_generation
+
+def _format_date(value: datetime) -> str:
+    """Format as YYYY-MM-DD by slicing isoformat(), which skips strftime's locale-aware path."""
+    return value.isoformat()[:10]
+
+def _format_minutes(value: datetime) -> str:
+    """Format as YYYY-MM-DD HH:MM (any UTC offset dropped, as strftime did)."""
+    return value.isoformat(' ', 'minutes')[:16]
+
+def _format_change(change_id: int, change_type: str, change_data: Dict[str, Any]) -> str:
+    """Format one pending kanban change as a line of the approvals listing."""
+    if change_type == 'create':
+        return f"- ID:{change_id} CREATE: '{change_data.get('title')}' for {change_data.get('assignee')}"
+    if change_type == 'update':
+        if 'changes' in change_data:
+            return f"- ID:{change_id} UPDATE: '{change_data.get('title')}' - {', '.join(change_data['changes'])}"
+        return f"- ID:{change_id} UPDATE: '{change_data.get('title')}' - {change_data.get('field')} changed"
+    return f"- ID:{change_id} {change_type.upper()}: {change_data}"
+
+async def _run_in_thread(run, *args):
+    """Run a tool's blocking database work on a worker thread, keeping the event loop free."""
+    def call():
+        # Worker threads are reused, so hand the connection back to the pool when done
+        with db.connection_context():
+            return run(*args)
+    return await asyncio.to_thread(call)
+
 class KanbanTools:
     """Collection of simple, LLM-friendly kanban tools."""
     
@@ -20,7 +93,7 @@ class KanbanTools:
     async def initialize(self):
         """Initialize kanban tools."""
         try:
-            self.llm_service = LLMService()
+            self.llm_service = LLMService.get()
             await self.llm_service.initialize()
             logger.info("Kanban tools initialized")
         except Exception as e:
@@ -36,38 +109,35 @@ class KanbanTools:
             description = "Get a simple summary of the current kanban board status"
             
             def _run(self) -> str:
+                cached = _get_cached_read(self.name)
+                if cached is not None:
+                    return cached
+                
                 try:
-                    # Get task counts by status
-                    todo_count = Task.select().where(Task.status == 'todo').count()
-                    in_progress_count = Task.select().where(Task.status == 'in_progress').count()
-                    review_count = Task.select().where(Task.status == 'review').count()
-                    done_count = Task.select().where(Task.status == 'done').count()
-                    blocked_count = Task.select().where(Task.status == 'blocked').count()
+                    # One read transaction of precompiled SQL: counts per status, then overdue tasks
+                    counts = dict.fromkeys(TASK_STATUSES, 0)
+                    status_counts, overdue_count, overdue_tasks = fetch_board_summary(datetime.now())
+                    counts.update(status_counts)
                     
-                    total_tasks = todo_count + in_progress_count + review_count + done_count + blocked_count
-                    
-                    # Get overdue tasks
-                    overdue_tasks = list(Task.select().where(
-                        Task.due_date < datetime.now(),
-                        Task.status != 'done'
-                    ))
+                    total_tasks = sum(counts[status] for status in TASK_STATUSES)
                     
                     summary = f"""Kanban Board Summary:
 - Total Tasks: {total_tasks}
-- To Do: {todo_count}
-- In Progress: {in_progress_count}
-- Review: {review_count}
-- Done: {done_count}
-- Blocked: {blocked_count}
-- Overdue: {len(overdue_tasks)}"""
+- To Do: {counts['todo']}
+- In Progress: {counts['in_progress']}
+- Review: {counts['review']}
+- Done: {counts['done']}
+- Blocked: {counts['blocked']}
+- Overdue: {overdue_count}"""
                     
                     if overdue_tasks:
-                        summary += "\n\nOverdue Tasks:"
-                        for task in overdue_tasks[:3]:  # Show first 3
-                            summary += f"\n- {task.title} (due {task.due_date.strftime('%Y-%m-%d')})"
-                        if len(overdue_tasks) > 3:
-                            summary += f"\n- ... and {len(overdue_tasks) - 3} more"
+                        lines = [summary, "", "Overdue Tasks:"]
+                        lines.extend(f"- {title} (due {_format_date(due_date)})" for title, due_date in overdue_tasks)  # First 3
+                        if overdue_count > 3:
+                            lines.append(f"- ... and {overdue_count - 3} more")
+                        summary = "\n".join(lines)
                     
+                    _store_cached_read(self.name, summary)
                     logger.info("Generated board summary")
                     return summary
                     
@@ -77,7 +147,7 @@ class KanbanTools:
                     return error_msg
             
             async def _arun(self) -> str:
-                return self._run()
+                return await _run_in_thread(self._run)
         
         return GetBoardSummaryTool()
     
@@ -92,19 +162,18 @@ class KanbanTools:
             def _run(self, title: str, assignee_email: str, status: str = "todo", 
                     description: str = "", priority: str = "medium", due_date: str = None) -> str:
                 try:
-                    # Find assignee
-                    assignee = TeamMember.get_or_none(TeamMember.email == assignee_email)
+                    # Find assignee id and name; the roster is small and cached in-process
+                    assignee = get_member_by_email(assignee_email)
                     if not assignee:
                         return f"Error: Team member not found with email: {assignee_email}"
+                    assignee_id, assignee_name = assignee
                     
                     # Validate status
-                    valid_statuses = ['todo', 'in_progress', 'review', 'done', 'blocked']
-                    if status not in valid_statuses:
+                    if status not in VALID_STATUSES:
                         status = 'todo'
                     
                     # Validate priority
-                    valid_priorities = ['low', 'medium', 'high', 'urgent']
-                    if priority not in valid_priorities:
+                    if priority not in VALID_PRIORITIES:
                         priority = 'medium'
                     
                     # Parse due date
@@ -115,34 +184,37 @@ class KanbanTools:
                         except:
                             logger.warning(f"Invalid due date format: {due_date}")
                     
-                    # Get next order for the status column
-                    max_order = Task.select().where(Task.status == status).count()
-                    
-                    # Create task
-                    task = Task.create(
-                        title=title,
-                        description=description,
-                        status=status,
-                        assignee=assignee,
-                        due_date=parsed_due_date,
-                        priority=priority,
-                        order=max_order
-                    )
-                    
-                    # Log the change
-                    KanbanChange.create(
-                        change_type='create',
-                        task_id=task.id,
-                        task_data=json.dumps({
-                            'title': title,
-                            'assignee': assignee_email,
-                            'status': status,
-                            'priority': priority
-                        }),
-                        approved=False
-                    )
+                    # The task and its change log row commit together, in one fsync
+                    with db.atomic():
+                        # Next order in the status column, after its current last task
+                        next_order = Task.select(fn.COALESCE(fn.MAX(Task.order), -1) + 1).where(Task.status == status).scalar()
+                        
+                        # Create task
+                        task = Task.create(
+                            title=title,
+                            description=description,
+                            status=status,
+                            assignee=assignee_id,
+                            due_date=parsed_due_date,
+                            priority=priority,
+                            order=next_order
+                        )
+                        
+                        # Log the change
+                        KanbanChange.create(
+                            change_type='create',
+                            task_id=task.id,
+                            task_data={
+                                'title': title,
+                                'assignee': assignee_email,
+                                'status': status,
+                                'priority': priority
+                            },
+                            approved=False
+                        )
                     
-                    result = f"Created task '{title}' assigned to {assignee.name} ({assignee_email}) with status '{status}'"
+                    invalidate_read_cache()
+                    result = f"Created task '{title}' assigned to {assignee_name} ({assignee_email}) with status '{status}'"
                     logger.info(result)
                     return result
                     
@@ -153,7 +225,7 @@ class KanbanTools:
             
             async def _arun(self, title: str, assignee_email: str, status: str = "todo", 
                           description: str = "", priority: str = "medium", due_date: str = None) -> str:
-                return self._run(title, assignee_email, status, description, priority, due_date)
+                return await _run_in_thread(self._run, title, assignee_email, status, description, priority, due_date)
         
         return CreateTaskTool()
     
@@ -163,40 +235,46 @@ class KanbanTools:
         
         class UpdateTaskStatusTool(BaseTool):
             name = "update_task_status"
-            description = "Update a task's status. Requires: task_id, new_status (todo/in_progress/review/done/blocked)"
+            description = "Update a task's status. Requires: task_id, new_status (todo/in_progress/review/done/blocked). Optional: expected_status, the status you last saw"
             
-            def _run(self, task_id: int, new_status: str) -> str:
+            def _run(self, task_id: int, new_status: str, expected_status: str = None) -> str:
                 try:
                     # Validate status
-                    valid_statuses = ['todo', 'in_progress', 'review', 'done', 'blocked']
-                    if new_status not in valid_statuses:
-                        return f"Error: Invalid status '{new_status}'. Must be one of: {', '.join(valid_statuses)}"
-                    
-                    # Find task
-                    task = Task.get_or_none(Task.id == task_id)
-                    if not task:
-                        return f"Error: Task not found with ID: {task_id}"
-                    
-                    old_status = task.status
-                    
-                    # Update task
-                    task.status = new_status
-                    task.save()
-                    
-                    # Log the change
-                    KanbanChange.create(
-                        change_type='update',
-                        task_id=task.id,
-                        task_data=json.dumps({
-                            'field': 'status',
-                            'old_value': old_status,
-                            'new_value': new_status,
-                            'title': task.title
-                        }),
-                        approved=False
-                    )
+                    if new_status not in VALID_STATUSES:
+                        return f"Error: Invalid status '{new_status}'. Must be one of: {', '.join(TASK_STATUSES)}"
+                    
+                    # The task and its change log row commit together, in one fsync
+                    with db.atomic():
+                        # Find task
+                        row = fetch_task_title_status(task_id)
+                        if not row:
+                            return f"Error: Task not found with ID: {task_id}"
+                        
+                        title, old_status = row
+                        if expected_status and old_status != expected_status:
+                            return f"Conflict: Task '{title}' is now '{old_status}', not '{expected_status}'. Re-read it before changing its status"
+                        if old_status == new_status:
+                            return f"Task '{title}' is already '{new_status}'"
+                        
+                        # Update task, only if no other writer changed its status since it was read
+                        if not set_task_status(task_id, new_status, old_status):
+                            return f"Conflict: Task '{title}' status was changed by another update. Re-read it before changing its status"
+                        
+                        # Log the change
+                        KanbanChange.create(
+                            change_type='update',
+                            task_id=task_id,
+                            task_data={
+                                'field': 'status',
+                                'old_value': old_status,
+                                'new_value': new_status,
+                                'title': title
+                            },
+                            approved=False
+                        )
                     
-                    result = f"Updated task '{task.title}' status from '{old_status}' to '{new_status}'"
+                    invalidate_read_cache()
+                    result = f"Updated task '{title}' status from '{old_status}' to '{new_status}'"
                     logger.info(result)
                     return result
                     
@@ -205,8 +283,8 @@ class KanbanTools:
                     logger.error(error_msg)
                     return error_msg
             
-            async def _arun(self, task_id: int, new_status: str) -> str:
-                return self._run(task_id, new_status)
+            async def _arun(self, task_id: int, new_status: str, expected_status: str = None) -> str:
+                return await _run_in_thread(self._run, task_id, new_status, expected_status)
         
         return UpdateTaskStatusTool()
     
@@ -220,7 +298,11 @@ class KanbanTools:
             
             def _run(self, assignee_email: str = None, status: str = None, search_term: str = None) -> str:
                 try:
-                    query = Task.select().join(TeamMember)
+                    # Select only the listed columns, assignee name included, as plain tuples
+                    query = (
+                        Task.select(Task.id, Task.title, Task.status, Task.due_date, TeamMember.name)
+                        .join(TeamMember)
+                    )
                     
                     # Filter by assignee
                     if assignee_email:
@@ -230,25 +312,30 @@ class KanbanTools:
                     if status:
                         query = query.where(Task.status == status)
                     
-                    # Filter by search term
+                    # Filter by search term through the full-text index; LIKE only when it has no words
                     if search_term:
-                        query = query.where(
-                            (Task.title.contains(search_term)) |
-                            (Task.description.contains(search_term))
-                        )
+                        matching_ids = TaskSearch.matching_ids(search_term)
+                        if matching_ids is not None:
+                            query = query.where(Task.id.in_(matching_ids))
+                        else:
+                            query = query.where(
+                                (Task.title.contains(search_term)) |
+                                (Task.description.contains(search_term))
+                            )
                     
-                    tasks = list(query.order_by(Task.updated_at.desc()).limit(10))
+                    tasks = list(query.order_by(Task.updated_at.desc()).limit(10).tuples())
                     
                     if not tasks:
                         return "No tasks found matching the criteria"
                     
-                    result = f"Found {len(tasks)} tasks:\n"
-                    for task in tasks:
-                        due_info = f" (due {task.due_date.strftime('%Y-%m-%d')})" if task.due_date else ""
-                        result += f"- ID:{task.id} '{task.title}' - {task.status} - {task.assignee.name}{due_info}\n"
+                    result = f"Found {len(tasks)} tasks:\n" + "\n".join(
+                        f"- ID:{task_id} '{title}' - {task_status} - {assignee_name}"
+                        + (f" (due {_format_date(due_date)})" if due_date else "")
+                        for task_id, title, task_status, due_date, assignee_name in tasks
+                    )
                     
                     logger.info(f"Found {len(tasks)} tasks")
-                    return result.strip()
+                    return result
                     
                 except Exception as e:
                     error_msg = f"Error finding tasks: {str(e)}"
@@ -256,7 +343,7 @@ class KanbanTools:
                     return error_msg
             
             async def _arun(self, assignee_email: str = None, status: str = None, search_term: str = None) -> str:
-                return self._run(assignee_email, status, search_term)
+                return await _run_in_thread(self._run, assignee_email, status, search_term)
         
         return FindTasksTool()
     
@@ -270,11 +357,17 @@ class KanbanTools:
             
             def _run(self, task_id: int) -> str:
                 try:
-                    task = Task.get_or_none(Task.id == task_id)
+                    # Fetch the assignee in the same query
+                    task = (
+                        Task.select(Task, TeamMember)
+                        .join(TeamMember)
+                        .where(Task.id == task_id)
+                        .get_or_none()
+                    )
                     if not task:
                         return f"Error: Task not found with ID: {task_id}"
                     
-                    due_info = f"Due: {task.due_date.strftime('%Y-%m-%d %H:%M')}" if task.due_date else "No due date"
+                    due_info = f"Due: {_format_minutes(task.due_date)}" if task.due_date else "No due date"
                     
                     result = f"""Task Details:
 ID: {task.id}
@@ -284,8 +377,8 @@ Status: {task.status}
 Priority: {task.priority}
 Assignee: {task.assignee.name} ({task.assignee.email})
 {due_info}
-Created: {task.created_at.strftime('%Y-%m-%d %H:%M')}
-Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
+Created: {_format_minutes(task.created_at)}
+Updated: {_format_minutes(task.updated_at)}"""
                     
                     if task.tags_list:
                         result += f"\nTags: {', '.join(task.tags_list)}"
@@ -299,7 +392,7 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
                     return error_msg
             
             async def _arun(self, task_id: int) -> str:
-                return self._run(task_id)
+                return await _run_in_thread(self._run, task_id)
         
         return GetTaskDetailsTool()
     
@@ -314,60 +407,71 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
             def _run(self, task_id: int, title: str = None, description: str = None, 
                     priority: str = None, due_date: str = None) -> str:
                 try:
-                    task = Task.get_or_none(Task.id == task_id)
-                    if not task:
-                        return f"Error: Task not found with ID: {task_id}"
-                    
-                    changes = []
-                    
-                    # Update title
-                    if title:
-                        old_title = task.title
-                        task.title = title
-                        changes.append(f"title: '{old_title}' → '{title}'")
-                    
-                    # Update description
-                    if description:
-                        task.description = description
-                        changes.append(f"description updated")
-                    
-                    # Update priority
-                    if priority:
-                        valid_priorities = ['low', 'medium', 'high', 'urgent']
-                        if priority in valid_priorities:
-                            old_priority = task.priority
-                            task.priority = priority
-                            changes.append(f"priority: '{old_priority}' → '{priority}'")
-                        else:
-                            return f"Error: Invalid priority '{priority}'. Must be one of: {', '.join(valid_priorities)}"
-                    
-                    # Update due date
-                    if due_date:
-                        try:
-                            parsed_due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                            old_due = task.due_date.strftime('%Y-%m-%d') if task.due_date else 'None'
-                            task.due_date = parsed_due_date
-                            changes.append(f"due date: {old_due} → {parsed_due_date.strftime('%Y-%m-%d')}")
-                        except:
-                            return f"Error: Invalid due date format: {due_date}"
-                    
-                    if not changes:
-                        return "Error: No valid updates provided"
-                    
-                    task.save()
-                    
-                    # Log the change
-                    KanbanChange.create(
-                        change_type='update',
-                        task_id=task.id,
-                        task_data=json.dumps({
-                            'changes': changes,
-                            'title': task.title
-                        }),
-                        approved=False
-                    )
+                    # The task and its change log row commit together, in one fsync
+                    with db.atomic():
+                        # Only the old values the change log needs
+                        row = (
+                            Task.select(Task.title, Task.priority, Task.due_date)
+                            .where(Task.id == task_id)
+                            .tuples()
+                            .first()
+                        )
+                        if not row:
+                            return f"Error: Task not found with ID: {task_id}"
+                        
+                        old_title, old_priority, old_due_date = row
+                        updates = {}
+                        changes = []
+                        
+                        # Update title
+                        if title:
+                            updates[Task.title] = title
+                            changes.append(f"title: '{old_title}' → '{title}'")
+                        
+                        # Update description
+                        if description:
+                            updates[Task.description] = description
+                            changes.append(f"description updated")
+                        
+                        # Update priority
+                        if priority:
+                            if priority in VALID_PRIORITIES:
+                                updates[Task.priority] = priority
+                                changes.append(f"priority: '{old_priority}' → '{priority}'")
+                            else:
+                                return f"Error: Invalid priority '{priority}'. Must be one of: {', '.join(TASK_PRIORITIES)}"
+                        
+                        # Update due date
+                        if due_date:
+                            try:
+                                parsed_due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+                                old_due = _format_date(old_due_date) if old_due_date else 'None'
+                                updates[Task.due_date] = parsed_due_date
+                                changes.append(f"due date: {old_due} → {_format_date(parsed_due_date)}")
+                            except:
+                                return f"Error: Invalid due date format: {due_date}"
+                        
+                        if not changes:
+                            return "Error: No valid updates provided"
+                        
+                        # Write only the changed columns (plus updated_at, as Task.save() would)
+                        updates[Task.updated_at] = datetime.now()
+                        Task.update(updates).where(Task.id == task_id).execute()
+                        new_title = title or old_title
+                        
+                        # Log the change
+                        KanbanChange.create(
+                            change_type='update',
+                            task_id=task_id,
+                            task_data={
+                                'changes': changes,
+                                'title': new_title
+                            },
+                            approved=False
+                        )
                     
-                    result = f"Updated task '{task.title}': {', '.join(changes)}"
+                    invalidate_read_cache()
+                    result = f"Updated task '{new_title}': {', '.join(changes)}"
                     logger.info(result)
                     return result
                     
@@ -378,7 +482,7 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
             
             async def _arun(self, task_id: int, title: str = None, description: str = None, 
                           priority: str = None, due_date: str = None) -> str:
-                return self._run(task_id, title, description, priority, due_date)
+                return await _run_in_thread(self._run, task_id, title, description, priority, due_date)
         
         return UpdateTaskInfoTool()
     
@@ -391,33 +495,30 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
             description = "Get list of pending kanban changes that need manager approval"
             
             def _run(self) -> str:
+                cached = _get_cached_read(self.name)
+                if cached is not None:
+                    return cached
+                
                 try:
                     pending_changes = list(
-                        KanbanChange.select()
+                        KanbanChange.select(KanbanChange.id, KanbanChange.change_type, KanbanChange.task_data)
                         .where(KanbanChange.approved == False)
                         .order_by(KanbanChange.created_at.desc())
                         .limit(10)
+                        .tuples()
                     )
                     
                     if not pending_changes:
-                        return "No pending changes requiring approval"
-                    
-                    result = f"Pending Approvals ({len(pending_changes)}):\n"
-                    for change in pending_changes:
-                        change_data = json.loads(change.task_data)
-                        
-                        if change.change_type == 'create':
-                            result += f"- ID:{change.id} CREATE: '{change_data.get('title')}' for {change_data.get('assignee')}\n"
-                        elif change.change_type == 'update':
-                            if 'changes' in change_data:
-                                result += f"- ID:{change.id} UPDATE: '{change_data.get('title')}' - {', '.join(change_data['changes'])}\n"
-                            else:
-                                result += f"- ID:{change.id} UPDATE: '{change_data.get('title')}' - {change_data.get('field')} changed\n"
-                        else:
-                            result += f"- ID:{change.id} {change.change_type.upper()}: {change_data}\n"
+                        result = "No pending changes requiring approval"
+                        _store_cached_read(self.name, result)
+                        return result
                     
+                    result = f"Pending Approvals ({len(pending_changes)}):\n" + "\n".join(
+                        _format_change(*change) for change in pending_changes
+                    )
+                    _store_cached_read(self.name, result)
                     logger.info(f"Retrieved {len(pending_changes)} pending approvals")
-                    return result.strip()
+                    return result
                     
                 except Exception as e:
                     error_msg = f"Error getting pending approvals: {str(e)}"
@@ -425,29 +526,22 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
                     return error_msg
             
             async def _arun(self) -> str:
-                return self._run()
+                return await _run_in_thread(self._run)
         
         return GetPendingApprovalsTool()
     
     async def get_pending_changes(self) -> List[Dict]:
         """Get pending kanban changes that need approval."""
         try:
-            changes = list(
-                KanbanChange.select()
+            return list(
+                KanbanChange.select(
+                    KanbanChange.id, KanbanChange.change_type, KanbanChange.task_id,
+                    KanbanChange.task_data, KanbanChange.created_at
+                )
                 .where(KanbanChange.approved == False)
                 .order_by(KanbanChange.created_at.desc())
+                .dicts()
             )
-            
-            return [
-                {
-                    'id': change.id,
-                    'change_type': change.change_type,
-                    'task_id': change.task_id,
-                    'task_data': json.loads(change.task_data),
-                    'created_at': change.created_at
-                }
-                for change in changes
-            ]
         except Exception as e:
             logger.error(f"Error getting pending changes: {e}")
             return []
@@ -455,15 +549,18 @@ Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M')}"""
     async def approve_changes(self, change_ids: List[int]) -> str:
         """Approve specific kanban changes."""
         try:
+            # One UPDATE for all ids; already-approved and unknown ids simply don't match
             approved_count = 0
+            if change_ids:
+                with db.atomic():
+                    approved_count = (
+                        KanbanChange.update(approved=True, approved_at=datetime.now())
+                        .where(KanbanChange.id.in_(change_ids), KanbanChange.approved == False)
+                        .execute()
+                    )
             
-            for change_id in change_ids:
-                change = KanbanChange.get_or_none(KanbanChange.id == change_id)
-                if change and not change.approved:
-                    change.approved = True
-                    change.approved_at = datetime.now()
-                    change.save()
-                    approved_count += 1
+            if approved_count:
+                invalidate_read_cache()
             
             result = f"Approved {approved_count} kanban changes"
             logger.info(result)
@@ -26,13 +26,24 @@ def check_database():
     table_names = ['team_members', 'tasks', 'email_threads', 'kanban_changes', 
                    'agent_states', 'agent_activities', 'email_templates', 'workflow_settings']
     
+    # Count every existing table in one UNION ALL query rather than one query per table
+    existing = {table[0] for table in tables}
+    counts = {}
+    try:
+        count_sql = " UNION ALL ".join(
+            f"SELECT '{table_name}', COUNT(1) FROM {table_name}"
+            for table_name in table_names if table_name in existing
+        )
+        if count_sql:
+            counts = dict(cursor.execute(count_sql).fetchall())
+    except Exception as e:
+        print(f"- ERROR counting records - {e}")
+    
     for table_name in table_names:
-        try:
-            cursor.execute(f"SELECT COUNT(1) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"- {table_name}: {count} records")
-        except Exception as e:
-            print(f"- {table_name}: ERROR - {e}")
+        if table_name in counts:
+            print(f"- {table_name}: {counts[table_name]} records")
+        elif table_name not in existing:
+            print(f"- {table_name}: ERROR - no such table: {table_name}")
     
     conn.close()
 
@@ -44,9 +55,9 @@ def create_test_data():
         # Connect to database
         db.connect(reuse_if_open=True)
         
-        # Create test team member if none exist
-        member_count = TeamMember.select().count()
-        if member_count == 0:
+        # Create test team member if none exist (LIMIT 1 probe rather than counting every row)
+        test_member = TeamMember.select().first()
+        if test_member is None:
             print("Creating test team member...")
             test_member = TeamMember.create(
                 email="test@example.com",
@@ -56,12 +67,11 @@ def create_test_data():
             )
             print(f"Created team member: {test_member.name} (ID: {test_member.id})")
         else:
-            test_member = TeamMember.select().first()
             print(f"Using existing team member: {test_member.name} (ID: {test_member.id})")
         
         # Create test task if none exist
-        task_count = Task.select().count()
-        if task_count == 0:
+        test_task = Task.select().first()
+        if test_task is None:
             print("Creating test task...")
             test_task = Task.create(
                 title="Test Task",
@@ -73,7 +83,6 @@ def create_test_data():
             )
             print(f"Created task: {test_task.title} (ID: {test_task.id})")
         else:
-            test_task = Task.select().first()
             print(f"Using existing task: {test_task.title} (ID: {test_task.id})")
         
         # Verify task can be updated
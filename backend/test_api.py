@@ -9,10 +9,13 @@ def test_api_calls():
     
     print("=== Testing Kanban API ===")
     
+    # One session keeps the connection alive across calls instead of reconnecting per request
+    session = requests.Session()
+    
     # Test 1: Get board data
     print("1. Getting board data...")
     try:
-        response = requests.get('http://localhost:8000/api/kanban/board')
+        response = session.get('http://localhost:8000/api/kanban/board')
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -36,7 +39,7 @@ def test_api_calls():
                 print(f"\n2. Updating task {task['id']} to status: {new_status}")
                 print(f"   Update data: {update_data}")
                 
-                update_response = requests.put(
+                update_response = session.put(
                     f"http://localhost:8000/api/kanban/tasks/{task['id']}",
                     json=update_data,
                     headers={'Content-Type': 'application/json'}
@@ -70,6 +73,8 @@ def test_api_calls():
         print("   Make sure the backend is running on http://localhost:8000")
     except Exception as e:
         print(f"   ✗ Unexpected error: {e}")
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     test_api_calls() 
\ No newline at end of file
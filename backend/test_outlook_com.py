@@ -5,8 +5,84 @@ Test Outlook COM integration step by step to identify issues.
 
 import sys
 import os
+import functools
+import hashlib
+import io
+import json
+import tempfile
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
+from pathlib import Path
+
+# Results of the slow folder/contact/address list probes, reused while Outlook looks unchanged;
+# run with --fresh to probe everything again (and refresh the cache)
+DIAG_CACHE_PATH = Path(os.environ.get('LOCALAPPDATA', tempfile.gettempdir())) / 'outlook_diag_cache.json'
+DIAG_CACHE_TTL = 3600  # seconds
+REFRESH_DIAG_CACHE = '--fresh' in sys.argv
+
+def _cache_key(namespace):
+    """Identify the Outlook state a probe saw: version, profile and contact count."""
+    return (
+        namespace.Application.Version,
+        namespace.CurrentProfileName,
+        namespace.GetDefaultFolder(10).Items.Count,
+    )
+
+# The probes run on worker threads and share one cache file
+_DIAG_CACHE_LOCK = threading.Lock()
+
+def _load_diag_cache():
+    """Read the probe cache; a missing or unreadable file counts as empty, so the next save rewrites it."""
+    try:
+        cache = json.loads(DIAG_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_diag_cache_entry(key, entry):
+    """Add one probe result to the cache file, replacing the file atomically."""
+    with _DIAG_CACHE_LOCK:
+        cache = _load_diag_cache()
+        cache[key] = entry
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=DIAG_CACHE_PATH.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as temp_file:
+                    json.dump(cache, temp_file)
+                os.replace(temp_path, DIAG_CACHE_PATH)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            pass
+
+def memoize_to_disk(ttl):
+    """Cache a probe's JSON-serializable result on disk, keyed by the probe, its arguments and _cache_key."""
+    def decorator(probe):
+        @functools.wraps(probe)
+        def wrapper(namespace, *args):
+            try:
+                key_data = json.dumps([probe.__name__, *_cache_key(namespace), *args])
+            except Exception:
+                return probe(namespace, *args)
+            key = hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
+            
+            with _DIAG_CACHE_LOCK:
+                entry = None if REFRESH_DIAG_CACHE else _load_diag_cache().get(key)
+            if isinstance(entry, dict) and time.time() - entry.get('saved_at', 0) < ttl:
+                print("\n" + "=" * 50)
+                print(f"✅ (cached) {probe.__doc__}")
+                return entry['result']
+            
+            result = probe(namespace, *args)
+            _save_diag_cache_entry(key, {'saved_at': time.time(), 'result': result})
+            return result
+        return wrapper
+    return decorator
 
 def test_pywin32_import():
     """Test if pywin32 is properly installed."""
@@ -44,14 +120,18 @@ def test_outlook_application():
     print("3. Testing Outlook application creation...")
     try:
         import win32com.client
+        import win32com.client.dynamic
         
+        # Late binding throughout: no makepy type library generation on first run
         # Try to connect to existing Outlook instance first
         try:
-            outlook = win32com.client.GetActiveObject("Outlook.Application")
+            outlook = win32com.client.dynamic.Dispatch(
+                win32com.client.GetActiveObject("Outlook.Application")._oleobj_
+            )
             print("✅ Connected to existing Outlook instance")
         except:
             # If no active instance, try to create new one
-            outlook = win32com.client.Dispatch("Outlook.Application")
+            outlook = win32com.client.dynamic.Dispatch("Outlook.Application")
             print("✅ Created new Outlook application instance")
         
         print(f"   Outlook version: {getattr(outlook, 'Version', 'Unknown')}")
@@ -79,53 +159,84 @@ def test_outlook_namespace(outlook):
         print("   - MAPI profile might be missing")
         return None
 
+# Default folders checked by test_default_folders: (folder id, display name, Outlook constant)
+DEFAULT_FOLDERS = (
+    (6, "Inbox", "olFolderInbox"),
+    (10, "Contacts", "olFolderContacts"),
+    (5, "Sent Items", "olFolderSentMail"),
+    (3, "Deleted Items", "olFolderDeletedItems"),
+)
+
+def get_folder_item_count(namespace, folder_id):
+    """Count the items in a default folder from its Table's row count, without opening its Items collection."""
+    return namespace.GetDefaultFolder(folder_id).GetTable().GetRowCount()
+
+@memoize_to_disk(ttl=DIAG_CACHE_TTL)
 def test_default_folders(namespace):
     """Test access to default Outlook folders."""
     print("\n" + "=" * 50)
     print("5. Testing default folder access...")
     
-    folders_to_test = [
-        (6, "Inbox", "olFolderInbox"),
-        (10, "Contacts", "olFolderContacts"),
-        (5, "Sent Items", "olFolderSentMail"),
-        (3, "Deleted Items", "olFolderDeletedItems")
-    ]
+    # Bit i of the result is set when DEFAULT_FOLDERS[i] could be read; 0 means none could
+    accessible_mask = 0
     
-    accessible_folders = []
-    
-    for folder_id, folder_name, folder_constant in folders_to_test:
+    for bit, (folder_id, folder_name, folder_constant) in enumerate(DEFAULT_FOLDERS):
         try:
-            folder = namespace.GetDefaultFolder(folder_id)
-            item_count = folder.Items.Count
+            item_count = get_folder_item_count(namespace, folder_id)
             print(f"✅ {folder_name}: {item_count} items")
-            accessible_folders.append(folder_name)
+            accessible_mask |= 1 << bit
         except Exception as e:
             print(f"❌ {folder_name}: Failed to access - {e}")
     
-    return accessible_folders
+    return accessible_mask
+
+# Contact properties the search tests read, fetched together through an Outlook Table
+CONTACT_COLUMNS = ("FullName", "CompanyName", "Email1Address")
 
+# DASL property names of those columns, for filters evaluated by the MAPI store
+CONTACT_DASL_PROPERTIES = (
+    "urn:schemas:contacts:cn",  # FullName
+    "urn:schemas:contacts:o",  # CompanyName
+    "http://schemas.microsoft.com/mapi/id/{00062004-0000-0000-C000-000000000046}/8083001f",  # Email1Address
+)
+
+def contacts_search_filter(search_term):
+    """Build a DASL filter matching contacts whose name, company or email contains search_term."""
+    term = search_term.replace("'", "''")
+    return "@SQL=" + " OR ".join(f'"{prop}" LIKE \'%{term}%\'' for prop in CONTACT_DASL_PROPERTIES)
+
+def get_contacts_table(contacts_folder, dasl_filter=None):
+    """Get a Table over the contacts folder (optionally filtered) holding only the name and email columns."""
+    table = contacts_folder.GetTable(dasl_filter) if dasl_filter else contacts_folder.GetTable()
+    table.Columns.RemoveAll()
+    for column in CONTACT_COLUMNS:
+        table.Columns.Add(column)
+    return table
+
+def iter_contact_rows(contacts_table):
+    """Yield (name, email) per contact; one GetValues call per row instead of one COM call per property."""
+    while not contacts_table.EndOfTable:
+        full_name, company_name, email = contacts_table.GetNextRow().GetValues()
+        yield full_name or company_name or '', email or ''
+
+@memoize_to_disk(ttl=DIAG_CACHE_TTL)
 def test_contacts_search(namespace):
     """Test searching contacts specifically."""
     print("\n" + "=" * 50)
     print("6. Testing contacts search...")
     try:
         contacts_folder = namespace.GetDefaultFolder(10)  # olFolderContacts
-        contact_items = contacts_folder.Items
+        contacts_table = get_contacts_table(contacts_folder)
         
-        print(f"   Total contacts: {contact_items.Count}")
+        print(f"   Total contacts: {contacts_table.GetRowCount()}")
         
-        # Try to iterate through a few contacts
+        # Try to read through a few contacts
         found_contacts = []
-        for i, contact in enumerate(contact_items):
-            if i >= 5:  # Limit to first 5 for testing
-                break
-            try:
-                name = getattr(contact, 'FullName', '') or getattr(contact, 'CompanyName', 'Unknown')
-                email = getattr(contact, 'Email1Address', 'No email')
-                found_contacts.append({"name": name, "email": email})
-                print(f"   Contact {i+1}: {name} ({email})")
-            except Exception as e:
-                print(f"   Contact {i+1}: Error reading - {e}")
+        for name, email in islice(iter_contact_rows(contacts_table), 5):  # Limit to first 5 for testing
+            name = name or 'Unknown'
+            email = email or 'No email'
+            found_contacts.append({"name": name, "email": email})
+            print(f"   Contact {len(found_contacts)}: {name} ({email})")
         
         return found_contacts
         
@@ -133,32 +244,35 @@ def test_contacts_search(namespace):
         print(f"❌ Failed to search contacts: {e}")
         return []
 
+@memoize_to_disk(ttl=DIAG_CACHE_TTL)
 def test_address_book_access(namespace):
     """Test Global Address List access."""
     print("\n" + "=" * 50)
     print("7. Testing Global Address List (GAL) access...")
     try:
         address_lists = namespace.AddressLists
-        print(f"   Found {address_lists.Count} address lists")
+        list_count = address_lists.Count
+        print(f"   Found {list_count} address lists")
         
-        for i, addr_list in enumerate(address_lists):
+        # Indexed Item() access (1-based) rather than iterating the COM collections
+        for i in range(1, list_count + 1):
+            addr_list = address_lists.Item(i)
             list_name = addr_list.Name
-            print(f"   Address List {i+1}: {list_name}")
+            print(f"   Address List {i}: {list_name}")
             
             if "Global Address List" in list_name or "GAL" in list_name:
                 try:
                     entries = addr_list.AddressEntries
-                    print(f"     GAL entries: {entries.Count}")
+                    entry_count = entries.Count
+                    print(f"     GAL entries: {entry_count}")
                     
                     # Try to read first few entries
-                    for j, entry in enumerate(entries):
-                        if j >= 3:  # Limit to first 3
-                            break
+                    for j in range(1, min(3, entry_count) + 1):  # Limit to first 3
                         try:
-                            name = entry.Name
-                            print(f"     Entry {j+1}: {name}")
+                            name = entries.Item(j).Name
+                            print(f"     Entry {j}: {name}")
                         except Exception as e:
-                            print(f"     Entry {j+1}: Error reading - {e}")
+                            print(f"     Entry {j}: Error reading - {e}")
                             
                 except Exception as e:
                     print(f"     Error accessing GAL entries: {e}")
@@ -169,8 +283,8 @@ def test_address_book_access(namespace):
         print(f"❌ Failed to access address lists: {e}")
         return False
 
-def test_simple_search(namespace, search_term="test"):
-    """Test a simple contact search."""
+def test_simple_search(namespace, search_term="test", max_matches=20):
+    """Test a simple contact search, stopping after max_matches contacts."""
     print("\n" + "=" * 50)
     print(f"8. Testing simple search for '{search_term}'...")
     
@@ -179,25 +293,25 @@ def test_simple_search(namespace, search_term="test"):
     # Search in contacts
     try:
         contacts_folder = namespace.GetDefaultFolder(10)
-        contact_items = contacts_folder.Items
         
-        for contact in contact_items:
-            try:
-                name = getattr(contact, 'FullName', '') or getattr(contact, 'CompanyName', '')
-                email = getattr(contact, 'Email1Address', '')
-                
-                if (search_term.lower() in name.lower() or 
-                    search_term.lower() in email.lower()):
-                    found_contacts.append({
-                        'name': name,
-                        'email': email,
-                        'source': 'contacts'
-                    })
-                    
-            except Exception as e:
-                continue
+        # The store filters the contacts, so only candidate rows come back over COM
+        contacts_table = get_contacts_table(contacts_folder, contacts_search_filter(search_term))
+        needle = search_term.lower()
+        # Rows are read lazily, so a common term stops reading after max_matches rows
+        matches = islice((
+            (name, email) for name, email in iter_contact_rows(contacts_table)
+            if needle in name.lower() or needle in email.lower()
+        ), max_matches)
         
-        print(f"   Found {len(found_contacts)} matching contacts")
+        for name, email in matches:
+            found_contacts.append({
+                'name': name,
+                'email': email,
+                'source': 'contacts'
+            })
+        
+        limit_note = " (limit reached)" if len(found_contacts) == max_matches else ""
+        print(f"   Found {len(found_contacts)} matching contacts{limit_note}")
         for contact in found_contacts[:3]:  # Show first 3
             print(f"   - {contact['name']} ({contact['email']})")
             
@@ -225,6 +339,83 @@ def test_email_sending_capability(outlook):
         print(f"❌ Failed to create email: {e}")
         return False
 
+class _ThreadBufferedStdout:
+    """Stdout stand-in that sends each worker thread's prints to that thread's own buffer."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+def _run_probe_in_thread(probe, stream, args, stdout):
+    """Run a probe on a worker thread in its own COM apartment, returning (result, printed output)."""
+    import pythoncom
+    import win32com.client.dynamic
+    
+    stdout.local.buffer = io.StringIO()
+    pythoncom.CoInitialize()
+    try:
+        # Unmarshal this thread's own (late-bound) proxy for the object the probe takes
+        target = win32com.client.dynamic.Dispatch(
+            pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch)
+        )
+        return probe(target, *args), stdout.local.buffer.getvalue()
+    finally:
+        target = None
+        pythoncom.CoUninitialize()
+
+def run_probes_concurrently(probes):
+    """Run independent probes at once so their MAPI waits overlap, printing their output in order."""
+    # probes maps a result name to (probe function, COM object it takes, extra args)
+    import pythoncom
+    
+    # Each COM object is marshaled once per worker; a stream can only be unmarshaled once
+    streams = {
+        name: pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, com_object._oleobj_)
+        for name, (_, com_object, _) in probes.items()
+    }
+    
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                name: executor.submit(_run_probe_in_thread, probe, streams[name], args, stdout)
+                for name, (probe, _, args) in probes.items()
+            }
+            outcomes = {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = stdout.stream
+    
+    results = {}
+    for name, (result, output) in outcomes.items():
+        print(output, end='')
+        results[name] = result
+    return results
+
+# Summary checks: (results key, issue reported when it failed, solutions to suggest)
+SUMMARY_CHECKS = (
+    ('pywin32', "pywin32 not properly installed", (
+        "1. Install pywin32: pip install pywin32",
+    )),
+    ('com_init', "COM initialization failed", ()),
+    ('outlook_app', "Cannot create Outlook application", (
+        "2. Ensure Outlook is installed and can run manually",
+        "3. Try running this script as administrator",
+        "4. Check for 32-bit vs 64-bit Python/Outlook compatibility",
+    )),
+    ('namespace', "Cannot access MAPI namespace", (
+        "5. Set up Outlook with a valid email profile",
+        "6. Run Outlook manually first to complete setup",
+    )),
+    ('folders', "Cannot access default folders", ()),
+)
+
 def run_comprehensive_test():
     """Run all tests and provide summary."""
     print("🔍 OUTLOOK COM DIAGNOSTIC SCRIPT")
@@ -252,11 +443,14 @@ def run_comprehensive_test():
                 results['namespace'] = namespace is not None
                 
                 if namespace:
-                    results['folders'] = test_default_folders(namespace)
-                    results['contacts'] = test_contacts_search(namespace)
-                    results['address_lists'] = test_address_book_access(namespace)
-                    results['search'] = test_simple_search(namespace, "a")  # Search for 'a'
-                    results['email_creation'] = test_email_sending_capability(outlook)
+                    # These probes only read from Outlook and don't depend on each other
+                    results.update(run_probes_concurrently({
+                        'folders': (test_default_folders, namespace, ()),
+                        'contacts': (test_contacts_search, namespace, ()),
+                        'address_lists': (test_address_book_access, namespace, ()),
+                        'search': (test_simple_search, namespace, ("a",)),  # Search for 'a'
+                        'email_creation': (test_email_sending_capability, outlook, ()),
+                    }))
     
     # Summary
     print("\n" + "=" * 50)
@@ -264,17 +458,11 @@ def run_comprehensive_test():
     print("=" * 50)
     
     issues_found = []
-    
-    if not results.get('pywin32'):
-        issues_found.append("pywin32 not properly installed")
-    if not results.get('com_init'):
-        issues_found.append("COM initialization failed")
-    if not results.get('outlook_app'):
-        issues_found.append("Cannot create Outlook application")
-    if not results.get('namespace'):
-        issues_found.append("Cannot access MAPI namespace")
-    if not results.get('folders'):
-        issues_found.append("Cannot access default folders")
+    solutions = []
+    for key, issue, key_solutions in SUMMARY_CHECKS:
+        if not results.get(key):
+            issues_found.append(issue)
+            solutions.extend(key_solutions)
     
     if issues_found:
         print("❌ ISSUES FOUND:")
@@ -282,15 +470,8 @@ def run_comprehensive_test():
             print(f"   - {issue}")
         
         print("\n💡 RECOMMENDED SOLUTIONS:")
-        if not results.get('pywin32'):
-            print("   1. Install pywin32: pip install pywin32")
-        if not results.get('outlook_app'):
-            print("   2. Ensure Outlook is installed and can run manually")
-            print("   3. Try running this script as administrator")
-            print("   4. Check for 32-bit vs 64-bit Python/Outlook compatibility")
-        if not results.get('namespace'):
-            print("   5. Set up Outlook with a valid email profile")
-            print("   6. Run Outlook manually first to complete setup")
+        for solution in solutions:
+            print(f"   {solution}")
     else:
         print("✅ ALL TESTS PASSED!")
         print("   Outlook COM integration should work properly")
@@ -2,12 +2,12 @@
 
 import pytest
 import asyncio
-import tempfile
-import os
 from unittest.mock import Mock, AsyncMock
 from pathlib import Path
 
-from app.models.database import db, MODELS
+from peewee import SqliteDatabase
+
+from app.models.database import db, MODELS, DriverDatabase, TeamMember, clear_row_caches
 from app.agents.assistant_agent import AssistantAgent
 from app.services.llm_service import LLMService
 from app.tools.email_tools import EmailTools
@@ -22,26 +22,68 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
-def temp_db():
-    """Create a temporary database for testing."""
-    # Create temporary database file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-    temp_file.close()
+@pytest.fixture(scope="session")
+def memory_db():
+    """Create the schema once in a shared-cache in-memory database for the test session."""
+    # Every pooled connection opening this URI sees the same in-memory database
+    if DriverDatabase is SqliteDatabase:
+        uri_params = {'uri': True}
+    else:
+        import apsw
+        uri_params = {'flags': apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_CREATE | apsw.SQLITE_OPEN_URI}
+    # Nothing here needs to survive a crash, so skip the journal file and syncing
+    db.init(
+        'file:testdb?mode=memory&cache=shared',
+        pragmas={'journal_mode': 'memory', 'synchronous': 'off', 'temp_store': 'memory', 'cache_size': -64000},
+        **uri_params
+    )
     
-    # Configure test database
-    db.init(temp_file.name)
+    # The database lives as long as this connection stays open
     db.connect()
     db.create_tables(MODELS, safe=True)
     
     yield db
     
-    # Cleanup
     db.close()
-    os.unlink(temp_file.name)
 
 
 @pytest.fixture
+def db_txn(memory_db):
+    """Run a test inside a transaction that is rolled back afterwards."""
+    with memory_db.atomic() as txn:
+        yield memory_db
+        txn.rollback()
+    
+    # Rows cached during the test were rolled back with it
+    clear_row_caches()
+
+
+@pytest.fixture
+def temp_db(db_txn):
+    """Provide an empty database for testing; the schema is created once per session."""
+    return db_txn
+
+
+@pytest.fixture(scope="session")
+def shared_llm_service():
+    """Create one LLM service for the test session."""
+    return LLMService()
+
+
+@pytest.fixture
+def llm_service(shared_llm_service):
+    """Provide the shared LLM service, reset to the state of a new instance."""
+    service = shared_llm_service
+    service.session = None
+    service.is_available = False
+    service._cache.clear()
+    service._parse_cache.clear()
+    service._tags_cache = None
+    service._inflight.clear()
+    return service
+
+
+@pytest.fixture(scope="module")
 def mock_llm_service():
     """Create a mock LLM service for testing."""
     mock_service = Mock(spec=LLMService)
@@ -63,7 +105,7 @@ def mock_llm_service():
     return mock_service
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_email_tools():
     """Create mock email tools for testing."""
     mock_tools = Mock(spec=EmailTools)
@@ -91,7 +133,7 @@ def mock_email_tools():
     return mock_tools
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_kanban_tools():
     """Create mock kanban tools for testing."""
     mock_tools = Mock(spec=KanbanTools)
@@ -99,6 +141,15 @@ def mock_kanban_tools():
     return mock_tools
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_mocks(mock_llm_service, mock_email_tools, mock_kanban_tools):
+    """Clear calls recorded on the module-scoped mocks after each test."""
+    yield
+    mock_llm_service.reset_mock()
+    mock_email_tools.reset_mock()
+    mock_kanban_tools.reset_mock()
+
+
 @pytest.fixture
 def assistant_agent(mock_llm_service, mock_email_tools, mock_kanban_tools):
     """Create an assistant agent with mocked dependencies."""
@@ -112,10 +163,22 @@ def assistant_agent(mock_llm_service, mock_email_tools, mock_kanban_tools):
     # Mock the initialization
     agent.is_active = True
     agent.graph = Mock()
+    agent.graph.ainvoke = AsyncMock()
     
     return agent
 
 
+@pytest.fixture
+def default_member(temp_db):
+    """Create the team member the model tests assign tasks and threads to."""
+    return TeamMember.create(
+        name='Test User',
+        email='test@example.com',
+        role='Developer',
+        active=True
+    )
+
+
 @pytest.fixture
 def sample_task_data():
     """Sample task data for testing."""
@@ -7,11 +7,24 @@ from unittest.mock import Mock, AsyncMock, patch
 from app.main import app
 from app.models.database import TeamMember, EmailTemplate
 
+# These tests share one app startup and its writes to the test database, so keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("db")
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
+
+@pytest.fixture(scope="module")
+def client(memory_db):
+    """Create one test client shared by the tests in this module."""
+    # Entering the client runs the app's lifespan startup once, not per request,
+    # against the in-memory test database rather than the on-disk one
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def reset_dependency_overrides():
+    """Keep dependency overrides from leaking between tests through the shared client."""
+    yield
+    app.dependency_overrides.clear()
 
 
 @pytest.fixture
@@ -19,6 +32,7 @@ def mock_agent():
     """Create mock agent for API tests."""
     agent = Mock()
     agent.is_active = True
+    agent.state.error_count = 0
     agent.process_message = AsyncMock(return_value="Mock agent response")
     agent.get_status = AsyncMock(return_value={
         "is_active": True,
@@ -57,7 +71,7 @@ def test_root_endpoint(client):
 
 
 @pytest.mark.integration
-@patch('app.core.dependencies.get_assistant_agent')
+@patch('app.api.agents.get_assistant_agent')
 def test_agent_query_endpoint(mock_get_agent, client, mock_agent):
     """Test agent query endpoint."""
     mock_get_agent.return_value = mock_agent
@@ -74,7 +88,7 @@ def test_agent_query_endpoint(mock_get_agent, client, mock_agent):
 
 
 @pytest.mark.integration
-@patch('app.core.dependencies.get_assistant_agent')
+@patch('app.api.agents.get_assistant_agent')
 def test_agent_status_endpoint(mock_get_agent, client, mock_agent):
     """Test agent status endpoint."""
     mock_get_agent.return_value = mock_agent
@@ -88,7 +102,7 @@ def test_agent_status_endpoint(mock_get_agent, client, mock_agent):
 
 
 @pytest.mark.integration
-@patch('app.core.dependencies.get_assistant_agent')
+@patch('app.api.agents.get_assistant_agent')
 def test_trigger_workflow_endpoint(mock_get_agent, client, mock_agent):
     """Test trigger workflow endpoint."""
     mock_get_agent.return_value = mock_agent
@@ -104,7 +118,7 @@ def test_trigger_workflow_endpoint(mock_get_agent, client, mock_agent):
 @pytest.mark.integration
 def test_trigger_workflow_invalid_type(client):
     """Test trigger workflow with invalid type."""
-    with patch('app.core.dependencies.get_assistant_agent') as mock_get_agent:
+    with patch('app.api.agents.get_assistant_agent') as mock_get_agent:
         mock_get_agent.return_value = Mock(is_active=True)
         
         response = client.post("/api/agents/trigger-workflow?workflow_type=invalid_type")
@@ -157,7 +171,7 @@ def test_team_members_endpoint(client):
 
 
 @pytest.mark.integration
-@patch('app.core.dependencies.get_assistant_agent')
+@patch('app.api.agents.get_assistant_agent')
 def test_agent_unavailable_error(mock_get_agent, client):
     """Test API behavior when agent is unavailable."""
     mock_get_agent.return_value = None
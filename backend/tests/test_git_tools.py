@@ -0,0 +1,111 @@
+"""Tests for git tools."""
+
+import asyncio
+import base64
+import hashlib
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.tools.git_tools import GitTools, GITHUB_API_URL
+
+REPO = "octo/board"
+BRANCH = "gh-pages"
+PAGE = b"<html>board</html>"
+PAGE_BLOB_SHA = hashlib.sha1(b"blob %d\0" % len(PAGE) + PAGE).hexdigest()
+PAGE_KEY = (REPO, BRANCH, "index.html")
+
+
+@pytest.fixture
+def github_settings(monkeypatch):
+    """Point the git tools at a test repository and Pages branch."""
+    monkeypatch.setattr(settings, "github_repo", REPO)
+    monkeypatch.setattr(settings, "github_token", "test-token")
+    monkeypatch.setattr(settings, "github_pages_branch", BRANCH)
+
+
+def mock_github(git_tools, responses):
+    """Route git_tools' GitHub requests to canned (status, json) responses, in order; returns the request log."""
+    requests = []
+    
+    def handler(request):
+        requests.append((request.method, request.url.path, json.loads(request.content or b"null")))
+        status, body = responses.pop(0)
+        return httpx.Response(status, json=body)
+    
+    git_tools._http = httpx.AsyncClient(base_url=GITHUB_API_URL, transport=httpx.MockTransport(handler))
+    git_tools._http_loop = asyncio.get_running_loop()
+    return requests
+
+
+@pytest.mark.unit
+async def test_publish_file_unchanged(github_settings):
+    """Test an unchanged page is detected from the cached blob sha without any GitHub request."""
+    git_tools = GitTools()
+    git_tools._published_shas[PAGE_KEY] = PAGE_BLOB_SHA
+    requests = mock_github(git_tools, [])
+    
+    assert await git_tools._publish_file("index.html", PAGE, "Update board") is False
+    assert requests == []
+    
+    await git_tools.cleanup()
+
+
+@pytest.mark.unit
+async def test_publish_file_stale_cached_sha(github_settings):
+    """Test a cached sha the branch rejects is dropped and looked up again before retrying."""
+    git_tools = GitTools()
+    git_tools._published_shas[PAGE_KEY] = "stale-sha"
+    requests = mock_github(git_tools, [
+        (409, {"message": "index.html does not match stale-sha"}),
+        (200, [{"name": "index.html", "sha": "current-sha"}]),
+        (200, {"content": {"sha": "new-sha"}}),
+    ])
+    
+    assert await git_tools._publish_file("index.html", PAGE, "Update board") is True
+    
+    contents_url = f"/repos/{REPO}/contents/index.html"
+    assert [(method, path) for method, path, _ in requests] == [
+        ("PUT", contents_url),
+        ("GET", f"/repos/{REPO}/contents/"),
+        ("PUT", contents_url),
+    ]
+    assert requests[0][2]["sha"] == "stale-sha"
+    assert requests[2][2]["sha"] == "current-sha"
+    assert base64.b64decode(requests[2][2]["content"]) == PAGE
+    assert git_tools._published_shas[PAGE_KEY] == "new-sha"
+    
+    await git_tools.cleanup()
+
+
+@pytest.mark.unit
+async def test_publish_file_creates_missing_branch(github_settings):
+    """Test a first publish to a missing Pages branch creates it from a tree, a commit and a ref."""
+    git_tools = GitTools()
+    requests = mock_github(git_tools, [
+        (404, {"message": "Not Found"}),
+        (404, {"message": "Branch gh-pages not found"}),
+        (201, {"sha": "tree-sha", "tree": [{"path": "index.html", "sha": PAGE_BLOB_SHA}]}),
+        (201, {"sha": "commit-sha"}),
+        (201, {"ref": f"refs/heads/{BRANCH}"}),
+    ])
+    
+    assert await git_tools._publish_file("index.html", PAGE, "Update board") is True
+    
+    git_url = f"/repos/{REPO}/git"
+    assert [(method, path) for method, path, _ in requests] == [
+        ("GET", f"/repos/{REPO}/contents/"),
+        ("PUT", f"/repos/{REPO}/contents/index.html"),
+        ("POST", f"{git_url}/trees"),
+        ("POST", f"{git_url}/commits"),
+        ("POST", f"{git_url}/refs"),
+    ]
+    assert "sha" not in requests[1][2]
+    assert requests[2][2]["tree"][0]["content"] == PAGE.decode()
+    assert requests[3][2] == {"message": "Update board", "tree": "tree-sha", "parents": []}
+    assert requests[4][2] == {"ref": f"refs/heads/{BRANCH}", "sha": "commit-sha"}
+    assert git_tools._published_shas[PAGE_KEY] == PAGE_BLOB_SHA
+    
+    await git_tools.cleanup()
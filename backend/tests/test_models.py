@@ -6,9 +6,15 @@ import json
 
 from app.models.database import (
     TeamMember, Task, EmailThread, EmailTemplate, 
-    KanbanChange, AgentState, WorkflowSettings
+    KanbanChange, AgentState, WorkflowSettings, TaskStatusCount, get_database_stats, get_setting,
+    get_cached_email_parse, store_email_parse, get_cached_smtp_address, store_smtp_address,
+    get_active_members, install_task_status_counts, TaskSearch, install_task_search,
+    fetch_board_summary, fetch_task_title_status, set_task_status, get_member_by_email
 )
 
+# A due date every test treats as long past
+PAST_DUE_DATE = datetime(2020, 1, 1)
+
 
 @pytest.mark.unit
 def test_team_member_creation(temp_db, sample_team_member_data):
@@ -26,19 +32,21 @@ def test_team_member_creation(temp_db, sample_team_member_data):
 
 
 @pytest.mark.unit
-def test_task_creation(temp_db, sample_task_data):
-    """Test creating a task."""
-    # First create a team member
-    member = TeamMember.create(
-        name='Test User',
-        email='test@example.com',
-        role='Developer',
-        active=True
-    )
+def test_team_member_utc_offset(temp_db, sample_team_member_data):
+    """Test UTC offset is derived from the member timezone."""
+    member = TeamMember.create(**sample_team_member_data, timezone='Asia/Kolkata')
+    assert member.utc_offset_minutes == 330
     
+    member.timezone = 'Not/AZone'
+    assert member.utc_offset_minutes == 0
+
+
+@pytest.mark.unit
+def test_task_creation(default_member, sample_task_data):
+    """Test creating a task."""
     # Create task
     task_data = sample_task_data.copy()
-    task_data['assignee'] = member
+    task_data['assignee'] = default_member
     del task_data['assignee_id']
     # Remove tags from creation data to set via property later
     tags = task_data.pop('tags')
@@ -52,26 +60,19 @@ def test_task_creation(temp_db, sample_task_data):
     assert task.title == sample_task_data['title']
     assert task.description == sample_task_data['description']
     assert task.status == sample_task_data['status']
-    assert task.assignee == member
+    assert task.assignee == default_member
     assert task.priority == sample_task_data['priority']
     assert task.tags_list == sample_task_data['tags']
 
 
 @pytest.mark.unit
-def test_task_tags_property(temp_db):
+def test_task_tags_property(default_member):
     """Test task tags property functionality."""
-    member = TeamMember.create(
-        name='Test User',
-        email='test@example.com',
-        role='Developer',
-        active=True
-    )
-    
     task = Task.create(
         title='Test Task',
         description='Test description',
         status='todo',
-        assignee=member,
+        assignee=default_member,
         priority='medium',
         tags='["tag1", "tag2", "tag3"]'
     )
@@ -89,39 +90,43 @@ def test_task_tags_property(temp_db):
 
 
 @pytest.mark.unit
-def test_task_is_overdue_property(temp_db):
+@pytest.mark.parametrize("status, expected_overdue", [
+    ('in_progress', True),
+    ('done', False),  # Completed tasks are never overdue
+])
+def test_task_is_overdue_property(default_member, status, expected_overdue):
     """Test task overdue property."""
-    member = TeamMember.create(
-        name='Test User',
-        email='test@example.com',
-        role='Developer',
-        active=True
+    task = Task.create(
+        title='Past Due Task',
+        description='Test description',
+        status=status,
+        assignee=default_member,
+        priority='medium',
+        due_date=PAST_DUE_DATE
     )
     
-    # Task with past due date
-    past_date = datetime(2020, 1, 1)
+    assert task.is_overdue is expected_overdue
+
+
+@pytest.mark.unit
+def test_task_overdue_query(default_member):
+    """Test overdue task query matches the is_overdue property."""
     overdue_task = Task.create(
         title='Overdue Task',
         description='Test description',
         status='in_progress',
-        assignee=member,
+        assignee=default_member,
         priority='medium',
-        due_date=past_date
+        due_date=PAST_DUE_DATE
     )
+    Task.insert_many([
+        {'title': 'Completed Task', 'description': 'Test description', 'status': 'done',
+         'assignee': default_member, 'priority': 'medium', 'due_date': PAST_DUE_DATE},
+        {'title': 'Undated Task', 'description': 'Test description', 'status': 'todo',
+         'assignee': default_member, 'priority': 'medium', 'due_date': None},
+    ]).execute()
     
-    assert overdue_task.is_overdue is True
-    
-    # Completed task should not be overdue
-    completed_task = Task.create(
-        title='Completed Task',
-        description='Test description',
-        status='done',
-        assignee=member,
-        priority='medium',
-        due_date=past_date
-    )
-    
-    assert completed_task.is_overdue is False
+    assert [task.id for task in Task.overdue()] == [overdue_task.id]
 
 
 @pytest.mark.unit
@@ -149,18 +154,25 @@ def test_email_template_variables_property(temp_db, sample_email_template_data):
 
 
 @pytest.mark.unit
-def test_email_thread_parsed_data_property(temp_db):
-    """Test email thread parsed data property."""
-    member = TeamMember.create(
-        name='Test User',
-        email='test@example.com',
-        role='Developer',
-        active=True
-    )
+def test_email_template_render(temp_db, sample_email_template_data):
+    """Test email template variable rendering."""
+    template_data = sample_email_template_data.copy()
+    template_data.pop('variables')
+    template = EmailTemplate.create(**template_data)
+    
+    subject, body = template.render({'name': 'John', 'role': 'Developer'})
     
+    # Unknown variables are left untouched
+    assert subject == 'Test Subject - {{date}}'
+    assert body == 'Hello John, this is a test email.'
+
+
+@pytest.mark.unit
+def test_email_thread_parsed_data_property(default_member):
+    """Test email thread parsed data property."""
     thread = EmailThread.create(
         thread_id='test_thread_1',
-        team_member=member,
+        team_member=default_member,
         subject='Test Subject',
         sent_at=datetime.now(),
         status='sent',
@@ -189,4 +201,193 @@ def test_model_timestamps(temp_db, sample_team_member_data):
     member.save()
     
     # Verify updated_at changed
-    assert member.updated_at > original_updated
\ No newline at end of file
+    assert member.updated_at > original_updated
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_database_stats(temp_db, sample_team_member_data):
+    """Test database statistics counters."""
+    member = TeamMember.create(**sample_team_member_data)
+    TeamMember.create(
+        name='Inactive User',
+        email='inactive@example.com',
+        role='Developer',
+        active=False
+    )
+    Task.insert_many([
+        {'title': 'Open Task', 'description': '', 'status': 'todo', 'assignee': member, 'priority': 'medium'},
+        {'title': 'Done Task', 'description': '', 'status': 'done', 'assignee': member, 'priority': 'low'},
+    ]).execute()
+    
+    stats = await get_database_stats()
+    
+    assert stats['team_members'] == 2
+    assert stats['active_members'] == 1
+    assert stats['total_tasks'] == 2
+    assert stats['pending_tasks'] == 1
+    assert stats['email_threads'] == 0
+    assert stats['pending_responses'] == 0
+    assert stats['pending_approvals'] == 0
+
+
+@pytest.mark.unit
+def test_workflow_setting_cache_invalidation(temp_db):
+    """Test cached settings are decoded and refreshed on save."""
+    setting = WorkflowSettings.create(
+        setting_key='reminder_days',
+        setting_value='2',
+        setting_type='number'
+    )
+    
+    assert get_setting('reminder_days') == 2
+    assert get_setting('missing_key', 'fallback') == 'fallback'
+    
+    setting.setting_value = '5'
+    setting.save()
+    
+    assert get_setting('reminder_days') == 5
+
+
+@pytest.mark.unit
+def test_email_thread_status_stored_as_integer(temp_db, default_member):
+    """Test email thread status round-trips through its integer code."""
+    thread = EmailThread.create(
+        thread_id='test_thread_1',
+        team_member=default_member,
+        subject='Test Subject',
+        sent_at=datetime.now(),
+        status='replied',
+        content='Test email content'
+    )
+    
+    raw_status = temp_db.execute_sql('SELECT status FROM email_threads').fetchone()[0]
+    assert raw_status == 2
+    assert EmailThread.get_by_id(thread.id).status == 'replied'
+    assert EmailThread.select().where(EmailThread.status == 'replied').count() == 1
+    
+    with pytest.raises(ValueError):
+        EmailThread.create(
+            thread_id='test_thread_2',
+            team_member=default_member,
+            subject='Test Subject',
+            sent_at=datetime.now(),
+            status='unknown',
+            content='Test email content'
+        )
+
+
+@pytest.mark.unit
+def test_email_parse_cache(temp_db):
+    """Test stored email parse results are returned until they expire."""
+    store_email_parse('abc123', {'task_title': 'API work', 'status': 'done'})
+    store_email_parse('abc123', {'task_title': 'API work', 'status': 'review'})
+    
+    assert get_cached_email_parse('abc123', 3600) == {'task_title': 'API work', 'status': 'review'}
+    assert get_cached_email_parse('abc123', 0) is None
+    assert get_cached_email_parse('missing', 3600) is None
+
+
+@pytest.mark.unit
+def test_exchange_address_cache(temp_db):
+    """Test resolved Exchange sender addresses are returned until they expire."""
+    sender_dn = '/O=EXAMPLE/OU=EXCHANGE/CN=RECIPIENTS/CN=JDOE'
+    store_smtp_address(sender_dn, 'jdoe@example.com')
+    
+    assert get_cached_smtp_address(sender_dn, 3600) == 'jdoe@example.com'
+    assert get_cached_smtp_address(sender_dn, 0) is None
+
+
+@pytest.mark.unit
+def test_active_members_cache_invalidated_on_save(temp_db, sample_team_member_data):
+    """Test the cached active member list refreshes when a member is written."""
+    member = TeamMember.create(**sample_team_member_data)
+    assert [m.email for m in get_active_members()] == [member.email]
+    
+    member.active = False
+    member.save()
+    assert get_active_members() == ()
+
+
+
+@pytest.mark.unit
+def test_member_by_email_cache_invalidated_on_save(temp_db, sample_team_member_data):
+    """Test the cached email lookup refreshes when a member is written."""
+    assert get_member_by_email(sample_team_member_data['email']) is None
+    
+    member = TeamMember.create(**sample_team_member_data)
+    assert get_member_by_email(member.email) == (member.id, member.name)
+    
+    member.name = 'Renamed'
+    member.save()
+    assert get_member_by_email(member.email) == (member.id, 'Renamed')
+
+@pytest.mark.unit
+def test_kanban_change_task_data_json(temp_db):
+    """Test change payloads round-trip as dicts and can be filtered by JSON path."""
+    change = KanbanChange.create(
+        change_type='update',
+        task_id=1,
+        task_data={'field': 'status', 'old_value': 'todo', 'new_value': 'done', 'title': 'API work'}
+    )
+    
+    stored = KanbanChange.get_by_id(change.id)
+    assert stored.task_data['new_value'] == 'done'
+    assert KanbanChange.select().where(KanbanChange.task_data['title'] == 'API work').count() == 1
+
+
+@pytest.mark.unit
+def test_task_status_counts_follow_writes(temp_db, sample_team_member_data):
+    """Test the status count table is recounted on install and then kept current by triggers."""
+    member = TeamMember.create(**sample_team_member_data)
+    Task.create(title='Existing', description='', priority='medium', assignee=member, status='todo')
+    install_task_status_counts()
+    
+    task = Task.create(title='New', description='', priority='medium', assignee=member, status='todo')
+    task.status = 'done'
+    task.save()
+    Task.create(title='Blocked', description='', priority='medium', assignee=member, status='blocked').delete_instance()
+    
+    counts = dict(TaskStatusCount.select(TaskStatusCount.status, TaskStatusCount.count).tuples())
+    assert counts == {'todo': 1, 'done': 1, 'blocked': 0}
+
+
+@pytest.mark.unit
+def test_task_search_index(temp_db, sample_team_member_data):
+    """Test the full-text index picks up existing tasks on install and follows later writes."""
+    member = TeamMember.create(**sample_team_member_data)
+    existing = Task.create(title='Authentication rewrite', description='', priority='medium', assignee=member, status='todo')
+    install_task_search()
+    
+    task = Task.create(title='Dashboard', description='Charts for response rates', priority='medium', assignee=member, status='todo')
+    
+    def search(term):
+        return sorted(task_id for task_id, in TaskSearch.matching_ids(term).tuples())
+    
+    assert search('auth') == [existing.id]
+    assert search('response chart') == [task.id]
+    
+    task.title = 'Authorization'
+    task.save()
+    existing.delete_instance()
+    assert search('auth') == [task.id]
+    assert TaskSearch.matching_ids('--') is None
+
+
+@pytest.mark.unit
+def test_board_summary_and_status_sql(temp_db, sample_team_member_data):
+    """Test the precompiled board summary and status update statements."""
+    member = TeamMember.create(**sample_team_member_data)
+    install_task_status_counts()
+    for day in (3, 1, 2):
+        Task.create(title=f'Late {day}', description='', priority='medium', assignee=member,
+                    status='todo', due_date=datetime(2020, 1, day))
+    
+    assert set_task_status(1, 'done', 'todo') is True
+    assert set_task_status(1, 'blocked', 'todo') is False  # Status no longer matches
+    assert fetch_task_title_status(1) == ('Late 3', 'done')
+    assert fetch_task_title_status(99) is None
+    
+    counts, overdue_count, overdue_tasks = fetch_board_summary(datetime(2021, 1, 1), overdue_limit=1)
+    assert counts == {'todo': 2, 'done': 1}
+    assert overdue_count == 2
+    assert overdue_tasks == [('Late 1', datetime(2020, 1, 1))]
@@ -0,0 +1,41 @@
+"""Tests for scheduler service."""
+
+import pytest
+from datetime import datetime
+
+from app.services.scheduler_service import next_time_of_day
+
+# Monday 2024-01-15 and the days around it
+MONDAY = datetime(2024, 1, 15)
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+@pytest.mark.parametrize("now, expected", [
+    # Monday before 09:00 runs the same morning
+    (MONDAY.replace(hour=8, minute=59), datetime(2024, 1, 15, 9, 0)),
+    # Monday after 09:00 waits for next Monday
+    (MONDAY.replace(hour=9, minute=1), datetime(2024, 1, 22, 9, 0)),
+    # Sunday runs the next morning
+    (datetime(2024, 1, 14, 23, 30), datetime(2024, 1, 15, 9, 0)),
+    # Exactly 09:00, or later within the same minute, is already past
+    (MONDAY.replace(hour=9), datetime(2024, 1, 22, 9, 0)),
+    (MONDAY.replace(hour=9, second=30, microsecond=5), datetime(2024, 1, 22, 9, 0)),
+    # Midweek waits for the coming Monday
+    (datetime(2024, 1, 17, 12, 0), datetime(2024, 1, 22, 9, 0)),
+])
+def test_next_time_of_day_weekly(now, expected):
+    """Test the weekly job's next run is the next Monday 09:00 strictly after now."""
+    assert next_time_of_day(now, 9, 0, weekday=0) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.fast
+@pytest.mark.parametrize("now, expected", [
+    (MONDAY.replace(hour=7, minute=59, second=59), datetime(2024, 1, 15, 8, 0)),
+    (MONDAY.replace(hour=8), datetime(2024, 1, 16, 8, 0)),
+    (datetime(2024, 1, 31, 20, 0), datetime(2024, 2, 1, 8, 0)),
+])
+def test_next_time_of_day_daily(now, expected):
+    """Test a daily job's next run is the next 08:00 strictly after now."""
+    assert next_time_of_day(now, 8, 0) == expected